@@ -0,0 +1,3 @@
+"""
+Benchmarks for the Quiz Application backend
+"""
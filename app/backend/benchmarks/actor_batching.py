@@ -0,0 +1,109 @@
+"""
+Actor postafiók benchmark
+
+Egy kérdésre egyszerre érkező válaszhullám feldolgozása:
+1. közvetlen submit_answer hívás válaszonként (az actor előtti út)
+2. játék actoron keresztül: a hullám válaszai egy kötegben futnak le
+
+Mindkét esetben fut a napló (a kötegelés egy zárolással adja át az
+eseményeket). Külön mérjük csak az állapotmódosítást (válaszonkénti
+submit_answer és egy submit_answers köteg), valamint a teljes utat
+asyncio feladatonként egy játékossal, ahol a hullám összes válaszának
+elfogadásáig tart a mérés.
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.actor_batching
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from services.event_journal import EventJournal
+from services.game_actor import GameActors
+from services.game_manager import GameManager
+
+
+PLAYER_COUNTS = [1000, 5000, 20000]
+QUESTION_COUNT = 10
+
+
+def setup(player_count: int, path: str) -> tuple[GameManager, str, list]:
+    games = GameManager()
+    games.attach_journal(EventJournal(path, snapshot_every=10 ** 9))
+    session = games.create_session(1, 1, {'questions': [
+        {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10}
+        for _ in range(QUESTION_COUNT)
+    ]})
+    nicknames = [f"player_{idx}" for idx in range(player_count)]
+    for idx, nickname in enumerate(nicknames):
+        games.join_session(session.game_code, nickname, f"conn_{idx}")
+    return games, session.game_code, nicknames
+
+
+def mutation(games: GameManager, code: str, nicknames: list, batch: bool) -> float:
+    elapsed = 0.0
+    for question_index in range(QUESTION_COUNT):
+        games.start_question(code, question_index)
+        started = time.perf_counter()
+        if batch:
+            now = time.monotonic_ns()
+            games.submit_answers(code, [(nickname, "1", 0, now) for nickname in nicknames])
+        else:
+            for nickname in nicknames:
+                games.submit_answer(code, nickname, "1")
+        elapsed += time.perf_counter() - started
+        games.finish_question(code)
+    return elapsed
+
+
+async def direct(games: GameManager, code: str, nicknames: list) -> float:
+    elapsed = 0.0
+    for question_index in range(QUESTION_COUNT):
+        games.start_question(code, question_index)
+
+        async def player(nickname: str):
+            games.submit_answer(code, nickname, "1")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(player(nickname) for nickname in nicknames))
+        elapsed += time.perf_counter() - started
+        games.finish_question(code)
+    return elapsed
+
+
+async def batched(games: GameManager, code: str, nicknames: list) -> float:
+    actors = GameActors(games)
+    elapsed = 0.0
+    for question_index in range(QUESTION_COUNT):
+        games.start_question(code, question_index)
+
+        async def player(nickname: str):
+            await actors.answer(code, nickname, "1")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(player(nickname) for nickname in nicknames))
+        elapsed += time.perf_counter() - started
+        games.finish_question(code)
+    return elapsed
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for player_count in PLAYER_COUNTS:
+            answers = player_count * QUESTION_COUNT
+            print(f"\n{player_count} játékos, {QUESTION_COUNT} kérdés")
+            for label, batch in (("válaszonként", False), ("köteg", True)):
+                games, code, nicknames = setup(player_count, os.path.join(directory, f"m{batch}{player_count}.journal"))
+                elapsed = mutation(games, code, nicknames, batch)
+                games.close_journal()
+                print(f"állapotmódosítás, {label:13} {elapsed / answers * 1e6:6.2f} µs / válasz")
+            for label, runner in (("közvetlen", direct), ("actor köteggel", batched)):
+                games, code, nicknames = setup(player_count, os.path.join(directory, f"{label}{player_count}.journal"))
+                elapsed = asyncio.run(runner(games, code, nicknames))
+                games.close_journal()
+                print(f"teljes út, {label:20} {elapsed / answers * 1e6:6.2f} µs / válasz")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Válaszellenőrzés benchmark
+
+Egy 5000 válaszos kérdés pontozásának ellenőrzési ideje a korábbi,
+válaszonként json.loads-ot futtató _check_answer-rel, illetve a kérdésenként
+lefordított ellenőrzővel (a válaszok beérkezéskori értelmezése külön mérve).
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.answer_checking
+"""
+import json
+import random
+import time
+
+from services.answer_checker import compile_checker
+
+
+ANSWER_COUNT = 5000
+REPEATS = 5
+
+QUESTIONS = {
+    'single_choice': ("2", lambda: str(random.randrange(4))),
+    'multiple_choice': ("[0, 2]", lambda: json.dumps(random.sample(range(4), random.randint(1, 3)))),
+    'number': ("3.14", lambda: str(round(random.uniform(3.0, 3.3), 2))),
+    'order': ("[2, 0, 3, 1]", lambda: json.dumps(random.sample(range(4), 4))),
+}
+
+
+def legacy_check_answer(question_type: str, player_answer: str, correct_answer: str) -> bool:
+    """
+    A GameManager._check_answer korábbi megvalósítása változatlanul
+    """
+    if question_type == 'single_choice':
+        return str(player_answer) == str(correct_answer)
+    elif question_type == 'multiple_choice':
+        import json
+        try:
+            player_ans = json.loads(player_answer) if isinstance(player_answer, str) else player_answer
+            correct_ans = json.loads(correct_answer) if isinstance(correct_answer, str) else correct_answer
+            return sorted(player_ans) == sorted(correct_ans)
+        except:
+            return False
+    elif question_type == 'number':
+        try:
+            return abs(float(player_answer) - float(correct_answer)) < 0.01
+        except:
+            return False
+    elif question_type == 'order':
+        import json
+        try:
+            player_ans = json.loads(player_answer) if isinstance(player_answer, str) else player_answer
+            correct_ans = json.loads(correct_answer) if isinstance(correct_answer, str) else correct_answer
+            return player_ans == correct_ans
+        except:
+            return False
+    return False
+
+
+def best_of(func) -> float:
+    """
+    Legjobb idő (ms) REPEATS futásból
+    """
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    random.seed(42)
+    print(f"{ANSWER_COUNT} válasz kérdésenként")
+    print(f"{'típus':>16} {'régi (ms)':>10} {'értelmezés (ms)':>16} {'ellenőrzés (ms)':>16} {'gyorsulás':>10}")
+
+    for question_type, (correct_answer, generate) in QUESTIONS.items():
+        answers = [generate() for _ in range(ANSWER_COUNT)]
+        checker = compile_checker(question_type, correct_answer)
+        parsed = [checker.parse(answer) for answer in answers]
+
+        legacy = [legacy_check_answer(question_type, answer, correct_answer) for answer in answers]
+        assert legacy == [checker.check(value) for value in parsed]
+
+        baseline = best_of(lambda: [legacy_check_answer(question_type, answer, correct_answer) for answer in answers])
+        parsing = best_of(lambda: [checker.parse(answer) for answer in answers])
+        checking = best_of(lambda: [checker.check(value) for value in parsed])
+        speedup = baseline / checking if checking else float("inf")
+        print(f"{question_type:>16} {baseline:>10.2f} {parsing:>16.2f} {checking:>16.2f} {speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Broadcast szerializációs benchmark
+
+Egy question_finished méretű üzenet kiküldésének CPU ideje címzettenkénti
+send_json hívással, illetve egyszer szerializált (PreparedMessage) kerettel.
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.broadcast_serialization
+"""
+import asyncio
+import time
+
+from starlette.websockets import WebSocket, WebSocketState
+
+from services.websocket_manager import ConnectionManager
+
+
+RECIPIENT_COUNTS = [100, 1000, 5000]
+ROOM_SIZE = 300
+REPEATS = 5
+
+
+async def _discard(message):
+    pass
+
+
+async def _receive():
+    return {"type": "websocket.disconnect"}
+
+
+def make_socket() -> WebSocket:
+    """
+    Valódi Starlette WebSocket, aminek a küldése nem csinál semmit
+    """
+    scope = {"type": "websocket", "path": "/", "headers": [], "query_string": b""}
+    websocket = WebSocket(scope, _receive, _discard)
+    websocket.client_state = WebSocketState.CONNECTED
+    websocket.application_state = WebSocketState.CONNECTED
+    return websocket
+
+
+def make_question_finished(room_size: int) -> dict:
+    """
+    A finish_question által küldött üzenethez hasonló méretű payload
+    """
+    results = {
+        f"player_{idx}": {
+            'correct': idx % 3 == 0,
+            'points': 10 if idx % 3 == 0 else 0,
+            'rank': None,
+            'answer': str(idx % 4),
+            'was_online': True
+        }
+        for idx in range(room_size)
+    }
+    leaderboard = [
+        {
+            'nickname': f"player_{idx}",
+            'score': 100 - idx,
+            'correct_answers': 5,
+            'total_answers': 6,
+            'rank': idx + 1
+        }
+        for idx in range(10)
+    ]
+    return {
+        'type': 'question_finished',
+        'results': results,
+        'leaderboard': leaderboard,
+        'correct_answer': '2'
+    }
+
+
+async def per_recipient(sockets, message):
+    for websocket in sockets:
+        await websocket.send_json(message)
+
+
+async def prepared_once(sockets, message):
+    prepared = ConnectionManager.prepare(message)
+    for websocket in sockets:
+        await websocket.send_text(prepared.text)
+
+
+def measure(func, sockets, message) -> float:
+    """
+    Legjobb CPU idő (ms) REPEATS futásból
+    """
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.process_time()
+        asyncio.run(func(sockets, message))
+        best = min(best, time.process_time() - started)
+    return best * 1000
+
+
+def main():
+    message = make_question_finished(ROOM_SIZE)
+    frame_size = len(ConnectionManager.prepare(message).text.encode("utf-8"))
+    print(f"question_finished keret: {frame_size} bájt ({ROOM_SIZE} játékos eredménye)")
+    print(f"{'címzett':>8} {'send_json (ms)':>16} {'prepared (ms)':>15} {'megtakarítás':>13}")
+
+    for count in RECIPIENT_COUNTS:
+        sockets = [make_socket() for _ in range(count)]
+        baseline = measure(per_recipient, sockets, message)
+        prepared = measure(prepared_once, sockets, message)
+        saved = (1 - prepared / baseline) * 100 if baseline else 0.0
+        print(f"{count:>8} {baseline:>16.1f} {prepared:>15.1f} {saved:>12.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Kapcsolat churn benchmark
+
+Egy Wi-Fi kimaradás szimulációja: a játék összes játékosa egyszerre
+lecsatlakozik, majd új kapcsolattal újracsatlakozik. A ConnectionManager
+és a GameManager könyvelésének eseményenkénti költsége a játékosszámtól
+független kell legyen (halmazok és kapcsolat -> játékos index).
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.connection_churn
+"""
+import asyncio
+import time
+
+from services.game_manager import GameManager
+from services.websocket_manager import ConnectionManager
+
+
+PLAYER_COUNTS = [1000, 5000, 20000]
+REPEATS = 3
+
+
+class NullWebSocket:
+    """
+    Küldés nélküli WebSocket helyettesítő (a benchmark nem küld üzenetet)
+    """
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def storm(player_count: int) -> tuple[float, float]:
+    """
+    Egy lecsatlakozási és egy újracsatlakozási hullám ideje (ms)
+    """
+    connections = ConnectionManager()
+    games = GameManager()
+    session = games.create_session(1, 1, {'questions': []})
+    game_code = session.game_code
+    nicknames = [f"player_{idx}" for idx in range(player_count)]
+
+    for nickname in nicknames:
+        connection_id = f"{game_code}_{nickname}_0"
+        games.join_session(game_code, nickname, connection_id)
+        connections.register(NullWebSocket(), connection_id, game_code)
+
+    started = time.perf_counter()
+    for nickname in nicknames:
+        connection_id = f"{game_code}_{nickname}_0"
+        connections.disconnect(connection_id, game_code)
+        games.disconnect_player(connection_id)
+    disconnected = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for nickname in nicknames:
+        connection_id = f"{game_code}_{nickname}_1"
+        games.join_session(game_code, nickname, connection_id)
+        connections.register(NullWebSocket(), connection_id, game_code)
+    reconnected = time.perf_counter() - started
+
+    return disconnected * 1000, reconnected * 1000
+
+
+async def measure(player_count: int) -> tuple[float, float]:
+    """
+    Legjobb idő REPEATS futásból (event loopon belül, ahogy élesben fut)
+    """
+    runs = [storm(player_count) for _ in range(REPEATS)]
+    return min(run[0] for run in runs), min(run[1] for run in runs)
+
+
+def main():
+    print(f"{'játékos':>8} {'lecsatl. (ms)':>14} {'µs/esemény':>11} {'újracsatl. (ms)':>16} {'µs/esemény':>11}")
+
+    for count in PLAYER_COUNTS:
+        disconnected, reconnected = asyncio.run(measure(count))
+        print(
+            f"{count:>8} {disconnected:>14.1f} {disconnected * 1000 / count:>11.2f}"
+            f" {reconnected:>16.1f} {reconnected * 1000 / count:>11.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+/current-question terheléses teszt
+
+Egy 1000 fős szobában minden játékos egyszerre kéri le az aktuális
+kérdést (újracsatlakozás, fül fókusz), majd ETag-gel újra lekéri.
+
+1. Folyamaton belül: a végpont teste a régi úton (question_data másolás,
+   correct_answer eltávolítás, JSONResponse szerializálás) és az előre
+   kódolt bájtokkal.
+2. HTTP-n: uvicorn szerver (külön SQLite adatbázissal), a játékosok
+   párhuzamosan kérdeznek; teljes válasz (200) és If-None-Match (304).
+
+A terhelő kliens ugyanazon a gépen fut, így a magok egy részét elveszi.
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.current_question_load
+    python -m benchmarks.current_question_load --players 1000 --rounds 5
+"""
+from datetime import datetime
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from fastapi.responses import JSONResponse
+import httpx
+
+from services.game_manager import GameManager
+
+
+PORT = 18050
+QUESTION = {
+    "question_type": "single_choice",
+    "question_text": "Melyik évben koronázták meg Szent Istvánt, az első magyar királyt? " * 2,
+    "options": ["997", "1000", "1001", "1038"],
+    "correct_answer": "1",
+    "time_limit": 300,
+    "points": 10
+}
+
+
+def legacy_body(current_q) -> bytes:
+    question_data = current_q.question_data.copy()
+    question_data.pop('correct_answer', None)
+    elapsed = (datetime.now() - current_q.started_at).total_seconds()
+    time_remaining = max(0, question_data.get('time_limit', 30) - elapsed)
+    return JSONResponse({
+        'question': question_data,
+        'question_index': current_q.question_index,
+        'time_remaining': time_remaining,
+        'started_at': current_q.started_at.isoformat()
+    }).body
+
+
+def preencoded_body(current_q) -> bytes:
+    elapsed = (datetime.now() - current_q.started_at).total_seconds()
+    time_remaining = max(0, current_q.question_data.get('time_limit', 30) - elapsed)
+    str(time_remaining)  # X-Time-Remaining fejléc
+    return current_q.player_payload
+
+
+def in_process(requests: int):
+    games = GameManager()
+    session = games.create_session(1, 1, {'questions': [QUESTION]})
+    games.start_question(session.game_code, 0)
+    current_q = session.current_question
+
+    print(f"\nFolyamaton belül, {requests} lekérés")
+    for label, body in (("régi (másolás + JSON)", legacy_body), ("előre kódolt", preencoded_body)):
+        started = time.perf_counter()
+        for _ in range(requests):
+            body(current_q)
+        elapsed = time.perf_counter() - started
+        print(f"{label:22} {elapsed / requests * 1e6:6.2f} µs / lekérés")
+
+
+async def wait_ready(url: str, timeout: float = 60):
+    async with httpx.AsyncClient() as client:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/docs")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("a szerver nem indult el")
+
+
+async def start_game(client: httpx.AsyncClient) -> str:
+    await client.post("/api/auth/register", json={
+        "username": "loadtest", "email": "load@example.com",
+        "password": "loadtest123", "password_confirm": "loadtest123"
+    })
+    token = (await client.post("/api/auth/login", json={
+        "email": "load@example.com", "password": "loadtest123"
+    })).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post("/api/quizzes", headers=headers, json={
+        "title": "Terheléses teszt", "description": "current_question_load", "questions": [QUESTION]
+    })
+    response.raise_for_status()
+    response = await client.post("/api/game/create", headers=headers, json={"quiz_id": response.json()["id"]})
+    response.raise_for_status()
+    game_code = response.json()["game_code"]
+    response = await client.post("/api/game/start-question", headers=headers, json={"game_code": game_code, "question_index": 0})
+    response.raise_for_status()
+    return game_code
+
+
+async def player(port: int, request: bytes, rounds: int, statuses: set):
+    """
+    Egy játékos saját keep-alive kapcsolaton (könnyű kliens, hogy a szerver legyen a szűk keresztmetszet)
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for _ in range(rounds):
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            statuses.add(int(head.split(b" ", 2)[1]))
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    await reader.readexactly(int(line.split(b":", 1)[1]))
+    finally:
+        writer.close()
+
+
+async def poll(url: str, players: int, rounds: int, conditional: bool) -> float:
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        game_code = await start_game(client)
+        path = f"/api/game/current-question/{game_code}"
+        etag = (await client.get(path)).headers["etag"]
+
+    request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+    if conditional:
+        request += f"If-None-Match: {etag}\r\n"
+    request = (request + "\r\n").encode()
+    statuses = set()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(player(PORT, request, rounds, statuses) for _ in range(players)))
+    elapsed = time.perf_counter() - started
+    assert statuses == {304 if conditional else 200}, statuses
+    return players * rounds / elapsed
+
+
+def over_http(players: int, rounds: int):
+    print(f"\nHTTP, {players} játékos × {rounds} lekérés")
+    for conditional in (False, True):
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                "DATABASE_URL": f"sqlite:///{directory}/load.db",
+                "SECRET_KEY": os.getenv("SECRET_KEY", "load-test-secret"),
+                "GAME_JOURNAL_PATH": ""
+            }
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(PORT),
+                 "--log-level", "warning", "--no-access-log"],
+                env=env
+            )
+            try:
+                url = f"http://127.0.0.1:{PORT}"
+                asyncio.run(wait_ready(url))
+                throughput = asyncio.run(poll(url, players, rounds, conditional))
+            finally:
+                server.terminate()
+                server.wait()
+        label = "If-None-Match (304)" if conditional else "teljes válasz (200)"
+        print(f"{label:22} {throughput:8.0f} kérés/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/current-question terheléses teszt")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    in_process(100000)
+    over_http(args.players, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Eseménynapló benchmark
+
+1. submit_answer költsége napló nélkül és csoportos fsync-es naplóval
+   (a hívó oldali idő, valamint amíg minden esemény tartósan kiíródik)
+2. Helyreállítási idő csak naplóból, illetve pillanatkép + rövid naplóból
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.journal_throughput
+"""
+import os
+import random
+import tempfile
+import time
+
+from services.event_journal import EventJournal
+from services.game_manager import GameManager
+
+
+PLAYER_COUNT = 2000
+QUESTION_COUNT = 20
+
+
+def make_quiz() -> dict:
+    return {
+        'questions': [
+            {'question_type': 'single_choice', 'correct_answer': str(idx % 4), 'points': 10}
+            for idx in range(QUESTION_COUNT)
+        ]
+    }
+
+
+def play(manager: GameManager) -> float:
+    """
+    Teljes játék lejátszása, visszatér a submit_answer hívások összidejével (s)
+    """
+    session = manager.create_session(1, 1, make_quiz())
+    code = session.game_code
+    nicknames = [f"player_{idx}" for idx in range(PLAYER_COUNT)]
+    for idx, nickname in enumerate(nicknames):
+        manager.join_session(code, nickname, f"conn_{idx}")
+
+    submitting = 0.0
+    for question_index in range(QUESTION_COUNT):
+        manager.start_question(code, question_index)
+        answers = [str(random.randrange(4)) for _ in nicknames]
+        started = time.perf_counter()
+        for nickname, answer in zip(nicknames, answers):
+            manager.submit_answer(code, nickname, answer)
+        submitting += time.perf_counter() - started
+        manager.finish_question(code)
+    return submitting
+
+
+def recover(path: str, snapshot_every: int) -> float:
+    started = time.perf_counter()
+    manager = GameManager()
+    manager.attach_journal(EventJournal(path, snapshot_every=snapshot_every))
+    elapsed = time.perf_counter() - started
+    manager.close_journal()
+    return elapsed
+
+
+def main():
+    random.seed(42)
+    submits = PLAYER_COUNT * QUESTION_COUNT
+    print(f"{PLAYER_COUNT} játékos, {QUESTION_COUNT} kérdés, {submits} submit_answer")
+
+    baseline = play(GameManager())
+    print(f"napló nélkül:         {baseline / submits * 1e6:6.2f} µs / submit_answer")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, snapshot_every in (("csak napló", 10 ** 9), ("pillanatképpel", 20000)):
+            path = os.path.join(directory, f"{snapshot_every}.journal")
+            manager = GameManager()
+            manager.attach_journal(EventJournal(path, snapshot_every=snapshot_every))
+
+            started = time.perf_counter()
+            submitting = play(manager)
+            manager.journal.flush()
+            durable = time.perf_counter() - started
+            events, commits = manager.journal.seq, manager.journal.commits
+            manager.close_journal()
+
+            size = os.path.getsize(path) + (
+                os.path.getsize(f"{path}.snapshot") if os.path.exists(f"{path}.snapshot") else 0
+            )
+            print(f"\n[{label}]")
+            print(f"naplóval:             {submitting / submits * 1e6:6.2f} µs / submit_answer")
+            print(f"tartósan kiírva:      {events / durable:8.0f} esemény/s, {commits} fsync ({events / max(commits, 1):.0f} esemény / fsync)")
+            print(f"fájlméret:            {size / 1024 / 1024:.1f} MiB")
+            print(f"helyreállítás:        {recover(path, snapshot_every) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
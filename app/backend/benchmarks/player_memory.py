@@ -0,0 +1,82 @@
+"""
+Játékosonkénti memória benchmark
+
+Egy nagy terem teljes lejátszása (minden kérdés elindítva, megválaszolva
+és lezárva), majd a session által foglalt memória mérése tracemalloc-kal.
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.player_memory
+"""
+import gc
+import random
+import tracemalloc
+
+from services.game_manager import GameManager
+
+
+PLAYER_COUNT = 10000
+QUESTION_COUNT = 40
+ANSWER_RATE = 0.9
+
+
+def make_quiz(question_count: int) -> dict:
+    return {
+        'questions': [
+            {
+                'question_type': 'single_choice',
+                'question_text': f"Kérdés {idx + 1}",
+                'options': ["A", "B", "C", "D"],
+                'correct_answer': str(idx % 4),
+                'time_limit': 30,
+                'points': 10,
+                'speed_bonus': True
+            }
+            for idx in range(question_count)
+        ]
+    }
+
+
+def play(manager: GameManager, player_count: int, question_count: int) -> str:
+    """
+    Teljes játék lejátszása, visszatér a játék kódjával
+    """
+    session = manager.create_session(1, 1, make_quiz(question_count))
+    game_code = session.game_code
+    nicknames = [f"player_{idx}" for idx in range(player_count)]
+
+    for idx, nickname in enumerate(nicknames):
+        manager.join_session(game_code, nickname, f"{game_code}_{nickname}_{idx}")
+
+    answers = ["0", "1", "2", "3"]
+    for question_index in range(question_count):
+        manager.start_question(game_code, question_index)
+        for nickname in nicknames:
+            if random.random() < ANSWER_RATE:
+                manager.submit_answer(game_code, nickname, random.choice(answers))
+        manager.finish_question(game_code)
+
+    # Az utolsó kérdés átmeneti állapota nem a játékosok tárolása
+    session.current_question = None
+    return game_code
+
+
+def main():
+    random.seed(42)
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    manager = GameManager()
+    play(manager, PLAYER_COUNT, QUESTION_COUNT)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    used = after - before
+    print(f"{PLAYER_COUNT} játékos, {QUESTION_COUNT} kérdés")
+    print(f"session memória: {used / 1024 / 1024:.1f} MiB")
+    print(f"játékosonként:   {used / PLAYER_COUNT / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
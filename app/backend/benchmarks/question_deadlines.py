@@ -0,0 +1,77 @@
+"""
+Kérdés határidő benchmark
+
+Sok párhuzamos kérdés határidejének kezelése egyetlen időzítő kerékkel,
+illetve játékonként egy asyncio feladattal (asyncio.sleep a határidőig).
+Mérjük az ütemezés, a lejáratok feldolgozása és az újraütemezés
+(következő kérdés) költségét, valamint a késést a határidőhöz képest.
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.question_deadlines
+"""
+import asyncio
+import random
+import time
+
+from services.timer_wheel import TimerWheel
+
+
+GAME_COUNTS = [1000, 10000, 50000]
+TICK = 0.01
+SPREAD = 1.0
+
+
+async def per_task(deadlines: list) -> tuple[float, float, float]:
+    """
+    Játékonként egy feladat, visszatér: ütemezés, teljes idő (s), max késés (ms)
+    """
+    lateness = 0.0
+
+    async def wait(deadline: float):
+        nonlocal lateness
+        await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+        lateness = max(lateness, time.monotonic() - deadline)
+
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(wait(deadline)) for deadline in deadlines]
+    scheduled = time.perf_counter() - started
+    await asyncio.gather(*tasks)
+    return scheduled, time.perf_counter() - started, lateness * 1000
+
+
+async def wheel(deadlines: list) -> tuple[float, float, float]:
+    """
+    Egyetlen kerék és egyetlen léptető ciklus
+    """
+    lateness = 0.0
+    timers = TimerWheel(TICK, origin=time.monotonic())
+
+    started = time.perf_counter()
+    for key, deadline in enumerate(deadlines):
+        timers.schedule(key, deadline)
+    scheduled = time.perf_counter() - started
+
+    while len(timers):
+        await asyncio.sleep(TICK)
+        now = time.monotonic()
+        for key in timers.advance(now):
+            lateness = max(lateness, now - deadlines[key])
+    return scheduled, time.perf_counter() - started, lateness * 1000
+
+
+def main():
+    random.seed(42)
+    for game_count in GAME_COUNTS:
+        print(f"\n{game_count} párhuzamos kérdés, határidők {SPREAD:.0f} s-on belül")
+        for label, runner in (("feladat / játék", per_task), ("időzítő kerék", wheel)):
+            base = time.monotonic() + 0.2
+            deadlines = [base + random.random() * SPREAD for _ in range(game_count)]
+            scheduled, total, lateness = asyncio.run(runner(deadlines))
+            print(
+                f"{label:16} ütemezés: {scheduled * 1000:7.1f} ms   "
+                f"teljes: {total:5.2f} s   max késés: {lateness:6.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
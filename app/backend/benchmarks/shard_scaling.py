@@ -0,0 +1,168 @@
+"""
+Shardolt futtatás terheléses tesztje
+
+Workerszámonként elindítja a services.shard_router indítót (külön SQLite
+adatbázissal), létrehoz több párhuzamos játékot, mindegyikhez WebSocket
+játékosokat csatlakoztat, majd kérdésről kérdésre végigjátssza őket: a
+host elindítja a kérdést, minden játékos válaszol, a kérdés automatikusan
+lezárul, amikor mindenki válaszolt. A mért érték a feldolgozott válaszok
+száma másodpercenként; ideális esetben a workerek számával (legfeljebb a
+magok számáig) közel lineárisan nő.
+
+A terhelő kliens ugyanazon a gépen fut, így a magok egy részét elveszi.
+
+Futtatás a backend könyvtárból:
+    python -m benchmarks.shard_scaling
+    python -m benchmarks.shard_scaling --workers 1 2 4 8 --games 32 --players 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import websockets
+
+
+BASE_PORT = 18000
+
+
+def make_quiz(questions: int) -> dict:
+    return {
+        "title": "Terheléses teszt",
+        "description": "shard_scaling benchmark",
+        "questions": [
+            {
+                "question_type": "single_choice",
+                "question_text": f"Kérdés {index}",
+                "options": ["a", "b", "c", "d"],
+                "correct_answer": "1",
+                "time_limit": 300,
+                "points": 10
+            }
+            for index in range(questions)
+        ]
+    }
+
+
+async def wait_ready(url: str, timeout: float = 120):
+    async with httpx.AsyncClient() as client:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{url}/docs")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("a szerver nem indult el")
+
+
+async def player(url: str, game_code: str, nickname: str, questions: int, ready: asyncio.Event):
+    async with websockets.connect(f"{url.replace('http', 'ws')}/api/game/ws/{game_code}/{nickname}") as ws:
+        ready.set()
+        for _ in range(questions):
+            while json.loads(await ws.recv())["type"] != "question_started":
+                pass
+            await ws.send(json.dumps({"type": "submit_answer", "answer": "1"}))
+            while json.loads(await ws.recv())["type"] != "question_finished":
+                pass
+
+
+async def run_games(url: str, games: int, players: int, questions: int) -> float:
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        await client.post("/api/auth/register", json={
+            "username": "loadtest", "email": "load@example.com",
+            "password": "loadtest123", "password_confirm": "loadtest123"
+        })
+        token = (await client.post("/api/auth/login", json={
+            "email": "load@example.com", "password": "loadtest123"
+        })).json()["access_token"]
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        response = await client.post("/api/quizzes", json=make_quiz(questions))
+        response.raise_for_status()
+        quiz_id = response.json()["id"]
+        codes = []
+        for _ in range(games):
+            response = await client.post("/api/game/create", json={"quiz_id": quiz_id})
+            response.raise_for_status()
+            codes.append(response.json()["game_code"])
+
+        tasks = []
+        for game_code in codes:
+            ready_events = []
+            for index in range(players):
+                ready = asyncio.Event()
+                ready_events.append(ready)
+                tasks.append(asyncio.ensure_future(player(url, game_code, f"p{index}", questions, ready)))
+            for ready in ready_events:
+                await ready.wait()
+
+        started = time.perf_counter()
+        await asyncio.gather(*tasks, *(
+            play_game(client, url, game_code, questions) for game_code in codes
+        ))
+        return time.perf_counter() - started
+
+
+async def play_game(client: httpx.AsyncClient, url: str, game_code: str, questions: int):
+    """
+    Host oldali lejátszás: a lezárást nézőként figyeli
+    """
+    async with websockets.connect(f"{url.replace('http', 'ws')}/api/game/spectate/{game_code}") as spectator:
+        json.loads(await spectator.recv())
+        for index in range(questions):
+            response = await client.post("/api/game/start-question", json={"game_code": game_code, "question_index": index})
+            response.raise_for_status()
+            while json.loads(await spectator.recv())["type"] != "question_finished":
+                pass
+
+
+def measure(workers: int, games: int, players: int, questions: int) -> float:
+    port = BASE_PORT
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{directory}/load.db",
+            "SECRET_KEY": os.getenv("SECRET_KEY", "load-test-secret"),
+            "GAME_JOURNAL_PATH": ""
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "services.shard_router", "--workers", str(workers),
+             "--host", "127.0.0.1", "--port", str(port), "--internal-port", str(port + 100),
+             "--", "--log-level", "warning"],
+            env=env
+        )
+        try:
+            url = f"http://127.0.0.1:{port}"
+            asyncio.run(wait_ready(url))
+            elapsed = asyncio.run(asyncio.wait_for(run_games(url, games, players, questions), 600))
+        finally:
+            server.terminate()
+            server.wait()
+    return games * players * questions / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shard skálázódás mérése")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--games", type=int, default=16)
+    parser.add_argument("--players", type=int, default=25)
+    parser.add_argument("--questions", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} mag, {args.games} játék × {args.players} játékos × {args.questions} kérdés")
+    baseline = None
+    for workers in args.workers:
+        throughput = measure(workers, args.games, args.players, args.questions)
+        baseline = baseline or throughput
+        print(f"{workers:2} worker: {throughput:8.0f} válasz/s  ({throughput / baseline:.2f}×)")
+
+
+if __name__ == "__main__":
+    main()
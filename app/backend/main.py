@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from database.database import engine, Base
@@ -8,6 +9,13 @@ from routes.game import router as game_router
 from routes.admin import router as admin_router
 from routes.subscription import router as subscription_router
 from middleware.token_refresh import TokenRefreshMiddleware
+from services.websocket_manager import manager
+from services.heartbeat import heartbeat
+from services.session_reaper import session_reaper
+from services.question_timers import question_timers
+from services.game_manager import game_manager
+from services.event_journal import EventJournal, JOURNAL_PATH
+from routes.game import close_question, handle_disconnect
 import os
 from dotenv import load_dotenv
 
@@ -16,10 +24,31 @@ load_dotenv()
 # Adatbázis táblák létrehozása
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Háttérszolgáltatások indítása és leállítása
+    if JOURNAL_PATH:
+        game_manager.attach_journal(EventJournal(JOURNAL_PATH))
+    await manager.start()
+    heartbeat.start(on_reap=handle_disconnect)
+    session_reaper.start()
+    for game_code, closes_at in game_manager.open_questions():
+        question_timers.schedule(game_code, closes_at)
+    question_timers.start(on_expire=close_question)
+    yield
+    await question_timers.stop()
+    await session_reaper.stop()
+    await heartbeat.stop()
+    await manager.stop()
+    game_manager.close_journal()
+
+
 app = FastAPI(
     title="Full-Stack Quiz Application API",
     description="Kvíz alkalmazás FastAPI és React alapokon",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(TokenRefreshMiddleware)
@@ -52,7 +81,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Content-Disposition", "X-New-Token"],
+    expose_headers=["Content-Disposition", "X-New-Token", "ETag", "X-Time-Remaining"],
 )
 
 app.include_router(auth_router)
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Header, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+from typing import Optional
+import asyncio
+import os
 from sqlalchemy.orm import Session
-import json
 from datetime import datetime
 
 from database.database import get_db
 from models.quiz import Quiz, Question
 from models.user import User
+from utils.auth import create_access_token, decode_access_token
 from utils.dependencies import get_current_user
+from utils.http_cache import etag_matches
 from services.export_service import generate_pdf_report, generate_excel_report
 from services.game_manager import game_manager
-from services.websocket_manager import manager
+from services.game_actor import game_actors
+from services.websocket_manager import manager, HOST, SPECTATOR
+from services.event_coalescer import event_coalescer
+from services.heartbeat import heartbeat
+from services.latency import latency
+from services.question_timers import question_timers
+from services.quiz_plans import quiz_plans
+from services.wire_protocol import negotiate, receive_message
 from schemas.game import (
     CreateGameRequest,
     CreateGameResponse,
@@ -22,6 +33,9 @@ from schemas.game import (
 
 router = APIRouter(prefix="/api/game", tags=["game"])
 
+# A host WebSocket ennyi ideig vár az azonosító (auth) üzenetre (s)
+HOST_AUTH_TIMEOUT = float(os.getenv("GAME_HOST_AUTH_TIMEOUT", "10"))
+
 
 @router.post("/create", response_model=CreateGameResponse)
 async def create_game(
@@ -44,71 +58,36 @@ async def create_game(
             detail="Kvíz nem található vagy nincs jogosultságod"
         )
     
-    questions = db.query(Question).filter(
-        Question.quiz_id == quiz.id
-    ).order_by(Question.order_index).all()
+    plan = quiz_plans.get(
+        quiz,
+        lambda: db.query(Question).filter(Question.quiz_id == quiz.id).order_by(Question.order_index).all()
+    )
     
-    if not questions:
+    if not plan.question_count:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="A kvíznek nincs kérdése"
         )
     
-    quiz_data = {
-        'id': quiz.id,
-        'title': quiz.title,
-        'description': quiz.description,
-        'questions': [
-            {
-                'id': q.id,
-                'question_type': q.question_type,
-                'question_text': q.question_text,
-                'options': json.loads(q.options) if q.options else None,
-                'correct_answer': q.correct_answer,
-                'time_limit': q.time_limit,
-                'order_index': q.order_index,
-                'points': 10,
-                'speed_bonus': True
-            }
-            for q in questions
-        ]
-    }
-    
     session = game_manager.create_session(
         quiz_id=quiz.id,
         host_user_id=current_user.id,
-        quiz_data=quiz_data
+        quiz_data=plan.quiz_data,
+        quiz_size=plan.size
     )
     
     return CreateGameResponse(
         game_code=session.game_code,
-        quiz_title=quiz.title,
-        question_count=len(questions)
+        quiz_title=plan.title,
+        question_count=plan.question_count
     )
 
 
-@router.get("/session/{game_code}")
-async def get_session_info(
-    game_code: str,
-    current_user: User = Depends(get_current_user)
-):
+def host_snapshot(session) -> dict:
     """
-    Session információk lekérése (host számára)
+    A host nézet teljes állapota (REST session lekérés és host WebSocket)
     """
-    session = game_manager.get_session(game_code)
-    
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Játék session nem található"
-        )
-    
-    if session.host_user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Csak a host láthatja ezt"
-        )
-    
+    game_code = session.game_code
     leaderboard = game_manager.get_leaderboard(game_code, limit=10)
     
     results = None
@@ -118,8 +97,9 @@ async def get_session_info(
             if nickname in session.players:
                 player = session.players[nickname]
                 q_idx = session.current_question.question_index
-                if q_idx in player.answers:
-                    results[nickname] = player.answers[q_idx]
+                result = session.answers.get(q_idx, player.slot)
+                if result is not None:
+                    results[nickname] = result
     
     current_question_data = None
     if session.current_question and not session.current_question.finished:
@@ -128,7 +108,10 @@ async def get_session_info(
             'question_text': session.current_question.question_data.get('question_text'),
             'time_limit': session.current_question.question_data.get('time_limit', 30),
             'started_at': session.current_question.started_at.isoformat(),
-            'answers_received': session.current_question.answers_received
+            'answers_received': {
+                nickname: {**received, 'time': received['time'].isoformat()}
+                for nickname, received in session.current_question.answers_received.items()
+            }
         }
     
     return {
@@ -152,6 +135,31 @@ async def get_session_info(
     }
 
 
+@router.get("/session/{game_code}")
+async def get_session_info(
+    game_code: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Session információk lekérése (host számára)
+    """
+    session = game_manager.get_session(game_code)
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Játék session nem található"
+        )
+    
+    if session.host_user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Csak a host láthatja ezt"
+        )
+    
+    return host_snapshot(session)
+
+
 @router.post("/start-question")
 async def start_question(
     request: StartQuestionRequest,
@@ -168,34 +176,58 @@ async def start_question(
             detail="Nincs jogosultságod"
         )
     
-    success = game_manager.start_question(request.game_code, request.question_index)
-    
-    if not success:
+    if not await begin_question(request.game_code, request.question_index):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Nem sikerült a kérdést elindítani"
         )
     
-    updated_session = game_manager.get_session(request.game_code)
+    return {'success': True, 'question_index': request.question_index}
+
+
+async def begin_question(game_code: str, question_index: int) -> bool:
+    """
+    Kérdés indítása és kiküldése (REST végpont és host WebSocket parancs)
+    """
+    success = await game_actors.call(
+        game_code,
+        game_manager.start_question,
+        game_code,
+        question_index
+    )
+    
+    if not success:
+        return False
+    
+    updated_session = game_manager.get_session(game_code)
+    question_timers.schedule(game_code, updated_session.current_question.closes_at)
     
+    await event_coalescer.flush(game_code)
     await manager.broadcast_to_game(
         {
             'type': 'question_started',
-            'question_index': request.question_index,
+            'question_index': question_index,
             'started_at': updated_session.current_question.started_at.isoformat() if updated_session.current_question else None,
             'time_limit': updated_session.current_question.question_data.get('time_limit', 30) if updated_session.current_question else 30
         },
-        request.game_code
+        game_code
     )
+    await push_host_snapshot(game_code)
     
-    return {'success': True, 'question_index': request.question_index}
+    return True
 
 
 @router.get("/current-question/{game_code}")
-async def get_current_question(game_code: str):
+async def get_current_question(game_code: str, if_none_match: Optional[str] = Header(None)):
     """
     Aktuális kérdés lekérése (játékosok számára)
     Nem igényel autentikációt!
+    
+    A törzs a kérdés indításakor előre kódolt kérdés (helyes válasz
+    nélkül) a kezdés idejével; kérdésenként állandó, ezért az ETag is az,
+    és egyező If-None-Match esetén 304 jön. A hátralévő idő változik, így
+    nem a (gyorsítótárazható) törzsben, hanem csak az X-Time-Remaining
+    fejlécben van.
     """
     session = game_manager.get_session(game_code)
     
@@ -212,20 +244,22 @@ async def get_current_question(game_code: str):
         }
     
     current_q = session.current_question
-    question_data = current_q.question_data.copy()
-    
-    question_data.pop('correct_answer', None)
-    
     elapsed = (datetime.now() - current_q.started_at).total_seconds()
-    time_limit = question_data.get('time_limit', 30)
-    time_remaining = max(0, time_limit - elapsed)
-    
-    return {
-        'question': question_data,
-        'question_index': current_q.question_index,
-        'time_remaining': time_remaining,
-        'started_at': current_q.started_at.isoformat()
+    time_remaining = max(0, current_q.question_data.get('time_limit', 30) - elapsed)
+    headers = {
+        'ETag': current_q.player_etag,
+        'Cache-Control': 'no-cache',
+        'X-Time-Remaining': str(time_remaining)
     }
+    
+    if etag_matches(if_none_match, current_q.player_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(
+        content=current_q.player_payload,
+        media_type="application/json",
+        headers=headers
+    )
 
 
 @router.post("/finish-question")
@@ -244,25 +278,100 @@ async def finish_question(
             detail="Nincs jogosultságod"
         )
     
-    results = game_manager.finish_question(request.game_code)
-    leaderboard = game_manager.get_leaderboard(request.game_code, limit=10)
+    return await close_question(request.game_code)
+
+
+async def close_question(game_code: str) -> dict:
+    """
+    Kérdés lezárása és az eredmények kiküldése
+
+    A host kérésére, a határidő lejártakor (időzítő) és amikor minden online
+    játékos válaszolt hívódik; a már lezárt kérdés eredményeit újraküldés
+    nélkül adja vissza.
+    """
+    _, outcome = await settle_question(game_code)
+    return outcome
+
+
+async def settle_question(game_code: str) -> tuple[bool, dict]:
+    """
+    Mint a close_question, de azt is visszaadja, hogy ez a hívás zárta-e le
+    a kérdést (False, ha nem volt nyitott kérdés)
+    """
+    question_timers.cancel(game_code)
+    session = game_manager.get_session(game_code)
+    if not session:
+        return False, {'results': {}, 'leaderboard': []}
+    if not session.current_question:
+        return False, {'results': {}, 'leaderboard': game_manager.get_leaderboard(game_code)}
+    
+    already_finished, results = await game_actors.call(game_code, finish_current_question, game_code)
+    standings = game_manager.get_leaderboard(game_code, limit=len(session.players))
+    leaderboard = standings[:10]
+    if already_finished:
+        return False, {
+            'results': results,
+            'leaderboard': leaderboard
+        }
+    
+    correct_answer = session.current_question.question_data.get('correct_answer')
     
+    await event_coalescer.flush(game_code)
+    
+    # A host a teljes eredménytáblát kapja
     await manager.broadcast_to_game(
         {
             'type': 'question_finished',
             'results': results,
             'leaderboard': leaderboard,
-            'correct_answer': session.current_question.question_data.get('correct_answer')
+            'correct_answer': correct_answer
         },
-        request.game_code
+        game_code,
+        topics=[HOST]
     )
     
-    return {
+    # A nézők és a játékosok csak a top ranglistát, a játékosok mellé a saját eredményüket
+    shared = manager.prepare({
+        'type': 'question_finished',
+        'leaderboard': leaderboard,
+        'correct_answer': correct_answer
+    })
+    await manager.broadcast_to_game(shared, game_code, topics=[SPECTATOR])
+    
+    for entry in standings:
+        nickname = entry['nickname']
+        player = session.players.get(nickname)
+        if not player or not player.connected:
+            continue
+        
+        await manager.send_personal_message(
+            manager.extend(shared, {
+                'results': {nickname: results.get(nickname)},
+                'standing': entry
+            }),
+            player.connection_id
+        )
+    
+    await push_host_snapshot(game_code)
+    
+    return True, {
         'results': results,
         'leaderboard': leaderboard
     }
 
 
+def finish_current_question(game_code: str) -> tuple[bool, dict]:
+    """
+    Lezárás az actoron: visszaadja, hogy a kérdés már korábban lezárult-e
+    (így csak az első lezárás küld eredményt)
+    """
+    session = game_manager.get_session(game_code)
+    if not session or not session.current_question:
+        return True, {}
+    already_finished = session.current_question.finished
+    return already_finished, game_manager.finish_question(game_code)
+
+
 @router.post("/finish-game")
 async def finish_game(
     game_code: str,
@@ -279,70 +388,143 @@ async def finish_game(
             detail="Nincs jogosultságod"
         )
     
-    game_manager.finish_game(game_code)
+    final_leaderboard = await end_game(game_code)
+    
+    return {'leaderboard': final_leaderboard, 'quiz_id': session.quiz_id}
+
+
+async def end_game(game_code: str) -> list:
+    """
+    Játék befejezése és a végeredmény kiküldése (REST végpont és host WebSocket parancs)
+    """
+    session = game_manager.get_session(game_code)
+    await game_actors.call(game_code, game_manager.finish_game, game_code)
+    question_timers.cancel(game_code)
     final_leaderboard = game_manager.get_leaderboard(game_code, limit=999)
     
+    await event_coalescer.flush(game_code)
     await manager.broadcast_to_game(
         {
             'type': 'game_finished',
             'leaderboard': final_leaderboard,
-            'quiz_id': session.quiz_id  # Küldjük el a quiz_id-t az értékeléshez
+            'quiz_id': session.quiz_id if session else None  # Küldjük el a quiz_id-t az értékeléshez
         },
         game_code
     )
     
-    return {'leaderboard': final_leaderboard, 'quiz_id': session.quiz_id}
+    return final_leaderboard
 
 
-@router.get("/leaderboard/{game_code}")
-async def get_leaderboard(game_code: str):
+async def push_host_snapshot(game_code: str):
     """
-    Ranglista lekérése
+    Friss host_snapshot a host kapcsolatoknak fázisváltás (kérdés indítása,
+    lezárása) után; közben a game_delta üzenetek frissítenek
+    """
+    session = game_manager.get_session(game_code)
+    if session:
+        await manager.broadcast_to_game(
+            {'type': 'host_snapshot', **host_snapshot(session)},
+            game_code,
+            topics=[HOST]
+        )
+
+
+@router.get("/latency/{game_code}")
+async def get_latency(
+    game_code: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Az online játékosok hálózati késleltetése (host)
     """
     session = game_manager.get_session(game_code)
     
-    if not session:
+    if not session or session.host_user_id != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Játék nem található"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Nincs jogosultságod"
         )
     
-    leaderboard = game_manager.get_leaderboard(game_code)
-    return {'leaderboard': leaderboard}
+    return latency.stats(
+        player.connection_id for player in session.players.values() if player.connected
+    )
 
 
-@router.get("/export/pdf/{game_code}")
-async def export_pdf(
+@router.get("/leaderboard/{game_code}")
+async def get_leaderboard(
     game_code: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    since: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
-    Eredmények exportálása PDF formátumban
+    Ranglista lekérése
+    
+    A válasz verziónként előre kódolt (services.leaderboard_feed); egyező
+    If-None-Match esetén 304, ?since=<verzió> esetén csak a változások
+    (saját, a teljes ranglistáétól eltérő ETag-gel).
     """
-    session = game_manager.get_session(game_code)
+    feed = game_manager.get_leaderboard_feed(game_code)
+    
+    if feed is None:
+        archive = game_manager.get_archive(game_code)
+        if archive:
+            return {'leaderboard': [
+                {key: value for key, value in entry.items() if key != 'question_scores'}
+                for entry in archive.leaderboard[:10]
+            ]}
+        
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Játék nem található"
+        )
     
-    if not session:
+    content = feed.delta(since) if since is not None else None
+    etag = feed.delta_etag(since) if content is not None else feed.etag
+    
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return Response(content=content or feed.payload, media_type="application/json", headers=headers)
+
+
+def export_data(game_code: str, current_user: User) -> tuple[dict, list]:
+    """
+    Export adatai élő vagy már archivált játékból
+    """
+    summary = game_manager.get_summary(game_code)
+    
+    if not summary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Játék nem található"
         )
     
-    if session.host_user_id != current_user.id:
+    if summary.host_user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Csak a host exportálhatja az eredményeket"
         )
     
-    leaderboard = game_manager.get_leaderboard(game_code, limit=999, include_question_details=True)
-    
     game_data = {
-        'game_code': session.game_code,
-        'quiz_title': session.quiz_data.get('title', 'Kvíz Játék') if session.quiz_data else 'Kvíz Játék',
+        'game_code': summary.game_code,
+        'quiz_title': summary.quiz_title,
         'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'question_count': len(session.questions),
-        'questions': session.questions
+        'question_count': summary.question_count
     }
+    return game_data, summary.leaderboard
+
+
+@router.get("/export/pdf/{game_code}")
+async def export_pdf(
+    game_code: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Eredmények exportálása PDF formátumban
+    """
+    game_data, leaderboard = export_data(game_code, current_user)
     
     pdf_buffer = generate_pdf_report(game_data, leaderboard)
     
@@ -364,29 +546,7 @@ async def export_excel(
     """
     Eredmények exportálása Excel formátumban
     """
-    session = game_manager.get_session(game_code)
-    
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Játék nem található"
-        )
-    
-    if session.host_user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Csak a host exportálhatja az eredményeket"
-        )
-    
-    leaderboard = game_manager.get_leaderboard(game_code, limit=999, include_question_details=True)
-    
-    game_data = {
-        'game_code': session.game_code,
-        'quiz_title': session.quiz_data.get('title', 'Kvíz Játék') if session.quiz_data else 'Kvíz Játék',
-        'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-        'question_count': len(session.questions),
-        'questions': session.questions
-    }
+    game_data, leaderboard = export_data(game_code, current_user)
     
     excel_buffer = generate_excel_report(game_data, leaderboard)
     
@@ -408,9 +568,16 @@ async def websocket_endpoint(websocket: WebSocket, game_code: str, nickname: str
     """
     connection_id = f"{game_code}_{nickname}_{datetime.now().timestamp()}"
     
-    await websocket.accept()
+    wire_format, subprotocol = negotiate(websocket)
+    await websocket.accept(subprotocol=subprotocol)
     
-    success, message = game_manager.join_session(game_code, nickname, connection_id)
+    success, message = await game_actors.call(
+        game_code,
+        game_manager.join_session,
+        game_code,
+        nickname,
+        connection_id
+    )
     
     if not success:
         await websocket.send_json({
@@ -420,11 +587,7 @@ async def websocket_endpoint(websocket: WebSocket, game_code: str, nickname: str
         await websocket.close(code=1008, reason=message)
         return
     
-    manager.active_connections[connection_id] = websocket
-    
-    if game_code not in manager.game_connections:
-        manager.game_connections[game_code] = []
-    manager.game_connections[game_code].append(connection_id)
+    manager.register(websocket, connection_id, game_code, wire_format=wire_format)
     
     await manager.send_personal_message(
         {
@@ -435,23 +598,27 @@ async def websocket_endpoint(websocket: WebSocket, game_code: str, nickname: str
         connection_id
     )
     
-    await manager.broadcast_to_game(
-        {
-            'type': 'player_joined',
-            'nickname': nickname
-        },
-        game_code
-    )
+    if websocket.query_params.get('events') == 'full':
+        event_coalescer.opt_out(game_code, connection_id)
+    
+    session = game_manager.get_session(game_code)
+    await event_coalescer.player_joined(game_code, nickname, len(session.players) if session else None)
     
     try:
         while True:
-            data = await websocket.receive_json()
+            data = await receive_message(websocket)
             
             message_type = data.get('type')
+            heartbeat.touch(connection_id, pong=message_type == 'pong', ping_id=data.get('id'))
             
             if message_type == 'submit_answer':
                 answer = data.get('answer')
-                success = game_manager.submit_answer(game_code, nickname, answer)
+                success = await game_actors.answer(
+                    game_code,
+                    nickname,
+                    answer,
+                    rtt_ns=latency.compensation_ns(connection_id)
+                )
                 
                 await manager.send_personal_message(
                     {
@@ -466,27 +633,188 @@ async def websocket_endpoint(websocket: WebSocket, game_code: str, nickname: str
                     answers_count = len(session.current_question.answers_received)
                     total_players = len(session.players)
                     
-                    await manager.broadcast_to_game(
-                        {
-                            'type': 'answer_received',
-                            'nickname': nickname,
-                            'answers_count': answers_count,
-                            'total_players': total_players
-                        },
-                        game_code
-                    )
+                    await event_coalescer.answer_received(game_code, nickname, answers_count, total_players)
+                
+                if success and game_manager.all_answered(game_code):
+                    await close_question(game_code)
             
             elif message_type == 'ping':
                 await manager.send_personal_message({'type': 'pong'}, connection_id)
     
     except WebSocketDisconnect:
-        manager.disconnect(connection_id, game_code)
-        game_manager.disconnect_player(connection_id)
-        
-        await manager.broadcast_to_game(
-            {
-                'type': 'player_disconnected',
-                'nickname': nickname
-            },
-            game_code
-        )
+        await handle_disconnect(connection_id, game_code)
+
+
+async def handle_disconnect(connection_id: str, game_code: str):
+    """
+    Kapcsolat megszűnésének kezelése (kliens bontotta vagy a szívverés dobta ki)
+    """
+    manager.disconnect(connection_id, game_code)
+    event_coalescer.forget(game_code, connection_id)
+    player = await game_actors.call(game_code, game_manager.disconnect_player, connection_id)
+    
+    if player:
+        await event_coalescer.player_left(game_code, player.nickname)
+        # Ha már csak a lecsatlakozott játékosra vártunk, a kérdés most lezárul
+        if game_manager.all_answered(game_code):
+            await close_question(game_code)
+
+
+@router.websocket("/spectate/{game_code}")
+async def spectator_websocket(websocket: WebSocket, game_code: str):
+    """
+    WebSocket kapcsolat kivetítőknek és nézőknek (nem játszanak)
+    """
+    wire_format, subprotocol = negotiate(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    
+    session = game_manager.get_session(game_code)
+    
+    if not session:
+        message = "Nem létezik ilyen játék kód"
+        await websocket.send_json({
+            'type': 'error',
+            'message': message
+        })
+        await websocket.close(code=1008, reason=message)
+        return
+    
+    connection_id = f"{game_code}_spectator_{datetime.now().timestamp()}"
+    manager.register(websocket, connection_id, game_code, role=SPECTATOR, wire_format=wire_format)
+    
+    if websocket.query_params.get('events') == 'full':
+        event_coalescer.opt_out(game_code, connection_id)
+    
+    await manager.send_personal_message(
+        {
+            'type': 'connected',
+            'role': SPECTATOR,
+            'status': session.status,
+            'player_count': len(session.players)
+        },
+        connection_id
+    )
+    
+    try:
+        while True:
+            data = await receive_message(websocket)
+            heartbeat.touch(connection_id, pong=data.get('type') == 'pong', ping_id=data.get('id'))
+            
+            if data.get('type') == 'ping':
+                await manager.send_personal_message({'type': 'pong'}, connection_id)
+    
+    except WebSocketDisconnect:
+        await handle_disconnect(connection_id, game_code)
+
+
+@router.websocket("/host/{game_code}")
+async def host_websocket(websocket: WebSocket, game_code: str):
+    """
+    WebSocket kapcsolat a hostnak (a session lekérdezés pollozása helyett)
+    
+    A host az első üzenetben azonosít ({'type': 'auth', 'token': JWT}; a
+    token így nem kerül az URL-be és a hozzáférési naplókba), adatbázis
+    lekérdezés nélkül. Sikeres azonosítás után host_snapshot üzenet jön a
+    teljes állapottal és egy friss token, utána a változások: game_delta
+    (névsor, válaszok), question_started, question_finished (eredmények,
+    ranglista), game_finished, és kérdés indítása / lezárása után friss
+    host_snapshot.
+    
+    A host parancsai ugyanezen a kapcsolaton mennek (start_question,
+    finish_question, finish_game); mindegyikre command_result válasz jön.
+    A refresh_token üzenetre új token jön (a REST hívások X-New-Token
+    fejléce helyett).
+    """
+    wire_format, subprotocol = negotiate(websocket)
+    await websocket.accept(subprotocol=subprotocol)
+    
+    try:
+        auth = await asyncio.wait_for(receive_message(websocket), HOST_AUTH_TIMEOUT)
+    except WebSocketDisconnect:
+        return
+    except asyncio.TimeoutError:
+        auth = {}
+    
+    session = game_manager.get_session(game_code)
+    payload = decode_access_token(auth.get('token') or '') if auth.get('type') == 'auth' else None
+    
+    message = None
+    if not session:
+        message = "Nem létezik ilyen játék kód"
+    elif not payload or payload.get('sub') != str(session.host_user_id):
+        message = "Nincs jogosultságod"
+    
+    if message:
+        await websocket.send_json({
+            'type': 'error',
+            'message': message
+        })
+        await websocket.close(code=1008, reason=message)
+        return
+    
+    connection_id = f"{game_code}_host_{datetime.now().timestamp()}"
+    manager.register(websocket, connection_id, game_code, role=HOST, wire_format=wire_format)
+    
+    if websocket.query_params.get('events') == 'full':
+        event_coalescer.opt_out(game_code, connection_id)
+    
+    await manager.send_personal_message({'type': 'host_snapshot', **host_snapshot(session)}, connection_id)
+    await manager.send_personal_message(host_token(session), connection_id)
+    
+    try:
+        while True:
+            data = await receive_message(websocket)
+            
+            message_type = data.get('type')
+            heartbeat.touch(connection_id, pong=message_type == 'pong', ping_id=data.get('id'))
+            
+            if message_type == 'ping':
+                await manager.send_personal_message({'type': 'pong'}, connection_id)
+            
+            elif message_type == 'refresh_token':
+                await manager.send_personal_message(host_token(session), connection_id)
+            
+            elif message_type in HOST_COMMANDS:
+                result = await HOST_COMMANDS[message_type](game_code, data)
+                await manager.send_personal_message(
+                    {
+                        'type': 'command_result',
+                        'command': message_type,
+                        **result
+                    },
+                    connection_id
+                )
+    
+    except WebSocketDisconnect:
+        await handle_disconnect(connection_id, game_code)
+
+
+async def host_start_question(game_code: str, data: dict) -> dict:
+    question_index = data.get('question_index')
+    if type(question_index) is not int or not await begin_question(game_code, question_index):
+        return {'success': False, 'error': "Nem sikerült a kérdést elindítani"}
+    return {'success': True, 'question_index': question_index}
+
+
+def host_token(session) -> dict:
+    return {'type': 'token', 'token': create_access_token(data={"sub": str(session.host_user_id)})}
+
+
+async def host_finish_question(game_code: str, data: dict) -> dict:
+    closed, _ = await settle_question(game_code)
+    if not closed:
+        return {'success': False, 'error': "Nincs lezárható kérdés"}
+    return {'success': True}
+
+
+async def host_finish_game(game_code: str, data: dict) -> dict:
+    await end_game(game_code)
+    return {'success': True}
+
+
+# A host WebSocket parancsai (az eredményeket a szokásos üzenetek viszik ki)
+HOST_COMMANDS = {
+    'start_question': host_start_question,
+    'finish_question': host_finish_question,
+    'finish_game': host_finish_game
+}
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from typing import List
+from datetime import datetime, timezone
 import json
 
 from database.database import get_db
@@ -13,10 +14,21 @@ from schemas.quiz import (
 )
 from utils.dependencies import get_current_user
 from models.user import User
+from services.quiz_plans import quiz_plans
 
 router = APIRouter(prefix="/api/quizzes", tags=["quizzes"])
 
 
+def mark_quiz_changed(quiz: Quiz):
+    """
+    Új kvíz változat: új updated_at (a játék terv gyorsítótárakban minden
+    workeren új kulcs, egy újrahasznosított id sem talál régi tervet), a
+    helyi lefordított terv eldobása
+    """
+    quiz.updated_at = datetime.now(timezone.utc)
+    quiz_plans.invalidate(quiz.id)
+
+
 @router.post("", response_model=QuizResponse, status_code=status.HTTP_201_CREATED)
 async def create_quiz(
     quiz_data: QuizCreate,
@@ -62,6 +74,7 @@ async def create_quiz(
         )
         db.add(question)
     
+    mark_quiz_changed(new_quiz)
     db.commit()
     db.refresh(new_quiz)
     
@@ -163,6 +176,7 @@ async def update_quiz(
     if quiz_data.is_active is not None:
         quiz.is_active = quiz_data.is_active
     
+    mark_quiz_changed(quiz)
     db.commit()
     db.refresh(quiz)
     
@@ -195,6 +209,7 @@ async def delete_quiz(
     
     db.delete(quiz)
     db.commit()
+    quiz_plans.invalidate(quiz_id)
     
     return None
 
@@ -236,6 +251,7 @@ async def add_question(
     )
     
     db.add(question)
+    mark_quiz_changed(quiz)
     db.commit()
     db.refresh(question)
     
@@ -289,6 +305,7 @@ async def update_question(
     if question_data.order_index is not None:
         question.order_index = question_data.order_index
     
+    mark_quiz_changed(quiz)
     db.commit()
     db.refresh(question)
     
@@ -325,6 +342,7 @@ async def delete_question(
         )
     
     db.delete(question)
+    mark_quiz_changed(quiz)
     db.commit()
     
     return None
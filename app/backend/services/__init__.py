@@ -1,10 +1,22 @@
 from .game_manager import game_manager
+from .game_actor import game_actors
 from .websocket_manager import manager
+from .event_coalescer import event_coalescer
+from .heartbeat import heartbeat
+from .latency import latency
+from .session_reaper import session_reaper
+from .question_timers import question_timers
 from .export_service import generate_pdf_report, generate_excel_report
 
 __all__ = [
     'game_manager',
+    'game_actors',
     'manager',
+    'event_coalescer',
+    'heartbeat',
+    'latency',
+    'session_reaper',
+    'question_timers',
     'generate_pdf_report',
     'generate_excel_report',
 ]
@@ -0,0 +1,142 @@
+"""
+Kérdésenként egyszer lefordított válaszellenőrzők
+
+A helyes választ a kérdés indításakor egyszer értelmezzük típusos
+formára (index, bitmaszk, szám, sorrend tuple), a játékos válaszát pedig
+beérkezéskor, így a pontszámításkor már csak egyszerű összehasonlítás fut.
+A hibás formátumú válasz értelmezve None, ami sosem helyes.
+"""
+from typing import Any, Optional
+import json
+
+
+NUMBER_TOLERANCE = 0.01
+
+# Több választós kérdésnél legfeljebb ennyi opció jelölhető (a bitmaszk
+# mérete); a nagyobb index érvénytelen válasz, nem foglalhat óriási egészet
+MAX_OPTIONS = 64
+
+# A gyakori opció indexek szöveges alakja előre felépítve
+_INDEX_TEXT = {str(idx): idx for idx in range(MAX_OPTIONS)}
+
+
+def _load(value: Any) -> Any:
+    """
+    JSON szövegként érkező érték betöltése (a lista már betöltve jöhet)
+    """
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _index(value: Any) -> Optional[int]:
+    """
+    Nemnegatív opció index, ugyanazokkal a szövegekkel, amiket a
+    korábbi str() összehasonlítás elfogadott
+    """
+    if type(value) is str:
+        idx = _INDEX_TEXT.get(value)
+        if idx is not None:
+            return idx
+        if value.isascii() and value.isdigit() and value[0] != "0":
+            return int(value)
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value if value >= 0 else None
+    return None
+
+
+def _indices(value: Any) -> Optional[list]:
+    try:
+        items = _load(value)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(items, list):
+        return None
+    if any(isinstance(item, bool) or not isinstance(item, int) for item in items):
+        return None
+    return items
+
+
+class AnswerChecker:
+    """
+    Ellenőrző alaposztály: ismeretlen kérdéstípusnál semmi sem helyes
+    """
+    correct: Any = None
+
+    def parse(self, answer: Any) -> Any:
+        return None
+
+    def check(self, parsed: Any) -> bool:
+        return parsed is not None and parsed == self.correct
+
+
+class SingleChoiceChecker(AnswerChecker):
+    def __init__(self, correct_answer: Any):
+        self.correct = _index(str(correct_answer))
+
+    def parse(self, answer: Any) -> Optional[int]:
+        return _index(answer)
+
+
+class MultipleChoiceChecker(AnswerChecker):
+    """
+    A megjelölt opciók bitmaszkként, ismétlődés nélkül (index < MAX_OPTIONS)
+    """
+
+    def __init__(self, correct_answer: Any):
+        self.correct = self.parse(correct_answer)
+
+    def parse(self, answer: Any) -> Optional[int]:
+        indices = _indices(answer)
+        if indices is None:
+            return None
+
+        mask = 0
+        for idx in indices:
+            if idx < 0 or idx >= MAX_OPTIONS or mask & (1 << idx):
+                return None
+            mask |= 1 << idx
+        return mask
+
+
+class NumberChecker(AnswerChecker):
+    def __init__(self, correct_answer: Any, tolerance: float = NUMBER_TOLERANCE):
+        self.correct = self.parse(correct_answer)
+        self.tolerance = tolerance
+
+    def parse(self, answer: Any) -> Optional[float]:
+        try:
+            return float(answer)
+        except (ValueError, TypeError):
+            return None
+
+    def check(self, parsed: Optional[float]) -> bool:
+        return parsed is not None and self.correct is not None and abs(parsed - self.correct) < self.tolerance
+
+
+class OrderChecker(AnswerChecker):
+    def __init__(self, correct_answer: Any):
+        self.correct = self.parse(correct_answer)
+
+    def parse(self, answer: Any) -> Optional[tuple]:
+        indices = _indices(answer)
+        return tuple(indices) if indices is not None else None
+
+
+CHECKERS = {
+    'single_choice': SingleChoiceChecker,
+    'multiple_choice': MultipleChoiceChecker,
+    'number': NumberChecker,
+    'order': OrderChecker,
+}
+
+
+def compile_checker(question_type: Optional[str], correct_answer: Any) -> AnswerChecker:
+    """
+    Ellenőrző készítése egy kérdés típusához és helyes válaszához
+    """
+    checker = CHECKERS.get(question_type)
+    if checker is None:
+        return AnswerChecker()
+    return checker(correct_answer)
@@ -0,0 +1,138 @@
+"""
+Oszlopos tárolás a lezárt kérdések eredményeihez
+
+Kérdésenként egy-egy tömb tárolja a pontokat, a helyezést és a jelzőket
+(rögzítve, helyes, online), a játékos slot száma szerint indexelve. A
+szótár alakú eredmény csak szerializáláskor (export, host nézet) készül.
+"""
+from array import array
+from typing import Any, Dict, List, Optional
+
+
+RECORDED = 1
+CORRECT = 2
+ONLINE = 4
+
+
+class QuestionColumns:
+    """
+    Egy kérdés eredményei játékos slotonként
+    """
+    __slots__ = ('points', 'ranks', 'flags', 'answers')
+
+    def __init__(self, size: int = 0):
+        self.points = array('i', bytes(4 * size))
+        self.ranks = bytearray(size)
+        self.flags = bytearray(size)
+        self.answers: List[Any] = [None] * size
+
+    def grow(self, size: int):
+        missing = size - len(self.flags)
+        if missing > 0:
+            self.points.frombytes(bytes(4 * missing))
+            self.ranks.extend(bytes(missing))
+            self.flags.extend(bytes(missing))
+            self.answers.extend([None] * missing)
+
+
+class AnswerStore:
+    """
+    Egy session összes lezárt kérdésének eredménye
+    """
+    __slots__ = ('questions', 'size')
+
+    def __init__(self):
+        self.questions: Dict[int, QuestionColumns] = {}
+        self.size = 0
+
+    def add_slot(self) -> int:
+        """
+        Új játékos slot foglalása (a tömbök a következő rögzítéskor nőnek)
+        """
+        slot = self.size
+        self.size += 1
+        return slot
+
+    def record(self, question_index: int, slot: int, result: dict) -> int:
+        """
+        Eredmény rögzítése, visszatér a slot korábbi jelzőivel (0, ha még
+        nem volt rögzítve)
+        """
+        columns = self.questions.get(question_index)
+        if columns is None:
+            columns = self.questions[question_index] = QuestionColumns(self.size)
+        else:
+            columns.grow(self.size)
+
+        previous = columns.flags[slot]
+
+        columns.points[slot] = result.get('points', 0)
+        columns.ranks[slot] = result.get('rank') or 0
+        columns.flags[slot] = (
+            RECORDED
+            | (CORRECT if result.get('correct', False) else 0)
+            | (ONLINE if result.get('was_online', True) else 0)
+        )
+        columns.answers[slot] = result.get('answer')
+        return previous
+
+    def get(self, question_index: int, slot: int) -> Optional[dict]:
+        columns = self.questions.get(question_index)
+        if columns is None:
+            return None
+        return self._view(columns, slot)
+
+    def view(self, slot: int) -> Dict[int, dict]:
+        """
+        Egy játékos összes eredménye kérdés index szerint (szerializáláshoz)
+        """
+        scores = {}
+        for question_index, columns in self.questions.items():
+            entry = self._view(columns, slot)
+            if entry is not None:
+                scores[question_index] = entry
+        return scores
+
+    def dump(self) -> dict:
+        """
+        JSON kompatibilis alak a pillanatképhez
+        """
+        return {
+            'size': self.size,
+            'questions': {
+                question_index: {
+                    'points': columns.points.tolist(),
+                    'ranks': list(columns.ranks),
+                    'flags': list(columns.flags),
+                    'answers': list(columns.answers)
+                }
+                for question_index, columns in self.questions.items()
+            }
+        }
+
+    @classmethod
+    def load(cls, data: dict) -> "AnswerStore":
+        store = cls()
+        store.size = data['size']
+        for question_index, stored in data['questions'].items():
+            columns = QuestionColumns()
+            columns.points = array('i', stored['points'])
+            columns.ranks = bytearray(stored['ranks'])
+            columns.flags = bytearray(stored['flags'])
+            columns.answers = list(stored['answers'])
+            store.questions[int(question_index)] = columns
+        return store
+
+    @staticmethod
+    def _view(columns: QuestionColumns, slot: int) -> Optional[dict]:
+        if slot >= len(columns.flags) or not columns.flags[slot] & RECORDED:
+            return None
+
+        flags = columns.flags[slot]
+        return {
+            'correct': bool(flags & CORRECT),
+            'points': columns.points[slot],
+            'rank': columns.ranks[slot] or None,
+            'answer': columns.answers[slot],
+            'was_online': bool(flags & ONLINE)
+        }
@@ -0,0 +1,308 @@
+"""
+Broadcast backplane a worker folyamatok között
+
+Az InProcessBackplane az alapértelmezett (egy folyamat, nincs továbbítás).
+A RedisBackplane a Redis pub/sub protokollját (RESP) beszéli, így működik
+valódi Redis szerverrel és a beépített LocalBroker-rel is:
+
+    python -m services.backplane --port 6390
+    BROADCAST_BACKPLANE_URL=redis://127.0.0.1:6390
+
+Mit visz át: csak a ConnectionManager.broadcast_to_game üzeneteit, azokhoz
+a kapcsolatokhoz, amik egy másik folyamatban ugyanarra a játék kódra vannak
+regisztrálva. A send_personal_message nem megy át rajta, így a
+játékosonként személyre szabott question_finished és minden más személyes
+üzenet (connected, answer_submitted, pong, host pillanatkép) csak a saját
+folyamat kapcsolataihoz jut el.
+
+A játékállapot a játékot létrehozó folyamat memóriájában van, a többi
+folyamatban a csatlakozás (join_session) sikertelen, tehát ott nincs kinek
+továbbítani. Több workert a shardoló indító futtat (services.shard_router);
+ott egy játék minden kapcsolata a tulajdonos workeren van, a backplane
+nem kell, bekapcsolva csak többletterhelés. A sima "uvicorn --workers N"
+és a backplane együtt sem támogatott.
+"""
+from typing import Awaitable, Callable, List, Optional, Set
+from dataclasses import dataclass
+from urllib.parse import urlparse
+import argparse
+import asyncio
+import json
+import os
+import uuid
+
+
+BACKPLANE_URL = os.getenv("BROADCAST_BACKPLANE_URL", "")
+BACKPLANE_CHANNEL = os.getenv("BROADCAST_BACKPLANE_CHANNEL", "quizmaster:broadcast")
+RECONNECT_DELAY = 1.0
+
+
+@dataclass
+class Envelope:
+    """
+    Worker folyamatok között továbbított broadcast
+    """
+    origin: str
+    game_code: str
+    text: str
+    topics: Optional[List[str]] = None
+    only: Optional[List[str]] = None
+    exclude: Optional[List[str]] = None
+
+    def encode(self) -> bytes:
+        header = json.dumps({
+            'origin': self.origin,
+            'game_code': self.game_code,
+            'topics': self.topics,
+            'only': self.only,
+            'exclude': self.exclude
+        }, separators=(",", ":"))
+        return f"{header}\n{self.text}".encode("utf-8")
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Envelope":
+        header, text = data.decode("utf-8").split("\n", 1)
+        return cls(text=text, **json.loads(header))
+
+
+DeliverCallback = Callable[[Envelope], Awaitable[None]]
+
+
+class Backplane:
+    """
+    Backplane alaposztály: a helyi kézbesítést a ConnectionManager végzi,
+    a backplane csak a többi worker felé továbbít
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self.deliver: Optional[DeliverCallback] = None
+
+    async def start(self, deliver: DeliverCallback):
+        self.deliver = deliver
+
+    async def stop(self):
+        pass
+
+    async def publish(self, envelope: Envelope):
+        pass
+
+
+class InProcessBackplane(Backplane):
+    """
+    Egy folyamatos üzemmód: nincs kinek továbbítani
+    """
+
+
+def _bulk(data) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+def encode_command(*args) -> bytes:
+    """
+    RESP parancs kódolása
+    """
+    return b"*%d\r\n" % len(args) + b"".join(_bulk(arg) for arg in args)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """
+    Egy RESP válasz beolvasása
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("A backplane kapcsolat megszakadt")
+
+    prefix, rest = line[:1], line[1:-2]
+    if prefix == b"+":
+        return rest.decode()
+    if prefix == b"-":
+        raise ConnectionError(rest.decode())
+    if prefix == b":":
+        return int(rest)
+    if prefix == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if prefix == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Ismeretlen RESP válasz: {line!r}")
+
+
+class RedisBackplane(Backplane):
+    """
+    Továbbítás Redis pub/sub (RESP) protokollon egyetlen csatornán
+    """
+
+    def __init__(self, url: str, channel: str = BACKPLANE_CHANNEL):
+        super().__init__()
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.channel = channel
+        self._publisher: Optional[asyncio.StreamWriter] = None
+        self._publisher_reader: Optional[asyncio.Task] = None
+        self._subscriber: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            writer.write(encode_command("AUTH", self.password))
+            await read_reply(reader)
+        return reader, writer
+
+    async def start(self, deliver: DeliverCallback):
+        await super().start(deliver)
+        self._subscriber = asyncio.ensure_future(self._subscribe_loop())
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout=RECONNECT_DELAY * 5)
+        except asyncio.TimeoutError:
+            pass
+
+    async def stop(self):
+        for task in (self._subscriber, self._publisher_reader):
+            if task is not None:
+                task.cancel()
+        if self._publisher is not None:
+            self._publisher.close()
+            self._publisher = None
+
+    async def _subscribe_loop(self):
+        while True:
+            writer = None
+            try:
+                reader, writer = await self._open()
+                writer.write(encode_command("SUBSCRIBE", self.channel))
+                await writer.drain()
+                await read_reply(reader)
+                self._subscribed.set()
+
+                while True:
+                    reply = await read_reply(reader)
+                    if not isinstance(reply, list) or len(reply) != 3 or reply[0] != b"message":
+                        continue
+                    envelope = Envelope.decode(reply[2])
+                    if envelope.origin != self.origin and self.deliver is not None:
+                        await self.deliver(envelope)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._subscribed.clear()
+                await asyncio.sleep(RECONNECT_DELAY)
+            finally:
+                if writer is not None:
+                    writer.close()
+
+    async def _drain_replies(self, reader: asyncio.StreamReader):
+        """
+        A PUBLISH válaszok (feliratkozók száma) eldobása
+        """
+        try:
+            while True:
+                await read_reply(reader)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._publisher = None
+
+    async def publish(self, envelope: Envelope):
+        try:
+            if self._publisher is None or self._publisher.is_closing():
+                reader, self._publisher = await self._open()
+                self._publisher_reader = asyncio.ensure_future(self._drain_replies(reader))
+            self._publisher.write(encode_command("PUBLISH", self.channel, envelope.encode()))
+            await self._publisher.drain()
+        except (ConnectionError, OSError):
+            self._publisher = None
+
+
+def create_backplane(url: str = BACKPLANE_URL) -> Backplane:
+    """
+    Backplane létrehozása a BROADCAST_BACKPLANE_URL alapján
+    """
+    if url.startswith("redis://"):
+        return RedisBackplane(url)
+    return InProcessBackplane()
+
+
+class LocalBroker:
+    """
+    Minimális RESP pub/sub szerver (SUBSCRIBE, PUBLISH, PING) helyi
+    többworkeres futtatáshoz és tesztekhez
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.subscribers: dict = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        channels: Set[bytes] = set()
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    continue
+                name = command[0].upper()
+
+                if name == b"SUBSCRIBE":
+                    for channel in command[1:]:
+                        channels.add(channel)
+                        self.subscribers.setdefault(channel, set()).add(writer)
+                        writer.write(b"*3\r\n" + _bulk("subscribe") + _bulk(channel) + b":%d\r\n" % len(channels))
+                elif name == b"PUBLISH":
+                    channel, payload = command[1], command[2]
+                    receivers = self.subscribers.get(channel, set())
+                    message = encode_command("message", channel, payload)
+                    for receiver in list(receivers):
+                        receiver.write(message)
+                    writer.write(b":%d\r\n" % len(receivers))
+                elif name == b"PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for channel in channels:
+                self.subscribers.get(channel, set()).discard(writer)
+            writer.close()
+
+
+async def _serve(host: str, port: int):
+    broker = LocalBroker(host, port)
+    await broker.start()
+    print(f"Backplane broker: {broker.url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Helyi RESP pub/sub broker")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.host, args.port))
@@ -0,0 +1,176 @@
+"""
+Játék kódok kiosztása kulcsolt permutációval
+
+A 6 jegyű kódtér (36^6) minden eleme egy számlálóérték titkos kulccsal
+permutált képe: a számláló két 36^3 méretű félre bomlik, amin egy
+négykörös Feistel háló fut (kulcsolt blake2b körfüggvénnyel). A Feistel
+háló bijekció, így két különböző számlálóértékből sosem lesz ugyanaz a
+kód, a kiosztás pedig próbálgatás nélkül, konstans időben történik; a
+kulcs ismerete nélkül a következő kód nem találgatható ki.
+
+Több shard esetén a worker a számlálók közül csak a shard indexével
+kongruenseket (index, index + N, ...) használja, a kód tulajdonos
+shardját pedig az inverz permutáció adja meg (services.sharding).
+
+A számláló véletlen pontról indul, így újraindítás után sem ugyanazokat
+a kódokat osztja ki; a felszabadított kódok a számláló körbeérése után
+is csak a türelmi idő (cooldown) letelte után adhatók ki újra.
+"""
+from collections import OrderedDict
+from typing import Callable, Mapping, Optional
+import hashlib
+import os
+import secrets
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+CODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+CODE_LENGTH = 6
+HALF_SPACE = len(CODE_ALPHABET) ** (CODE_LENGTH // 2)
+CODE_SPACE = HALF_SPACE * HALF_SPACE
+ROUNDS = 4
+
+
+
+def code_key(environ: Mapping[str, str] = os.environ) -> bytes:
+    """
+    A permutáció kulcsa egy környezetből (GAME_CODE_KEY, ennek hiányában SECRET_KEY)
+    """
+    return (environ.get("GAME_CODE_KEY") or environ.get("SECRET_KEY") or "").encode()
+
+
+# A permutáció kulcsa: minden workernek és diszpécsernek azonosnak kell
+# lennie, ezért az indító (services.shard_router) kifejezetten átadja
+CODE_KEY = code_key()
+
+# Felszabadított kód újrakiosztása legkorábban ennyi idő múlva (s)
+REUSE_COOLDOWN = float(os.getenv("GAME_CODE_REUSE_COOLDOWN", "86400"))
+
+_DIGITS = {char: value for value, char in enumerate(CODE_ALPHABET)}
+
+
+class CodePermutation:
+    """
+    Kulcsolt bijekció a [0, 36^6) tartományon
+    """
+    __slots__ = ('_keys',)
+
+    def __init__(self, key: bytes = CODE_KEY):
+        # Körönként külön kulcs, hogy a körfüggvények függetlenek legyenek
+        self._keys = [
+            hashlib.blake2b(bytes([index]) + key, digest_size=32).digest()
+            for index in range(ROUNDS)
+        ]
+
+    def _round(self, index: int, half: int) -> int:
+        digest = hashlib.blake2b(half.to_bytes(4, 'big'), key=self._keys[index], digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % HALF_SPACE
+
+    def forward(self, value: int) -> int:
+        left, right = divmod(value, HALF_SPACE)
+        for index in range(ROUNDS):
+            left, right = right, (left + self._round(index, right)) % HALF_SPACE
+        return left * HALF_SPACE + right
+
+    def inverse(self, value: int) -> int:
+        left, right = divmod(value, HALF_SPACE)
+        for index in reversed(range(ROUNDS)):
+            left, right = (right - self._round(index, left)) % HALF_SPACE, left
+        return left * HALF_SPACE + right
+
+
+def encode(value: int) -> str:
+    chars = []
+    for _ in range(CODE_LENGTH):
+        value, digit = divmod(value, len(CODE_ALPHABET))
+        chars.append(CODE_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def decode(code: str) -> Optional[int]:
+    """
+    A kód számértéke (None, ha nem érvényes kód)
+    """
+    if len(code) != CODE_LENGTH:
+        return None
+    value = 0
+    for char in code.upper():
+        digit = _DIGITS.get(char)
+        if digit is None:
+            return None
+        value = value * len(CODE_ALPHABET) + digit
+    return value
+
+
+permutation = CodePermutation()
+
+
+def counter_of(code: str, key_permutation: Optional[CodePermutation] = None) -> Optional[int]:
+    """
+    A kódhoz tartozó számlálóérték (None, ha nem érvényes kód)
+    """
+    value = decode(code)
+    return None if value is None else (key_permutation or permutation).inverse(value)
+
+
+class CodeAllocator:
+    """
+    Egyedi játék kódok kiosztása egy shard számára
+    """
+
+    def __init__(
+        self,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        cooldown: float = REUSE_COOLDOWN,
+        start: Optional[int] = None,
+        key_permutation: Optional[CodePermutation] = None
+    ):
+        self.permutation = key_permutation or permutation
+        self.shard_index = shard_index
+        self.shard_count = max(shard_count, 1)
+        self.cooldown = cooldown
+        # A shardhoz tartozó számlálóértékek: shard_index + k * shard_count
+        self.slots = (CODE_SPACE - shard_index + self.shard_count - 1) // self.shard_count
+        self._next = secrets.randbelow(self.slots) if start is None else start % self.slots
+        self._released: OrderedDict[str, float] = OrderedDict()
+
+    def allocate(self, in_use: Callable[[str], bool] = lambda code: False) -> str:
+        """
+        Következő szabad kód
+
+        A foglaltság és a cooldown ellenőrzés csak a számláló körbeérése
+        (vagy újraindítás után a korábbi kódokkal való ütközés) esetén lép
+        tovább, egyébként az első jelölt szabad.
+        """
+        self._expire(time.monotonic())
+        for _ in range(self.slots):
+            counter = self.shard_index + self._next * self.shard_count
+            self._next = (self._next + 1) % self.slots
+            code = encode(self.permutation.forward(counter))
+            if code not in self._released and not in_use(code):
+                return code
+        raise RuntimeError("Elfogytak a kiosztható játék kódok")
+
+    def release(self, game_code: str):
+        """
+        A kód felszabadítása: a cooldown letelte előtt nem adható ki újra
+        """
+        self._released.pop(game_code, None)
+        self._released[game_code] = time.monotonic() + self.cooldown
+        self._expire(time.monotonic())
+
+    def _expire(self, now: float):
+        released = self._released
+        while released:
+            code, until = next(iter(released.items()))
+            if until > now:
+                break
+            del released[code]
+
+    def cooling_down(self, game_code: str) -> bool:
+        return game_code in self._released
@@ -0,0 +1,176 @@
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass, field
+import asyncio
+import os
+
+from services.websocket_manager import ConnectionManager, manager, HOST, PLAYER, SPECTATOR
+
+
+# Az összevont game_delta üzenetek küldési gyakorisága (ms), 0 = kikapcsolva
+EVENT_TICK_MS = float(os.getenv("GAME_EVENT_TICK_MS", "100"))
+
+# A hostnak és a kivetítőknek szóló részletes nézet címzettjei
+OBSERVERS = (HOST, SPECTATOR)
+
+
+@dataclass
+class GameDelta:
+    """
+    Egy tick alatt összegyűlt változások egy játékban
+
+    A joined / left sorrendtartó halmazként (dict) tárolja a beceneveket,
+    így egy csatlakozási vihar minden eseménye konstans idejű.
+    """
+    answered: List[str] = field(default_factory=list)
+    joined: Dict[str, None] = field(default_factory=dict)
+    left: Dict[str, None] = field(default_factory=dict)
+    answers_count: Optional[int] = None
+    total_players: Optional[int] = None
+
+    def to_message(self) -> dict:
+        return {
+            'type': 'game_delta',
+            'answered': self.answered,
+            'joined': list(self.joined),
+            'left': list(self.left),
+            'answers_count': self.answers_count,
+            'total_players': self.total_players
+        }
+
+    def to_player_message(self) -> dict:
+        """
+        Játékosoknak szóló változat: csak a számlálók, becenevek nélkül
+        """
+        return {
+            'type': 'game_delta',
+            'answers_count': self.answers_count,
+            'total_players': self.total_players
+        }
+
+
+class EventCoalescer:
+    """
+    A gyakori játékesemények (answer_received, player_joined,
+    player_disconnected) összevonása tickenként egyetlen game_delta üzenetbe
+
+    Az összevonásból kiiratkozott kapcsolatok minden eseményt azonnal,
+    egyenként kapnak meg. A becenevek csak a hostnak és a kivetítőknek
+    mennek ki, a játékosok a számlálókat kapják.
+    """
+
+    def __init__(self, connections: ConnectionManager, tick_ms: float = EVENT_TICK_MS):
+        self.connections = connections
+        self.tick = tick_ms / 1000
+        self.pending: Dict[str, GameDelta] = {}
+        self.exact_subscribers: Dict[str, Set[str]] = {}
+        self._flushers: Dict[str, asyncio.Task] = {}
+
+    def opt_out(self, game_code: str, connection_id: str):
+        """
+        Kapcsolat feliratkozása a pontos, eseményenkénti üzenetekre
+        """
+        self.exact_subscribers.setdefault(game_code, set()).add(connection_id)
+
+    def forget(self, game_code: str, connection_id: str):
+        """
+        Lecsatlakozott kapcsolat eltávolítása
+        """
+        subscribers = self.exact_subscribers.get(game_code)
+        if subscribers is not None:
+            subscribers.discard(connection_id)
+            if not subscribers:
+                del self.exact_subscribers[game_code]
+
+    async def answer_received(self, game_code: str, nickname: str, answers_count: int, total_players: int):
+        await self._emit(
+            game_code,
+            {
+                'type': 'answer_received',
+                'nickname': nickname,
+                'answers_count': answers_count,
+                'total_players': total_players
+            },
+            {
+                'type': 'answer_received',
+                'answers_count': answers_count,
+                'total_players': total_players
+            }
+        )
+        if self.tick > 0:
+            delta = self._delta(game_code)
+            delta.answered.append(nickname)
+            delta.answers_count = answers_count
+            delta.total_players = total_players
+
+    async def player_joined(self, game_code: str, nickname: str, total_players: Optional[int] = None):
+        await self._emit(game_code, {'type': 'player_joined', 'nickname': nickname})
+        if self.tick > 0:
+            delta = self._delta(game_code)
+            if nickname in delta.left:
+                del delta.left[nickname]
+            else:
+                delta.joined[nickname] = None
+            if total_players is not None:
+                delta.total_players = total_players
+
+    async def player_left(self, game_code: str, nickname: str):
+        await self._emit(game_code, {'type': 'player_disconnected', 'nickname': nickname})
+        if self.tick > 0:
+            delta = self._delta(game_code)
+            if nickname in delta.joined:
+                del delta.joined[nickname]
+            else:
+                delta.left[nickname] = None
+
+    async def _emit(self, game_code: str, message: dict, player_message: Optional[dict] = None):
+        """
+        Az egyedi esemény azonnali küldése: kikapcsolt összevonásnál
+        mindenkinek, egyébként csak a kiiratkozott kapcsolatoknak
+        """
+        if self.tick <= 0:
+            only = None
+        else:
+            only = self.exact_subscribers.get(game_code)
+            if not only:
+                return
+
+        if player_message is None:
+            await self.connections.broadcast_to_game(message, game_code, only=only)
+            return
+
+        await self.connections.broadcast_to_game(message, game_code, topics=OBSERVERS, only=only)
+        await self.connections.broadcast_to_game(player_message, game_code, topics=(PLAYER,), only=only)
+
+    def _delta(self, game_code: str) -> GameDelta:
+        delta = self.pending.get(game_code)
+        if delta is None:
+            delta = self.pending[game_code] = GameDelta()
+
+        flusher = self._flushers.get(game_code)
+        if flusher is None or flusher.done():
+            self._flushers[game_code] = asyncio.ensure_future(self._flush_later(game_code))
+
+        return delta
+
+    async def _flush_later(self, game_code: str):
+        await asyncio.sleep(self.tick)
+        await self.flush(game_code)
+
+    async def flush(self, game_code: str):
+        """
+        A függőben lévő változások kiküldése a játék összevont címzettjeinek
+        """
+        flusher = self._flushers.pop(game_code, None)
+        if flusher is not None and flusher is not asyncio.current_task():
+            flusher.cancel()
+
+        delta = self.pending.pop(game_code, None)
+        if delta is None:
+            return
+
+        exact = self.exact_subscribers.get(game_code)
+        await self.connections.broadcast_to_game(delta.to_message(), game_code, topics=OBSERVERS, exclude=exact)
+        await self.connections.broadcast_to_game(delta.to_player_message(), game_code, topics=(PLAYER,), exclude=exact)
+
+
+event_coalescer = EventCoalescer(manager)
@@ -0,0 +1,279 @@
+"""
+Játékállapot napló (journal) és összeomlás utáni helyreállítás
+
+Minden állapotváltozás egy JSON sorként kerül a naplófájlba. A hívó csak
+egy pufferbe tesz (nincs I/O a kérés útvonalán), a fájlba írást és az
+fsync-et egy háttérszál végzi csoportosan (group commit): amíg egy fsync
+fut, a közben érkező események a következő körben együtt íródnak ki.
+Összeomláskor legfeljebb az utolsó, még ki nem írt kör vész el.
+
+Ha az írás meghiúsul (pl. betelt a lemez), a háttérszál naplózza a hibát
+és a napló kikapcsol: a játék memóriában folytatódik, az új események
+eldobódnak, a hibát a flush és a close JournalError-ként jelzi.
+
+A tömörítés (compaction) a teljes állapotról pillanatképet ír, utána a
+napló csak a pillanatkép utáni eseményeket tartalmazza. Indításkor a
+pillanatkép, majd a napló eseményei kerülnek visszajátszásra.
+
+Bekapcsolás:
+    GAME_JOURNAL_PATH=/var/lib/quizmaster/games.journal
+"""
+from typing import Iterator, List, Optional, Tuple
+import json
+import logging
+import os
+import threading
+import time
+
+
+JOURNAL_PATH = os.getenv("GAME_JOURNAL_PATH", "")
+
+# Ennyi ideig gyűjti a háttérszál az eseményeket egy fsync előtt (ms)
+COMMIT_INTERVAL_MS = float(os.getenv("GAME_JOURNAL_COMMIT_MS", "5"))
+
+# Ennyi esemény után készül új pillanatkép
+SNAPSHOT_EVERY = int(os.getenv("GAME_JOURNAL_SNAPSHOT_EVERY", "20000"))
+
+logger = logging.getLogger(__name__)
+
+
+class JournalError(RuntimeError):
+    """
+    A napló írása meghiúsult, a naplózás kikapcsolt
+    """
+
+
+class EventJournal:
+    """
+    Csak hozzáfűzhető eseménynapló csoportos fsync-kel
+    """
+
+    def __init__(
+        self,
+        path: str,
+        commit_interval_ms: float = COMMIT_INTERVAL_MS,
+        snapshot_every: int = SNAPSHOT_EVERY
+    ):
+        self.path = path
+        self.snapshot_path = f"{path}.snapshot"
+        self.commit_interval = commit_interval_ms / 1000
+        self.snapshot_every = snapshot_every
+
+        self.seq = 0
+        self.durable_seq = 0
+        self.snapshot_seq = 0
+        self.commits = 0
+
+        self._buffer: List[Tuple[int, dict]] = []
+        self._snapshot: Optional[Tuple[int, dict]] = None
+        self._closing = False
+        self._error: Optional[BaseException] = None
+        self._cond = threading.Condition()
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._valid_size: Optional[int] = None
+
+    # --- visszajátszás ---
+
+    def replay(self) -> Tuple[Optional[dict], Iterator[dict]]:
+        """
+        A legutóbbi pillanatkép és az utána rögzített események
+
+        Indítás (open) előtt kell hívni. A félbeszakadt utolsó sort
+        (összeomlás írás közben) figyelmen kívül hagyja.
+        """
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            self.snapshot_seq = snapshot['seq']
+            self.seq = self.durable_seq = self.snapshot_seq
+
+        return snapshot, self._events()
+
+    def _events(self) -> Iterator[dict]:
+        if not os.path.exists(self.path):
+            return
+
+        self._valid_size = 0
+        with open(self.path, "rb") as journal_file:
+            for line in journal_file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break
+                self._valid_size += len(line)
+                if event['seq'] <= self.snapshot_seq:
+                    continue
+                self.seq = self.durable_seq = event['seq']
+                yield event
+
+    # --- írás ---
+
+    def open(self):
+        """
+        Naplófájl megnyitása hozzáfűzésre és a háttérszál indítása
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._valid_size is not None and self._file.tell() > self._valid_size:
+            # Félbeszakadt utolsó sor levágása, hogy ne folyjon össze a következővel
+            self._file.truncate(self._valid_size)
+        self._thread = threading.Thread(target=self._run, name="event-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, event: dict) -> int:
+        """
+        Esemény rögzítése; nem vár az írásra, visszatér a sorszámával
+
+        A szerializálás is a háttérszálon történik, ezért az eseményt
+        átadás után nem szabad módosítani. Írási hiba után az esemény
+        eldobódik (a puffer nem nőhet korlátlanul).
+        """
+        with self._cond:
+            if self._error is not None:
+                return self.seq
+            self.seq += 1
+            seq = self.seq
+            self._buffer.append((seq, event))
+            self._cond.notify()
+        return seq
+
+    def append_many(self, events: List[dict]) -> int:
+        """
+        Több esemény rögzítése egy lépésben (kötegelt beküldéshez)
+        """
+        with self._cond:
+            if self._error is not None:
+                return self.seq
+            for event in events:
+                self.seq += 1
+                self._buffer.append((self.seq, event))
+            self._cond.notify()
+            return self.seq
+
+    def needs_snapshot(self) -> bool:
+        return self.seq - self.snapshot_seq >= self.snapshot_every
+
+    def compact(self, state: dict):
+        """
+        Pillanatkép kérése az aktuális állapotról
+
+        Az állapotnak az eddig rögzített összes eseményt tartalmaznia kell;
+        a kiírás és a napló csonkolása a háttérszálon történik.
+        """
+        with self._cond:
+            self._snapshot = (self.seq, state)
+            self.snapshot_seq = self.seq
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Várakozás, amíg az eddigi események tartósan (fsync) kiíródnak
+
+        Írási hiba esetén JournalError-t dob.
+        """
+        with self._cond:
+            target = self.seq
+            self._cond.notify()
+            durable = self._cond.wait_for(
+                lambda: self.durable_seq >= target or self._error is not None or self._thread is None,
+                timeout
+            )
+            self._raise_error()
+            return durable
+
+    def close(self):
+        """
+        A függő események kiírása és a napló lezárása
+
+        A fájlt írási hiba esetén is lezárja, utána JournalError-t dob.
+        """
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+        with self._cond:
+            self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise JournalError(f"A napló írása meghiúsult: {self._error}") from self._error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._buffer or self._snapshot or self._closing)
+                if not self._buffer and not self._snapshot and self._closing:
+                    return
+
+            if self.commit_interval > 0 and not self._closing:
+                # A közben érkező események is ebbe a körbe kerüljenek
+                time.sleep(self.commit_interval)
+
+            with self._cond:
+                batch, self._buffer = self._buffer, []
+                snapshot, self._snapshot = self._snapshot, None
+
+            try:
+                if snapshot is not None:
+                    self._write_snapshot(*snapshot)
+                    batch = [(seq, event) for seq, event in batch if seq > snapshot[0]]
+                if batch:
+                    self._file.write("".join(
+                        json.dumps({'seq': seq, **event}, separators=(",", ":"), ensure_ascii=False) + "\n"
+                        for seq, event in batch
+                    ))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    self.commits += 1
+            except Exception as error:
+                logger.error("A napló írása meghiúsult, a naplózás kikapcsol: %s", self.path, exc_info=error)
+                with self._cond:
+                    self._error = error
+                    self._buffer = []
+                    self._snapshot = None
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                if batch:
+                    self.durable_seq = max(self.durable_seq, batch[-1][0])
+                if snapshot is not None:
+                    self.durable_seq = max(self.durable_seq, snapshot[0])
+                self._cond.notify_all()
+
+    def _write_snapshot(self, seq: int, state: dict):
+        """
+        Pillanatkép atomi kiírása, majd a napló újrakezdése
+        """
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump({'seq': seq, **state}, snapshot_file, separators=(",", ":"), ensure_ascii=False)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        self._fsync_directory()
+
+        self._file.close()
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _fsync_directory(self):
+        directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
@@ -0,0 +1,146 @@
+"""
+Játékonkénti actor a GameManager állapotváltozásaihoz
+
+Minden játékhoz egy postafiók (mailbox) tartozik; a WebSocket és host
+végpontok módosításai (csatlakozás, lecsatlakozás, válasz, kérdés
+indítás / lezárás, játék vége) parancsként kerülnek bele, és a játék actor
+feladata sorban hajtja végre őket.
+
+Nem minden a postafiókon megy át: az olvasások (pl. /current-question,
+ranglista, export), a játék létrehozása és a session takarító (törlés,
+archiválás) közvetlenül a GameManager-t hívja. Ez egy eseményhurkon belül
+biztonságos, mert ezek a hívások nem várakoznak (await) az állapot
+módosítása közben; az actor a sorrendet és a válaszok kötegelését adja,
+nem kizárólagos hozzáférést.
+
+Az actor feladat csak addig fut, amíg van feldolgozandó parancs: a
+postafiók kiürülésekor kilép, a következő parancs új feladatot indít. A
+feladat az első parancs utáni ciklus-iterációban indul, addigra a többi
+kapcsolat közben érkezett parancsai is a postafiókba kerülnek; az
+egymást követő válaszok egyetlen kötegként (submit_answers) futnak le.
+"""
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+import asyncio
+import time
+
+from services.game_manager import GameManager, game_manager
+
+
+class Command:
+    """
+    Egy postafiókba tett parancs és a hívónak visszaadott future
+    """
+    __slots__ = ('action', 'args', 'future')
+
+    def __init__(self, action: Optional[Callable], args: tuple, future: asyncio.Future):
+        self.action = action
+        self.args = args
+        self.future = future
+
+
+class GameActor:
+    """
+    Egy játék postafiókja és a feldolgozó feladata
+    """
+    __slots__ = ('game_code', 'games', 'mailbox', 'task', 'batches', 'processed')
+
+    def __init__(self, game_code: str, games: GameManager):
+        self.game_code = game_code
+        self.games = games
+        self.mailbox: Deque[Command] = deque()
+        self.task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.processed = 0
+
+    def drain(self):
+        """
+        A postafiók összes parancsának végrehajtása érkezési sorrendben
+        """
+        mailbox = self.mailbox
+        while mailbox:
+            command = mailbox.popleft()
+            if command.action is not None:
+                self._run(command)
+                continue
+
+            # Egymást követő válaszok egy kötegben
+            batch = [command]
+            while mailbox and mailbox[0].action is None:
+                batch.append(mailbox.popleft())
+            self._answer(batch)
+
+    def _run(self, command: Command):
+        self.processed += 1
+        try:
+            result = command.action(*command.args)
+        except Exception as error:
+            if not command.future.done():
+                command.future.set_exception(error)
+            return
+        if not command.future.done():
+            command.future.set_result(result)
+
+    def _answer(self, batch: List[Command]):
+        self.batches += 1
+        self.processed += len(batch)
+        try:
+            accepted = self.games.submit_answers(self.game_code, [command.args for command in batch])
+        except Exception as error:
+            for command in batch:
+                if not command.future.done():
+                    command.future.set_exception(error)
+            return
+        for command, success in zip(batch, accepted):
+            if not command.future.done():
+                command.future.set_result(success)
+
+
+class GameActors:
+    """
+    A játék actorok nyilvántartása
+    """
+
+    def __init__(self, games: GameManager):
+        self.games = games
+        self.actors: Dict[str, GameActor] = {}
+
+    def _post(self, game_code: str, action: Optional[Callable], args: tuple) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        actor = self.actors.get(game_code)
+        if actor is None:
+            actor = self.actors[game_code] = GameActor(game_code, self.games)
+        actor.mailbox.append(Command(action, args, future))
+        if actor.task is None:
+            actor.task = asyncio.ensure_future(self._run(actor))
+        return future
+
+    async def _run(self, actor: GameActor):
+        try:
+            actor.drain()
+        finally:
+            actor.task = None
+            if actor.mailbox:
+                # Végrehajtás közben érkezett parancsok (pl. egy future callbackjéből)
+                actor.task = asyncio.ensure_future(self._run(actor))
+            elif self.actors.get(actor.game_code) is actor:
+                del self.actors[actor.game_code]
+
+    def call(self, game_code: str, action: Callable, *args) -> Awaitable[Any]:
+        """
+        Módosítás végrehajtása a játék actorán; a parancs már a híváskor a
+        postafiókba kerül, a visszaadott future az eredményt adja
+        """
+        return self._post(game_code, action, args)
+
+    def answer(self, game_code: str, nickname: str, answer: Any, rtt_ns: int = 0) -> Awaitable[bool]:
+        """
+        Válasz beküldése kötegelt feldolgozással
+
+        A beérkezés ideje itt rögzül, így a határidő és a válaszidő nem
+        függ attól, mikor dolgozza fel az actor.
+        """
+        return self._post(game_code, None, (nickname, answer, rtt_ns, time.monotonic_ns()))
+
+
+game_actors = GameActors(game_manager)
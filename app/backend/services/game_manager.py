@@ -1,21 +1,63 @@
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from itertools import islice
+import hashlib
+import heapq
+import json
+import os
 import random
-import string
+import time
 
+from sortedcontainers import SortedList
 
-@dataclass
+from services.answer_checker import AnswerChecker, compile_checker
+from services.answer_store import AnswerStore, CORRECT, RECORDED
+from services.code_allocator import CodeAllocator
+from services.event_journal import EventJournal
+from services.leaderboard_feed import LeaderboardFeed, initial_version
+from services import sharding
+
+
+# Gyorsasági bónusz az első helyes válaszoknak (helyezés -> pont)
+SPEED_BONUS = {1: 3, 2: 2, 3: 1}
+
+# Alapértelmezett válaszidő (s) és a határidő utáni türelmi idő a hálózaton
+# úton lévő válaszoknak (ms)
+DEFAULT_TIME_LIMIT = 30
+ANSWER_GRACE_MS = float(os.getenv("GAME_ANSWER_GRACE_MS", "500"))
+
+# Becsült memóriaigény a session méretének számításához (bájt)
+SESSION_BYTES = 4096
+PLAYER_BYTES = 400
+ANSWER_BYTES = 14
+
+
+@dataclass(slots=True)
 class Player:
     """
     Játékos adatai
+
+    A kérdésenkénti eredmények a session AnswerStore-jában vannak, a
+    játékos slot száma (csatlakozási sorszám) szerint indexelve.
     """
     nickname: str
     connection_id: str
     score: int = 0
-    answers: Dict[int, dict] = field(default_factory=dict)
     connected: bool = True
     joined_at: datetime = field(default_factory=datetime.now)
+    slot: int = 0
+    correct_answers: int = 0
+    total_answers: int = 0
+
+    @property
+    def rank_key(self) -> tuple:
+        """
+        Rendezési kulcs a ranglistán: pontszám szerint csökkenő, azonos
+        pontszámnál a csatlakozás sorrendje dönt
+        """
+        return (-self.score, self.slot, self.nickname)
 
 
 @dataclass
@@ -28,6 +70,21 @@ class QuestionState:
     started_at: datetime
     answers_received: Dict[str, dict] = field(default_factory=dict)
     finished: bool = False
+    checker: AnswerChecker = field(default_factory=AnswerChecker)
+    results: Dict[str, dict] = field(default_factory=dict)
+    correct_order: Dict[str, None] = field(default_factory=dict)
+    # Válaszadás lezárásának ideje (time.monotonic, türelmi idővel együtt)
+    closes_at: float = float('inf')
+    # Online játékosok, akik még nem válaszoltak
+    waiting_for: Set[str] = field(default_factory=set)
+    # Kérdés kiküldésének ideje (time.monotonic_ns); minden játékos
+    # válaszideje ettől mérődik, a kérdés közben (újra)csatlakozóké is, mert
+    # a kérdés addigra a /current-question végponton is olvasható volt
+    started_ns: int = 0
+    # A játékosoknak szóló kérdés válasz nélkül, előre kódolva (kérdésenként
+    # állandó, a hátralévő idő nincs benne) és a hozzá tartozó ETag
+    player_payload: bytes = b''
+    player_etag: str = ''
 
 
 @dataclass
@@ -48,6 +105,34 @@ class GameSession:
     
     quiz_data: Optional[dict] = None
     questions: List[dict] = field(default_factory=list)
+    
+    ranking: SortedList = field(default_factory=SortedList)
+    answers: AnswerStore = field(default_factory=AnswerStore)
+    
+    # Utolsó állapotváltozás és utolsó hozzáférés (time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
+    last_access: float = field(default_factory=time.monotonic)
+    quiz_size: int = 0
+    
+    # Ranglistát érintő változásonként növekvő verzió és a kódolt ranglista
+    version: int = field(default_factory=initial_version)
+    leaderboard_feed: LeaderboardFeed = field(default_factory=LeaderboardFeed)
+
+
+@dataclass
+class ArchivedSession:
+    """
+    Lezárt és a memóriából kiürített játék összefoglalója (exporthoz)
+    """
+    game_code: str
+    quiz_id: int
+    host_user_id: int
+    quiz_title: str
+    question_count: int
+    status: str
+    created_at: datetime
+    archived_at: datetime
+    leaderboard: List[dict] = field(default_factory=list)
 
 
 class GameManager:
@@ -58,27 +143,67 @@ class GameManager:
     def __init__(self):
         self.sessions: Dict[str, GameSession] = {}
         self.connection_to_session: Dict[str, str] = {}
+        self.connection_to_player: Dict[str, str] = {}
+        self.archives: OrderedDict[str, ArchivedSession] = OrderedDict()
+        self.journal: Optional[EventJournal] = None
+        self._replaying = False
+        self.codes = CodeAllocator(sharding.SHARD_INDEX, sharding.SHARD_COUNT)
     
     def generate_game_code(self) -> str:
         """
         6 jegyű egyedi játék kód generálása
+        
+        A kód a shard saját számlálójának permutált képe (services.code_allocator),
+        így egyedi és ehhez a workerhez tartozik.
         """
-        while True:
-            code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            if code not in self.sessions:
-                return code
+        return self.codes.allocate(self._code_in_use)
+    
+    def _code_in_use(self, game_code: str) -> bool:
+        return game_code in self.sessions or game_code in self.archives
     
-    def create_session(self, quiz_id: int, host_user_id: int, quiz_data: dict) -> GameSession:
+    def create_session(
+        self,
+        quiz_id: int,
+        host_user_id: int,
+        quiz_data: dict,
+        quiz_size: Optional[int] = None
+    ) -> GameSession:
         """
         Új játék session létrehozása
+        
+        A quiz_data több játék között megosztott lehet (services.quiz_plans),
+        ezért csak olvasható; a quiz_size a már ismert szerializált méret.
         """
-        game_code = self.generate_game_code()
+        session = self._create_session(
+            self.generate_game_code(), quiz_id, host_user_id, quiz_data, datetime.now(), quiz_size
+        )
+        self._record({
+            'type': 'create',
+            'game_code': session.game_code,
+            'quiz_id': quiz_id,
+            'host_user_id': host_user_id,
+            'quiz_data': quiz_data,
+            'created_at': session.created_at.isoformat()
+        })
+        return session
+    
+    def _create_session(
+        self,
+        game_code: str,
+        quiz_id: int,
+        host_user_id: int,
+        quiz_data: dict,
+        created_at: datetime,
+        quiz_size: Optional[int] = None
+    ) -> GameSession:
         session = GameSession(
             game_code=game_code,
             quiz_id=quiz_id,
             host_user_id=host_user_id,
+            created_at=created_at,
             quiz_data=quiz_data,
-            questions=quiz_data.get('questions', [])
+            questions=quiz_data.get('questions', []),
+            quiz_size=len(json.dumps(quiz_data, default=str)) if quiz_size is None else quiz_size
         )
         self.sessions[game_code] = session
         return session
@@ -87,7 +212,10 @@ class GameManager:
         """
         Session lekérése kód alapján
         """
-        return self.sessions.get(game_code)
+        session = self.sessions.get(game_code)
+        if session is not None:
+            session.last_access = time.monotonic()
+        return session
     
     def get_session_by_connection(self, connection_id: str) -> Optional[GameSession]:
         """
@@ -118,33 +246,62 @@ class GameManager:
                 existing_player.connection_id = connection_id
                 existing_player.connected = True
                 
-                if old_connection_id in self.connection_to_session:
-                    del self.connection_to_session[old_connection_id]
+                self.connection_to_session.pop(old_connection_id, None)
+                self.connection_to_player.pop(old_connection_id, None)
                 self.connection_to_session[connection_id] = game_code
+                self.connection_to_player[connection_id] = nickname
+                self._record({'type': 'join', 'game_code': game_code, 'nickname': nickname, 'connection_id': connection_id})
+                session.last_activity = time.monotonic()
+                self._expect_answer(session, nickname)
                 
                 return True, f"Újracsatlakoztál: {nickname}"
             else:
                 return False, "Ez a becenév már foglalt (a játékos jelenleg online)"
         
-        player = Player(nickname=nickname, connection_id=connection_id)
+        player = Player(nickname=nickname, connection_id=connection_id, slot=session.answers.add_slot())
         session.players[nickname] = player
+        session.ranking.add(player.rank_key)
+        session.version += 1
         self.connection_to_session[connection_id] = game_code
+        self.connection_to_player[connection_id] = nickname
+        self._record({'type': 'join', 'game_code': game_code, 'nickname': nickname, 'connection_id': connection_id})
+        session.last_activity = time.monotonic()
+        self._expect_answer(session, nickname)
         
         return True, f"Sikeresen csatlakoztál: {nickname}"
     
-    def disconnect_player(self, connection_id: str):
+    def _expect_answer(self, session: GameSession, nickname: str):
+        """
+        Futó kérdés közben csatlakozó játékos válaszára is vár a kérdés
+        """
+        current_q = session.current_question
+        if current_q and not current_q.finished and nickname not in current_q.answers_received:
+            current_q.waiting_for.add(nickname)
+    
+    def disconnect_player(self, connection_id: str) -> Optional[Player]:
         """
         Játékos lecsatlakozásának jelzése
+        
+        Visszaadja a lecsatlakozott játékost, vagy None-t, ha a kapcsolat
+        már nem tartozik játékoshoz (pl. közben újracsatlakozott).
         """
         session = self.get_session_by_connection(connection_id)
-        if session:
-            for player in session.players.values():
-                if player.connection_id == connection_id:
-                    player.connected = False
-                    break
+        nickname = self.connection_to_player.pop(connection_id, None)
+        self.connection_to_session.pop(connection_id, None)
+        
+        if not session or nickname is None:
+            return None
+        
+        player = session.players.get(nickname)
+        if not player or player.connection_id != connection_id:
+            return None
         
-        if connection_id in self.connection_to_session:
-            del self.connection_to_session[connection_id]
+        player.connected = False
+        current_q = session.current_question
+        if current_q and not current_q.finished:
+            current_q.waiting_for.discard(nickname)
+        self._record({'type': 'disconnect', 'connection_id': connection_id})
+        return player
     
     def start_question(self, game_code: str, question_index: int) -> bool:
         """
@@ -165,16 +322,12 @@ class GameManager:
             if question_index != expected_next:
                 return False
         
-        session.status = "playing"
-        session.current_question_index = question_index
-        
         question_data = session.questions[question_index].copy()
         
         if question_data.get('question_type') == 'order' and 'options' in question_data:
             original_options = question_data['options']
             original_correct_answer = question_data.get('correct_answer', '[]')
             
-            import json
             try:
                 correct_order = json.loads(original_correct_answer)
             except:
@@ -192,179 +345,328 @@ class GameManager:
             
             question_data['correct_answer'] = json.dumps(new_correct_order)
         
+        self._begin_question(session, question_index, question_data, datetime.now())
+        self._record({
+            'type': 'start_question',
+            'game_code': game_code,
+            'question_index': question_index,
+            'question_data': question_data,
+            'started_at': session.current_question.started_at.isoformat()
+        })
+        
+        return True
+    
+    def _begin_question(self, session: GameSession, question_index: int, question_data: dict, started_at: datetime):
+        session.last_activity = time.monotonic()
+        session.status = "playing"
+        session.current_question_index = question_index
         session.current_question = QuestionState(
             question_index=question_index,
             question_data=question_data,
-            started_at=datetime.now()
+            started_at=started_at,
+            checker=compile_checker(question_data.get('question_type'), question_data.get('correct_answer')),
+            closes_at=self._closes_at(question_data, started_at),
+            waiting_for={nickname for nickname, player in session.players.items() if player.connected},
+            started_ns=self._started_ns(started_at)
         )
-        
-        return True
+        self._prepare_player_payload(session.current_question)
+    
+    @staticmethod
+    def _prepare_player_payload(current_q: QuestionState):
+        """
+        A /current-question válasz állandó része, kérdésenként egyszer kódolva
+        """
+        question = {key: value for key, value in current_q.question_data.items() if key != 'correct_answer'}
+        payload = json.dumps(
+            {
+                'question': question,
+                'question_index': current_q.question_index,
+                'started_at': current_q.started_at.isoformat()
+            },
+            ensure_ascii=False,
+            separators=(',', ':'),
+            default=str
+        )
+        current_q.player_payload = payload.encode()
+        current_q.player_etag = 'W/"%s"' % hashlib.blake2b(current_q.player_payload, digest_size=12).hexdigest()
     
-    def submit_answer(self, game_code: str, nickname: str, answer: str) -> bool:
+    @staticmethod
+    def _closes_at(question_data: dict, started_at: datetime) -> float:
+        """
+        A válaszadás határideje monoton órában (a falióra szerinti kezdésből,
+        így visszajátszás után is a valódi határidő marad)
+        """
+        elapsed = (datetime.now() - started_at).total_seconds()
+        time_limit = question_data.get('time_limit') or DEFAULT_TIME_LIMIT
+        return time.monotonic() + time_limit - elapsed + ANSWER_GRACE_MS / 1000
+    
+    @staticmethod
+    def _started_ns(started_at: datetime) -> int:
+        elapsed = datetime.now() - started_at
+        return time.monotonic_ns() - int(elapsed.total_seconds() * 1_000_000_000)
+    
+    def submit_answer(self, game_code: str, nickname: str, answer: str, rtt_ns: int = 0) -> bool:
         """
         Válasz beküldése
+        
+        A válasz beérkezéskor kiértékelődik: az eredmény előre elkészül, a
+        helyes válaszok pedig a gyorsasági bónuszhoz gyűlnek. A válaszidő
+        monoton órával, a kérdés kiküldésétől mérődik (késői csatlakozásnál
+        és újracsatlakozásnál is), a kapcsolat RTT-jével (rtt_ns) csökkentve. Újraküldésnél a korábbi
+        kiértékelés lecserélődik. Lezárt kérdésre és a határidő után érkező
+        válasz elutasításra kerül.
+        """
+        return self.submit_answers(game_code, [(nickname, answer, rtt_ns, time.monotonic_ns())])[0]
+    
+    def submit_answers(self, game_code: str, answers: List[Tuple[str, str, int, int]]) -> List[bool]:
+        """
+        Válaszok kötegelt beküldése: (becenév, válasz, rtt_ns, beérkezés
+        time.monotonic_ns) elemek, beérkezési sorrendben
+        
+        A session és a kérdés egyszer kerül lekérésre, a naplóba egy lépésben
+        íródnak az események. A határidőt a beérkezés ideje dönti el, nem a
+        feldolgozásé.
         """
         session = self.get_session(game_code)
-        if not session or not session.current_question:
-            return False
+        if not session or not session.current_question or session.current_question.finished:
+            return [False] * len(answers)
         
-        if nickname not in session.players:
-            return False
+        current_q = session.current_question
+        closes_at_ns = current_q.closes_at * 1_000_000_000
+        received_at = datetime.now()
+        received_iso = received_at.isoformat()
+        accepted = []
+        events = []
+        
+        for nickname, answer, rtt_ns, received_ns in answers:
+            if nickname not in session.players or received_ns > closes_at_ns:
+                accepted.append(False)
+                continue
+            
+            elapsed_ns = max(0, received_ns - current_q.started_ns - rtt_ns)
+            self._accept_answer(session, nickname, answer, received_at, elapsed_ns)
+            accepted.append(True)
+            events.append({
+                'type': 'submit_answer',
+                'game_code': game_code,
+                'nickname': nickname,
+                'answer': answer,
+                'time': received_iso,
+                'elapsed_ns': elapsed_ns
+            })
         
-        session.current_question.answers_received[nickname] = {
+        if events and self.journal is not None and not self._replaying:
+            self.journal.append_many(events)
+        
+        return accepted
+    
+    def _accept_answer(self, session: GameSession, nickname: str, answer: str, received_at: datetime, elapsed_ns: int):
+        session.last_activity = time.monotonic()
+        current_q = session.current_question
+        current_q.answers_received[nickname] = {
             'answer': answer,
-            'time': datetime.now()
+            'time': received_at,
+            'elapsed_ns': elapsed_ns
         }
+        current_q.waiting_for.discard(nickname)
         
-        return True
+        is_correct = current_q.checker.check(current_q.checker.parse(answer))
+        
+        current_q.results.pop(nickname, None)
+        current_q.correct_order.pop(nickname, None)
+        current_q.results[nickname] = {
+            'correct': is_correct,
+            'points': current_q.question_data.get('points', 10) if is_correct else 0,
+            'rank': None,
+            'answer': answer,
+            'was_online': True
+        }
+        if is_correct:
+            current_q.correct_order[nickname] = None
     
     def finish_question(self, game_code: str) -> Dict[str, dict]:
         """
         Kérdés lezárása és pontszámítás
+        
+        A válaszok már beküldéskor kiértékelődtek, itt csak a gyorsasági
+        bónusz kerül a legrövidebb (RTT-vel korrigált) válaszidejű helyes
+        válaszokra, a pontok a játékosokhoz, és a választ nem adó játékosok
+        eredménye készül el.
         """
         session = self.get_session(game_code)
         if not session or not session.current_question:
             return {}
         
         current_q = session.current_question
-        question_data = current_q.question_data
+        results = current_q.results
+        if current_q.finished:
+            return results
         
-        correct_answer = question_data.get('correct_answer')
-        base_points = question_data.get('points', 10)
-        speed_bonus = question_data.get('speed_bonus', True)
-        question_type = question_data.get('question_type')
+        if current_q.question_data.get('speed_bonus', True):
+            fastest = heapq.nsmallest(
+                len(SPEED_BONUS),
+                current_q.correct_order,
+                key=lambda nickname: current_q.answers_received[nickname]['elapsed_ns']
+            )
+            for rank, nickname in enumerate(fastest, 1):
+                results[nickname]['points'] += SPEED_BONUS[rank]
+                results[nickname]['rank'] = rank
         
-        results = {}
-        correct_players = []
-        
-        for nickname, answer_data in current_q.answers_received.items():
-            player_answer = answer_data['answer']
-            answer_time = answer_data['time']
-            
-            is_correct = self._check_answer(question_type, player_answer, correct_answer)
-            
-            if is_correct:
-                correct_players.append((nickname, answer_time, player_answer))
-            else:
-                results[nickname] = {
-                    'correct': False,
-                    'points': 0,
-                    'rank': None,
-                    'answer': player_answer,
-                    'was_online': True
-                }
-                session.players[nickname].answers[current_q.question_index] = {
-                    'correct': False,
-                    'points': 0,
-                    'rank': None,
-                    'answer': player_answer,
-                    'was_online': True
-                }
+        self._award_points(session, {
+            nickname: results[nickname]['points']
+            for nickname in current_q.correct_order
+        })
         
-        if correct_players:
-            correct_players.sort(key=lambda x: x[1])
-            
-            for rank, (nickname, _, player_answer) in enumerate(correct_players, 1):
-                bonus = 0
-                if speed_bonus and rank <= 3:
-                    bonus = {1: 3, 2: 2, 3: 1}.get(rank, 0)
-                
-                total_points = base_points + bonus
-                
-                results[nickname] = {
-                    'correct': True,
-                    'points': total_points,
-                    'rank': rank if speed_bonus and rank <= 3 else None,
-                    'answer': player_answer,
-                    'was_online': True
-                }
-                
-                session.players[nickname].score += total_points
-                session.players[nickname].answers[current_q.question_index] = results[nickname]
+        for nickname, result in results.items():
+            self._record_answer(session, session.players[nickname], current_q.question_index, result)
         
         for nickname, player in session.players.items():
             if nickname not in results:
-                was_online = player.connected
-                
                 results[nickname] = {
                     'correct': False,
                     'points': 0,
                     'rank': None,
                     'answer': None,
-                    'was_online': was_online
-                }
-                session.players[nickname].answers[current_q.question_index] = {
-                    'correct': False,
-                    'points': 0,
-                    'rank': None,
-                    'answer': None,
-                    'was_online': was_online
+                    'was_online': player.connected
                 }
+                self._record_answer(session, player, current_q.question_index, results[nickname])
         
         current_q.finished = True
+        current_q.waiting_for.clear()
+        session.version += 1
+        session.last_activity = time.monotonic()
+        self._record({'type': 'finish_question', 'game_code': game_code})
+        self._maybe_compact()
         return results
     
-    def _check_answer(self, question_type: str, player_answer: str, correct_answer: str) -> bool:
+    def all_answered(self, game_code: str) -> bool:
         """
-        Válasz helyességének ellenőrzése
+        Minden online játékos válaszolt-e a futó kérdésre (O(1))
         """
-        if question_type == 'single_choice':
-            return str(player_answer) == str(correct_answer)
-        elif question_type == 'multiple_choice':
-            import json
-            try:
-                player_ans = json.loads(player_answer) if isinstance(player_answer, str) else player_answer
-                correct_ans = json.loads(correct_answer) if isinstance(correct_answer, str) else correct_answer
-                return sorted(player_ans) == sorted(correct_ans)
-            except:
-                return False
-        elif question_type == 'number':
-            try:
-                return abs(float(player_answer) - float(correct_answer)) < 0.01
-            except:
-                return False
-        elif question_type == 'order':
-            import json
-            try:
-                player_ans = json.loads(player_answer) if isinstance(player_answer, str) else player_answer
-                correct_ans = json.loads(correct_answer) if isinstance(correct_answer, str) else correct_answer
-                return player_ans == correct_ans
-            except:
-                return False
-        return False
+        session = self.get_session(game_code)
+        if not session or not session.current_question:
+            return False
+        
+        current_q = session.current_question
+        return not current_q.finished and bool(current_q.answers_received) and not current_q.waiting_for
+    
+    def open_questions(self) -> List[Tuple[str, float]]:
+        """
+        A futó kérdések és határidejük (időzítők újraütemezéséhez helyreállítás után)
+        """
+        return [
+            (game_code, session.current_question.closes_at)
+            for game_code, session in self.sessions.items()
+            if session.current_question and not session.current_question.finished
+        ]
+    
+    def _add_points(self, session: GameSession, player: Player, points: int):
+        """
+        Pontszám növelése a ranglista index frissítésével (O(log N))
+        """
+        if not points:
+            return
+        session.ranking.remove(player.rank_key)
+        player.score += points
+        session.ranking.add(player.rank_key)
+    
+    def _award_points(self, session: GameSession, awards: Dict[str, int]):
+        """
+        Egy kérdés pontjainak jóváírása: ha a játékosok nagy része kap pontot,
+        az index egyben épül újra a játékosonkénti áthelyezés helyett
+        """
+        if len(awards) * 4 < len(session.ranking):
+            for nickname, points in awards.items():
+                self._add_points(session, session.players[nickname], points)
+            return
+        
+        for nickname, points in awards.items():
+            session.players[nickname].score += points
+        session.ranking = SortedList(player.rank_key for player in session.players.values())
+    
+    def _record_answer(self, session: GameSession, player: Player, question_index: int, result: dict):
+        """
+        Kérdés eredményének rögzítése a futó helyes / összes számlálókkal
+        """
+        previous = session.answers.record(question_index, player.slot, result)
+        if not previous & RECORDED:
+            player.total_answers += 1
+        elif previous & CORRECT:
+            player.correct_answers -= 1
+        
+        if result.get('correct', False):
+            player.correct_answers += 1
     
     def get_leaderboard(self, game_code: str, limit: int = 10, include_question_details: bool = False) -> List[dict]:
         """
         Ranglista lekérése
+        
+        A session rendezett ranglista indexéből olvas, így a top K lekérése
+        O(K), nem rendezi újra a játékosokat.
         """
         session = self.get_session(game_code)
         if not session:
             return []
         
         leaderboard = []
-        for nickname, player in session.players.items():
-            correct_answers = sum(1 for ans in player.answers.values() if ans.get('correct', False))
-            total_answers = len(player.answers)
-            
-            entry = {
-                'nickname': nickname,
-                'score': player.score,
-                'correct_answers': correct_answers,
-                'total_answers': total_answers,
-                'rank': 0
-            }
-            
-            if include_question_details:
-                entry['question_scores'] = player.answers
-            
-            leaderboard.append(entry)
+        for rank, (_, _, nickname) in enumerate(islice(session.ranking, max(limit, 0)), 1):
+            leaderboard.append(self._leaderboard_entry(session, session.players[nickname], rank, include_question_details))
+        
+        return leaderboard
+    
+    def get_leaderboard_feed(self, game_code: str) -> Optional[LeaderboardFeed]:
+        """
+        Előre kódolt nyilvános ranglista; csak új verziónál számolódik újra
+        """
+        session = self.get_session(game_code)
+        if not session:
+            return None
+        
+        feed = session.leaderboard_feed
+        if feed.version != session.version:
+            feed.update(session.version, self.get_leaderboard(game_code))
+        return feed
+    
+    def get_rank(self, game_code: str, nickname: str) -> Optional[int]:
+        """
+        Egy játékos helyezése a ranglistán (O(log N))
+        """
+        session = self.get_session(game_code)
+        if not session or nickname not in session.players:
+            return None
         
-        leaderboard.sort(key=lambda x: x['score'], reverse=True)
+        return session.ranking.index(session.players[nickname].rank_key) + 1
+    
+    def get_standing(self, game_code: str, nickname: str) -> Optional[dict]:
+        """
+        Egy játékos ranglista bejegyzése, akkor is, ha nincs a top listában
+        """
+        rank = self.get_rank(game_code, nickname)
+        if rank is None:
+            return None
         
-        for idx, entry in enumerate(leaderboard[:limit], 1):
-            entry['rank'] = idx
+        session = self.sessions[game_code]
+        return self._leaderboard_entry(session, session.players[nickname], rank)
+    
+    def _leaderboard_entry(
+        self,
+        session: GameSession,
+        player: Player,
+        rank: int,
+        include_question_details: bool = False
+    ) -> dict:
+        entry = {
+            'nickname': player.nickname,
+            'score': player.score,
+            'correct_answers': player.correct_answers,
+            'total_answers': player.total_answers,
+            'rank': rank
+        }
         
-        return leaderboard[:limit]
+        if include_question_details:
+            entry['question_scores'] = session.answers.view(player.slot)
+        
+        return entry
     
     def finish_game(self, game_code: str):
         """
@@ -373,18 +675,318 @@ class GameManager:
         session = self.get_session(game_code)
         if session:
             session.status = "finished"
+            session.last_activity = time.monotonic()
+            self._record({'type': 'finish_game', 'game_code': game_code})
+            self._maybe_compact()
     
     def delete_session(self, game_code: str):
         """
         Session törlése
         """
         if game_code in self.sessions:
-            session = self.sessions[game_code]
-            
-            for player in session.players.values():
-                if player.connection_id in self.connection_to_session:
-                    del self.connection_to_session[player.connection_id]
-            del self.sessions[game_code]
+            self._remove_session(game_code)
+            self.codes.release(game_code)
+            self._record({'type': 'delete_session', 'game_code': game_code})
+            self._maybe_compact()
+    
+    def _remove_session(self, game_code: str):
+        session = self.sessions.pop(game_code)
+        for player in session.players.values():
+            self.connection_to_session.pop(player.connection_id, None)
+            self.connection_to_player.pop(player.connection_id, None)
+    
+    # --- archiválás és memóriakorlát ---
+    
+    def summarize(self, session: GameSession) -> ArchivedSession:
+        """
+        A session exporthoz szükséges összefoglalója
+        """
+        return ArchivedSession(
+            game_code=session.game_code,
+            quiz_id=session.quiz_id,
+            host_user_id=session.host_user_id,
+            quiz_title=session.quiz_data.get('title', 'Kvíz Játék') if session.quiz_data else 'Kvíz Játék',
+            question_count=len(session.questions),
+            status=session.status,
+            created_at=session.created_at,
+            archived_at=datetime.now(),
+            leaderboard=self.get_leaderboard(session.game_code, limit=len(session.players), include_question_details=True)
+        )
+    
+    def archive_session(self, game_code: str) -> Optional[ArchivedSession]:
+        """
+        Session kiürítése a memóriából, csak az összefoglaló marad meg
+        """
+        session = self.sessions.get(game_code)
+        if session is None:
+            return None
+        
+        archive = self.summarize(session)
+        self._remove_session(game_code)
+        self.archives[game_code] = archive
+        self._record({'type': 'archive', 'game_code': game_code, 'archived_at': archive.archived_at.isoformat()})
+        return archive
+    
+    def get_archive(self, game_code: str) -> Optional[ArchivedSession]:
+        archive = self.archives.get(game_code)
+        if archive is not None:
+            self.archives.move_to_end(game_code)
+        return archive
+    
+    def get_summary(self, game_code: str) -> Optional[ArchivedSession]:
+        """
+        Export összefoglaló élő vagy archivált játékhoz
+        """
+        session = self.get_session(game_code)
+        if session is not None:
+            return self.summarize(session)
+        return self.get_archive(game_code)
+    
+    def forget_archive(self, game_code: str):
+        if self.archives.pop(game_code, None) is not None:
+            self.codes.release(game_code)
+            self._record({'type': 'forget_archive', 'game_code': game_code})
+    
+    def estimate_size(self, session: GameSession) -> int:
+        """
+        A session becsült saját memóriaigénye (bájt)
+
+        A kvíz adat (quiz_size) nincs benne: az ugyanabból a tervből indított
+        játékok közösen használják, ezért a hívó tervenként egyszer számolja.
+        """
+        answer_slots = sum(len(columns.flags) for columns in session.answers.questions.values())
+        return (
+            SESSION_BYTES
+            + len(session.players) * PLAYER_BYTES
+            + answer_slots * ANSWER_BYTES
+        )
+    
+    # --- napló és helyreállítás ---
+    
+    def _record(self, event: dict):
+        """
+        Állapotváltozás naplózása (visszajátszás közben nem)
+        """
+        if self.journal is not None and not self._replaying:
+            self.journal.append(event)
+    
+    def _maybe_compact(self):
+        """
+        Pillanatkép kérése, ha a napló túl hosszúra nőtt (csak host
+        műveleteknél, hogy a válaszbeküldést ne lassítsa)
+        """
+        if self.journal is not None and not self._replaying and self.journal.needs_snapshot():
+            self.journal.compact(self.snapshot())
+    
+    def attach_journal(self, journal: EventJournal):
+        """
+        Állapot visszaállítása a naplóból, majd naplózás bekapcsolása
+        
+        A helyreállítás után minden játékos lecsatlakozottként indul (a
+        korábbi kapcsolatok megszűntek), ők újracsatlakozhatnak.
+        """
+        snapshot, events = journal.replay()
+        
+        self._replaying = True
+        try:
+            if snapshot is not None:
+                for data in snapshot['sessions']:
+                    self._restore_session(data)
+                for data in snapshot.get('archives', []):
+                    self._restore_archive(data)
+            for event in events:
+                self._apply(event)
+        finally:
+            self._replaying = False
+        
+        journal.open()
+        self.journal = journal
+        
+        for connection_id in list(self.connection_to_session):
+            self.disconnect_player(connection_id)
+    
+    def close_journal(self):
+        if self.journal is not None:
+            journal, self.journal = self.journal, None
+            journal.close()
+    
+    def _apply(self, event: dict):
+        """
+        Egy naplózott esemény visszajátszása
+        """
+        event_type = event['type']
+        
+        if event_type == 'create':
+            self._create_session(
+                event['game_code'],
+                event['quiz_id'],
+                event['host_user_id'],
+                event['quiz_data'],
+                datetime.fromisoformat(event['created_at'])
+            )
+        elif event_type == 'join':
+            self.join_session(event['game_code'], event['nickname'], event['connection_id'])
+        elif event_type == 'disconnect':
+            self.disconnect_player(event['connection_id'])
+        elif event_type == 'start_question':
+            session = self.get_session(event['game_code'])
+            if session:
+                self._begin_question(
+                    session,
+                    event['question_index'],
+                    event['question_data'],
+                    datetime.fromisoformat(event['started_at'])
+                )
+        elif event_type == 'submit_answer':
+            session = self.get_session(event['game_code'])
+            if session and session.current_question and event['nickname'] in session.players:
+                self._accept_answer(
+                    session,
+                    event['nickname'],
+                    event['answer'],
+                    datetime.fromisoformat(event['time']),
+                    event.get('elapsed_ns', 0)
+                )
+        elif event_type == 'finish_question':
+            self.finish_question(event['game_code'])
+        elif event_type == 'finish_game':
+            self.finish_game(event['game_code'])
+        elif event_type == 'delete_session':
+            self.delete_session(event['game_code'])
+        elif event_type == 'archive':
+            archive = self.archive_session(event['game_code'])
+            if archive is not None:
+                archive.archived_at = datetime.fromisoformat(event['archived_at'])
+        elif event_type == 'forget_archive':
+            self.forget_archive(event['game_code'])
+    
+    def snapshot(self) -> dict:
+        """
+        A teljes állapot JSON kompatibilis alakban (a napló tömörítéséhez)
+        """
+        return {
+            'sessions': [self._dump_session(session) for session in self.sessions.values()],
+            'archives': [
+                {**asdict(archive), 'created_at': archive.created_at.isoformat(), 'archived_at': archive.archived_at.isoformat()}
+                for archive in self.archives.values()
+            ]
+        }
+    
+    def _dump_session(self, session: GameSession) -> dict:
+        current_q = session.current_question
+        return {
+            'game_code': session.game_code,
+            'quiz_id': session.quiz_id,
+            'host_user_id': session.host_user_id,
+            'created_at': session.created_at.isoformat(),
+            'status': session.status,
+            'current_question_index': session.current_question_index,
+            'quiz_data': session.quiz_data,
+            'players': [
+                {
+                    'nickname': player.nickname,
+                    'connection_id': player.connection_id,
+                    'score': player.score,
+                    'connected': player.connected,
+                    'joined_at': player.joined_at.isoformat(),
+                    'slot': player.slot,
+                    'correct_answers': player.correct_answers,
+                    'total_answers': player.total_answers
+                }
+                for player in session.players.values()
+            ],
+            'answers': session.answers.dump(),
+            'current_question': None if current_q is None else {
+                'question_index': current_q.question_index,
+                'question_data': current_q.question_data,
+                'started_at': current_q.started_at.isoformat(),
+                'answers_received': {
+                    nickname: {
+                        'answer': received['answer'],
+                        'time': received['time'].isoformat(),
+                        'elapsed_ns': received['elapsed_ns']
+                    }
+                    for nickname, received in current_q.answers_received.items()
+                },
+                'finished': current_q.finished,
+                'results': {nickname: dict(result) for nickname, result in current_q.results.items()},
+                'correct_order': list(current_q.correct_order)
+            }
+        }
+    
+    def _restore_archive(self, data: dict):
+        leaderboard = [
+            {
+                **entry,
+                'question_scores': {int(index): score for index, score in entry.get('question_scores', {}).items()}
+            }
+            for entry in data['leaderboard']
+        ]
+        self.archives[data['game_code']] = ArchivedSession(**{
+            **data,
+            'created_at': datetime.fromisoformat(data['created_at']),
+            'archived_at': datetime.fromisoformat(data['archived_at']),
+            'leaderboard': leaderboard
+        })
+    
+    def _restore_session(self, data: dict):
+        session = self._create_session(
+            data['game_code'],
+            data['quiz_id'],
+            data['host_user_id'],
+            data['quiz_data'],
+            datetime.fromisoformat(data['created_at'])
+        )
+        session.status = data['status']
+        session.current_question_index = data['current_question_index']
+        session.answers = AnswerStore.load(data['answers'])
+        
+        for stored in data['players']:
+            player = Player(
+                nickname=stored['nickname'],
+                connection_id=stored['connection_id'],
+                score=stored['score'],
+                connected=stored['connected'],
+                joined_at=datetime.fromisoformat(stored['joined_at']),
+                slot=stored['slot'],
+                correct_answers=stored['correct_answers'],
+                total_answers=stored['total_answers']
+            )
+            session.players[player.nickname] = player
+            if player.connected:
+                self.connection_to_session[player.connection_id] = session.game_code
+                self.connection_to_player[player.connection_id] = player.nickname
+        session.ranking = SortedList(player.rank_key for player in session.players.values())
+        
+        stored_q = data['current_question']
+        if stored_q is not None:
+            question_data = stored_q['question_data']
+            session.current_question = QuestionState(
+                question_index=stored_q['question_index'],
+                question_data=question_data,
+                started_at=datetime.fromisoformat(stored_q['started_at']),
+                answers_received={
+                    nickname: {
+                        'answer': received['answer'],
+                        'time': datetime.fromisoformat(received['time']),
+                        'elapsed_ns': received.get('elapsed_ns', 0)
+                    }
+                    for nickname, received in stored_q['answers_received'].items()
+                },
+                finished=stored_q['finished'],
+                checker=compile_checker(question_data.get('question_type'), question_data.get('correct_answer')),
+                results=stored_q['results'],
+                correct_order=dict.fromkeys(stored_q['correct_order'])
+            )
+            current_q = session.current_question
+            current_q.closes_at = self._closes_at(question_data, current_q.started_at)
+            current_q.started_ns = self._started_ns(current_q.started_at)
+            self._prepare_player_payload(current_q)
+            if not current_q.finished:
+                current_q.waiting_for = {
+                    nickname for nickname, player in session.players.items()
+                    if player.connected and nickname not in current_q.answers_received
+                }
 
 
 game_manager = GameManager()
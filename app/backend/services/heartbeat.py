@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import os
+import time
+
+from services.latency import LatencyTracker, latency
+from services.websocket_manager import ConnectionManager, manager
+
+
+# Szerver oldali ping gyakorisága és a válasz nélküli kapcsolat lejárati ideje (s)
+HEARTBEAT_INTERVAL = float(os.getenv("WS_HEARTBEAT_INTERVAL", "15"))
+HEARTBEAT_TIMEOUT = float(os.getenv("WS_HEARTBEAT_TIMEOUT", "45"))
+
+ReapCallback = Callable[[str, str], Awaitable[None]]
+
+
+class Heartbeat:
+    """
+    Központi szívverés: egyetlen időzítő pingeli az összes kapcsolatot és
+    eltávolítja azokat, amik a timeouton belül nem adtak életjelet
+
+    Életjel bármilyen bejövő üzenet; az első szívverés óta néma (soha nem
+    válaszoló) kapcsolat is kidobásra kerül.
+    
+    Minden ping sorszámot kap ('id'), a kliens ezt küldi vissza a pongban.
+    A ping elküldése és az azonos sorszámú pong közti idő RTT mintaként
+    kerül a késleltetés becslőbe, így a késve érkező pong nem egy későbbi
+    pinghez mérődik. Sorszám nélküli pong csak életjel.
+    """
+
+    def __init__(
+        self,
+        connections: ConnectionManager,
+        interval: float = HEARTBEAT_INTERVAL,
+        timeout: float = HEARTBEAT_TIMEOUT,
+        latency: Optional[LatencyTracker] = None
+    ):
+        self.connections = connections
+        self.latency = latency if latency is not None else LatencyTracker()
+        self.interval = interval
+        self.timeout = timeout
+        self.last_seen: Dict[str, float] = {}
+        # A timeouton belül kiküldött pingek: sorszám -> küldési idő (time.monotonic_ns)
+        self.ping_sent: OrderedDict[int, int] = OrderedDict()
+        self.ping_seq = 0
+        self.on_reap: Optional[ReapCallback] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, on_reap: Optional[ReapCallback] = None):
+        """
+        Az időzítő indítása (alkalmazás induláskor)
+        """
+        if on_reap is not None:
+            self.on_reap = on_reap
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def touch(self, connection_id: str, pong: bool = False, ping_id: Optional[int] = None):
+        """
+        Életjel rögzítése egy kapcsolattól (bármilyen bejövő üzenet)
+
+        A pong a visszaküldött ping sorszámával (ping_id) ad RTT mintát.
+        """
+        self.last_seen[connection_id] = time.monotonic()
+        if pong and ping_id is not None:
+            sent = self.ping_sent.get(ping_id) if isinstance(ping_id, int) else None
+            if sent is not None:
+                self.latency.observe(connection_id, time.monotonic_ns() - sent)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+
+    async def tick(self):
+        """
+        Egy szívverés: lejárt kapcsolatok eltávolítása, a többiek pingelése
+        """
+        now = time.monotonic()
+        active = self.connections.active_connections
+
+        for connection_id in list(self.last_seen):
+            if connection_id not in active:
+                del self.last_seen[connection_id]
+                self.latency.forget(connection_id)
+
+        # A timeoutnál régebbi pingre érkező pong már nem számít
+        expired = time.monotonic_ns() - int(self.timeout * 1e9)
+        while self.ping_sent and next(iter(self.ping_sent.values())) < expired:
+            self.ping_sent.popitem(last=False)
+
+        self.ping_seq += 1
+        ping = self.connections.prepare({'type': 'ping', 'id': self.ping_seq})
+        self.ping_sent[self.ping_seq] = time.monotonic_ns()
+
+        for game_code, connection_ids in list(self.connections.game_connections.items()):
+            for connection_id in list(connection_ids):
+                last_seen = self.last_seen.setdefault(connection_id, now)
+
+                if now - last_seen > self.timeout:
+                    await self.reap(connection_id, game_code)
+                else:
+                    await self.connections.send_personal_message(ping, connection_id)
+
+    async def reap(self, connection_id: str, game_code: str):
+        """
+        Halott kapcsolat lezárása és a játékállapot frissítése
+        """
+        self.last_seen.pop(connection_id, None)
+        self.latency.forget(connection_id)
+
+        self.connections.evict_nowait(connection_id, game_code)
+        if self.on_reap is not None:
+            await self.on_reap(connection_id, game_code)
+
+
+heartbeat = Heartbeat(manager, latency=latency)
@@ -0,0 +1,116 @@
+"""
+Kapcsolatonkénti körülfordulási idő (RTT) becslés
+
+A mintákat a szívverés ping -> pong párosai adják (monoton ns óra). A
+becslés a TCP-ből ismert simított RTT és szórás (RFC 6298):
+
+    rttvar = 3/4 * rttvar + 1/4 * |srtt - minta|
+    srtt   = 7/8 * srtt   + 1/8 * minta
+
+A gyorsasági sorrendnél a válaszidőből a játékos legkisebb mért RTT-je
+levonható, hogy a lassabb hálózaton játszók ne kerüljenek hátrányba. Az
+RTT a kliens pong válaszán múlik: aki minden pongot szándékosan késleltet,
+a levonás felső korlátjáig (GAME_MAX_RTT_COMPENSATION_MS) előnyhöz jut a
+gyorsasági sorrendben. Ezért a korrekció alapértelmezésben ki van
+kapcsolva (0), és bekapcsolva is csak a legkisebb minta számít (egy-egy
+késleltetett pong nem növeli), a korlát pedig a megengedett legnagyobb
+előny.
+"""
+from typing import Dict, Iterable, Optional
+import os
+
+
+# A gyorsasági sorrendnél legfeljebb ennyi RTT vonható le (ms), 0 = kikapcsolva
+MAX_COMPENSATION_MS = float(os.getenv("GAME_MAX_RTT_COMPENSATION_MS", "0"))
+
+
+class RttEstimate:
+    """
+    Egy kapcsolat simított RTT becslése (ns)
+    """
+    __slots__ = ('srtt', 'rttvar', 'min_rtt', 'samples')
+
+    def __init__(self, sample: int):
+        self.srtt = sample
+        self.rttvar = sample // 2
+        self.min_rtt = sample
+        self.samples = 1
+
+    def update(self, sample: int):
+        self.rttvar = (3 * self.rttvar + abs(self.srtt - sample)) // 4
+        self.srtt = (7 * self.srtt + sample) // 8
+        self.min_rtt = min(self.min_rtt, sample)
+        self.samples += 1
+
+
+class LatencyTracker:
+    def __init__(self, max_compensation_ms: float = MAX_COMPENSATION_MS):
+        self.max_compensation = int(max_compensation_ms * 1_000_000)
+        self.estimates: Dict[str, RttEstimate] = {}
+
+    def observe(self, connection_id: str, sample_ns: int):
+        """
+        Új RTT minta rögzítése
+        """
+        if sample_ns < 0:
+            return
+        estimate = self.estimates.get(connection_id)
+        if estimate is None:
+            self.estimates[connection_id] = RttEstimate(sample_ns)
+        else:
+            estimate.update(sample_ns)
+
+    def rtt_ns(self, connection_id: str) -> Optional[int]:
+        estimate = self.estimates.get(connection_id)
+        return None if estimate is None else estimate.srtt
+
+    def compensation_ns(self, connection_id: str) -> int:
+        """
+        A válaszidőből levonható késleltetés: a legkisebb mért RTT a
+        korlátig (0, ha még nincs mérés vagy a korrekció ki van kapcsolva)
+        """
+        estimate = self.estimates.get(connection_id)
+        if estimate is None or self.max_compensation <= 0:
+            return 0
+        return min(estimate.min_rtt, self.max_compensation)
+
+    def forget(self, connection_id: str):
+        self.estimates.pop(connection_id, None)
+
+    def stats(self, connection_ids: Iterable[str]) -> dict:
+        """
+        Összesített hálózati minőség a megadott kapcsolatokra (ms)
+        """
+        connections = 0
+        rtts = []
+        jitter = 0
+        for connection_id in connection_ids:
+            connections += 1
+            estimate = self.estimates.get(connection_id)
+            if estimate is not None:
+                rtts.append(estimate.srtt)
+                jitter += estimate.rttvar
+
+        if not rtts:
+            return {'connections': connections, 'measured': 0}
+
+        rtts.sort()
+
+        def percentile(fraction: float) -> float:
+            return round(rtts[min(len(rtts) - 1, int(fraction * len(rtts)))] / 1_000_000, 2)
+
+        return {
+            'connections': connections,
+            'measured': len(rtts),
+            'rtt_ms': {
+                'min': round(rtts[0] / 1_000_000, 2),
+                'p50': percentile(0.5),
+                'p90': percentile(0.9),
+                'p99': percentile(0.99),
+                'max': round(rtts[-1] / 1_000_000, 2)
+            },
+            'jitter_ms': round(jitter / len(rtts) / 1_000_000, 2)
+        }
+
+
+latency = LatencyTracker()
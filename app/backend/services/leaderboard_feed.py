@@ -0,0 +1,91 @@
+"""
+Verziózott, előre kódolt nyilvános ranglista
+
+Minden session verziószámot vezet, ami a ranglistát érintő változásokkor
+(új játékos, kérdés lezárása) nő. A ranglista válasz verziónként egyszer
+készül el bájtokként, két kérdés között minden lekérés ugyanazt adja
+vissza (ETag-gel, feltételes kérésre 304).
+
+A ?since=<verzió> lekérdezés csak a változásokat adja: az azóta módosult
+vagy új bejegyzéseket és a top listából kiesett beceneveket. Ehhez az
+utolsó néhány kiszolgált verzió ranglistája megmarad; régebbi vagy
+ismeretlen verzióra a teljes ranglista megy. A különbség saját ETag-et kap
+(a since és az aktuális verzió alapján), hogy gyorsítótár és kliens ne
+keverje össze a teljes ranglistával.
+
+A verzió a session létrehozásakor (és helyreállításakor) a mikroszekundumos
+faliórától indul, így újraindítás után sem ismétlődik egy korábbi szám.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import time
+
+
+# Ennyi korábbi ranglista verzióhoz adható különbség
+HISTORY_SIZE = int(os.getenv("GAME_LEADERBOARD_HISTORY", "32"))
+
+
+def initial_version() -> int:
+    return time.time_ns() // 1000
+
+
+def encode(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class LeaderboardFeed:
+    """
+    Egy session ranglistájának gyorsítótára verziónként
+    """
+    __slots__ = ('version', 'payload', 'etag', 'history', 'deltas', 'history_size')
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self.version: Optional[int] = None
+        self.payload = b''
+        self.etag = ''
+        self.history: OrderedDict[int, Dict[str, dict]] = OrderedDict()
+        self.deltas: Dict[int, bytes] = {}
+        self.history_size = history_size
+
+    def update(self, version: int, leaderboard: List[dict]):
+        """
+        Új verzió ranglistájának kódolása
+        """
+        self.version = version
+        self.payload = encode({'version': version, 'leaderboard': leaderboard})
+        self.etag = 'W/"%s"' % hashlib.blake2b(self.payload, digest_size=12).hexdigest()
+        self.history[version] = {entry['nickname']: entry for entry in leaderboard}
+        while len(self.history) > self.history_size:
+            self.history.popitem(last=False)
+        self.deltas.clear()
+
+    def delta(self, since: int) -> Optional[bytes]:
+        """
+        Változások a since verzió óta (None, ha a verzió már nem ismert)
+        """
+        cached = self.deltas.get(since)
+        if cached is not None:
+            return cached
+
+        previous = self.history.get(since)
+        if previous is None:
+            return None
+
+        current = self.history[self.version]
+        payload = encode({
+            'version': self.version,
+            'since': since,
+            'changes': [entry for nickname, entry in current.items() if previous.get(nickname) != entry],
+            'removed': [nickname for nickname in previous if nickname not in current]
+        })
+        self.deltas[since] = payload
+        return payload
+
+    def delta_etag(self, since: int) -> str:
+        """
+        A since verzió óta érvényes különbség ETag-je
+        """
+        return 'W/"%s-since-%d"' % (self.etag[3:-1], since)
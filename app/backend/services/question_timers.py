@@ -0,0 +1,80 @@
+from typing import Awaitable, Callable, List, Optional
+import asyncio
+import os
+import time
+
+from services.timer_wheel import TimerWheel
+
+
+# Az időzítő kerék felbontása (ms): ennyivel késhet legfeljebb a lezárás
+TIMER_TICK_MS = float(os.getenv("GAME_TIMER_TICK_MS", "100"))
+
+ExpireCallback = Callable[[str], Awaitable[None]]
+
+
+class QuestionTimers:
+    """
+    Kérdés határidők központi kezelése
+
+    Az összes futó kérdés határideje egyetlen hierarchikus időzítő kerékben
+    van, amit egy háttérfeladat léptet tickenként; játékonként nincs külön
+    asyncio feladat. Lejáratkor az on_expire hívódik a játék kódjával.
+    """
+
+    def __init__(self, tick_ms: float = TIMER_TICK_MS):
+        self.tick = tick_ms / 1000
+        self.wheel = TimerWheel(self.tick, origin=time.monotonic())
+        self.on_expire: Optional[ExpireCallback] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, on_expire: Optional[ExpireCallback] = None):
+        """
+        Az időzítő indítása (alkalmazás induláskor)
+        """
+        if on_expire is not None:
+            self.on_expire = on_expire
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(self, game_code: str, deadline: float):
+        """
+        A játék futó kérdésének határideje (time.monotonic); a korábbit lecseréli
+        """
+        self.wheel.schedule(game_code, deadline)
+
+    def cancel(self, game_code: str):
+        self.wheel.cancel(game_code)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                await self.tick_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+
+    async def tick_once(self, now: Optional[float] = None) -> List[str]:
+        """
+        A kerék léptetése, visszatér a lejárt játékok kódjaival
+        """
+        expired = self.wheel.advance(time.monotonic() if now is None else now)
+        for game_code in expired:
+            if self.on_expire is None:
+                continue
+            try:
+                await self.on_expire(game_code)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass
+        return expired
+
+
+question_timers = QuestionTimers()
@@ -0,0 +1,113 @@
+"""
+Lefordított kvíz tervek gyorsítótára
+
+Egy kvíz játékhoz szükséges adatai (kérdések feldolgozott opciókkal,
+pontozás) egyszer készülnek el, és az ugyanabból a kvízből indított
+összes játék ugyanazt a példányt használja. A terv kulcsa
+(quiz_id, updated_at): a kvíz vagy egy kérdésének módosítása frissíti az
+updated_at mezőt, így a régi terv egyik workeren sem kerül többé elő; a
+módosító végpontok a helyi példányt azonnal el is dobják.
+
+A terv csak olvasható: a játék a kérdés adatait indításkor lemásolja
+(GameManager.start_question), a közös példányt senki nem módosítja.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import json
+import os
+
+
+# Legfeljebb ennyi kvíz terve marad a memóriában (LRU)
+PLAN_CACHE_SIZE = int(os.getenv("GAME_QUIZ_PLAN_CACHE_SIZE", "256"))
+
+
+@dataclass(frozen=True)
+class QuizPlan:
+    """
+    Egy kvíz változatlan, játékok között megosztott játékadatai
+    """
+    quiz_id: int
+    updated_at: Optional[datetime]
+    title: str
+    quiz_data: dict
+    size: int
+
+    @property
+    def question_count(self) -> int:
+        return len(self.quiz_data['questions'])
+
+
+def compile_plan(quiz, questions: List) -> QuizPlan:
+    """
+    Kvíz terv készítése az adatbázis sorokból
+    """
+    quiz_data = {
+        'id': quiz.id,
+        'title': quiz.title,
+        'description': quiz.description,
+        'questions': tuple(
+            {
+                'id': q.id,
+                'question_type': q.question_type,
+                'question_text': q.question_text,
+                'options': json.loads(q.options) if q.options else None,
+                'correct_answer': q.correct_answer,
+                'time_limit': q.time_limit,
+                'order_index': q.order_index,
+                'points': 10,
+                'speed_bonus': True
+            }
+            for q in questions
+        )
+    }
+    return QuizPlan(
+        quiz_id=quiz.id,
+        updated_at=quiz.updated_at,
+        title=quiz.title,
+        quiz_data=quiz_data,
+        size=len(json.dumps(quiz_data, default=str))
+    )
+
+
+class QuizPlanCache:
+    """
+    Kvízenként a legutóbbi változat terve, LRU kiürítéssel
+    """
+
+    def __init__(self, capacity: int = PLAN_CACHE_SIZE):
+        self.capacity = capacity
+        self.plans: OrderedDict[int, QuizPlan] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, quiz, load_questions: Callable[[], List]) -> QuizPlan:
+        """
+        A kvíz aktuális változatának terve
+
+        A kérdéseket (load_questions) csak akkor kérdezi le, ha nincs
+        érvényes terv.
+        """
+        plan = self.plans.get(quiz.id)
+        if plan is not None and plan.updated_at == quiz.updated_at:
+            self.hits += 1
+            self.plans.move_to_end(quiz.id)
+            return plan
+
+        self.misses += 1
+        plan = compile_plan(quiz, load_questions())
+        self.plans[quiz.id] = plan
+        self.plans.move_to_end(quiz.id)
+        while len(self.plans) > self.capacity:
+            self.plans.popitem(last=False)
+        return plan
+
+    def invalidate(self, quiz_id: int):
+        self.plans.pop(quiz_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {'plans': len(self.plans), 'hits': self.hits, 'misses': self.misses}
+
+
+quiz_plans = QuizPlanCache()
@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional
+import asyncio
+import os
+import time
+
+from services.game_manager import GameManager, game_manager
+from services.websocket_manager import ConnectionManager, manager
+
+
+# Takarítás gyakorisága (s)
+REAP_INTERVAL = float(os.getenv("GAME_REAP_INTERVAL", "60"))
+
+# Tétlenségi lejárat állapotonként (s): a várakozó játék törlődik, a
+# félbehagyott és a befejezett játék archiválódik
+WAITING_TTL = float(os.getenv("GAME_TTL_WAITING", "7200"))
+IDLE_TTL = float(os.getenv("GAME_TTL_IDLE", "3600"))
+FINISHED_TTL = float(os.getenv("GAME_TTL_FINISHED", "1800"))
+
+# Az élő sessionök becsült memóriakerete (MB) és a megtartott archívumok száma
+MEMORY_BUDGET_MB = float(os.getenv("GAME_MEMORY_BUDGET_MB", "256"))
+ARCHIVE_LIMIT = int(os.getenv("GAME_ARCHIVE_LIMIT", "5000"))
+
+# Lejárt játék kapcsolatainak lezárása: szabályos megszüntetés, nem szerverhiba
+CLOSE_GAME_EXPIRED = 1001
+
+
+class SessionReaper:
+    """
+    Háttér takarító a játék sessionökhöz
+
+    A lejárt sessionöket törli vagy archiválja, a memóriakeret túllépésekor
+    a legrégebben használt befejezett játékokat archiválja (LRU). Az
+    archívum csak a ranglistát és az exporthoz szükséges adatokat tartja
+    meg. Futó játékot a memóriakeret miatt nem ürít ki.
+    """
+
+    def __init__(
+        self,
+        games: GameManager,
+        connections: ConnectionManager,
+        interval: float = REAP_INTERVAL,
+        waiting_ttl: float = WAITING_TTL,
+        idle_ttl: float = IDLE_TTL,
+        finished_ttl: float = FINISHED_TTL,
+        memory_budget_mb: float = MEMORY_BUDGET_MB,
+        archive_limit: int = ARCHIVE_LIMIT
+    ):
+        self.games = games
+        self.connections = connections
+        self.interval = interval
+        self.ttls = {
+            'waiting': waiting_ttl,
+            'playing': idle_ttl,
+            'finished': finished_ttl
+        }
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.archive_limit = archive_limit
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """
+        Az időzítő indítása (alkalmazás induláskor)
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.tick()
+            except Exception:
+                pass
+
+    def tick(self, now: Optional[float] = None) -> List[str]:
+        """
+        Egy takarítási kör, visszatér az eltávolított játékok kódjaival
+        """
+        now = time.monotonic() if now is None else now
+        removed = []
+
+        for game_code, session in list(self.games.sessions.items()):
+            ttl = self.ttls.get(session.status)
+            if ttl is None or now - session.last_activity <= ttl:
+                continue
+
+            if session.status == 'waiting':
+                self.games.delete_session(game_code)
+            else:
+                self.games.archive_session(game_code)
+            removed.append(game_code)
+
+        removed.extend(self._enforce_budget())
+
+        while len(self.games.archives) > self.archive_limit:
+            self.games.forget_archive(next(iter(self.games.archives)))
+
+        for game_code in removed:
+            self._close_connections(game_code)
+        return removed
+
+    def _enforce_budget(self) -> List[str]:
+        """
+        Befejezett játékok archiválása LRU sorrendben a keret eléréséig
+
+        A közös kvíz terv adatai (quiz_data) tervenként egyszer számítanak,
+        és csak az utolsó rá hivatkozó játék archiválásakor szabadulnak fel.
+        """
+        sizes = {
+            game_code: self.games.estimate_size(session)
+            for game_code, session in self.games.sessions.items()
+        }
+        plans: Dict[int, List[int]] = {}
+        for session in self.games.sessions.values():
+            plan = plans.setdefault(id(session.quiz_data), [session.quiz_size, 0])
+            plan[1] += 1
+
+        total = sum(sizes.values()) + sum(size for size, _ in plans.values())
+        if total <= self.memory_budget:
+            return []
+
+        finished = sorted(
+            (session for session in self.games.sessions.values() if session.status == 'finished'),
+            key=lambda session: session.last_access
+        )
+
+        removed = []
+        for session in finished:
+            if total <= self.memory_budget:
+                break
+            total -= sizes[session.game_code]
+            plan = plans[id(session.quiz_data)]
+            plan[1] -= 1
+            if not plan[1]:
+                total -= plan[0]
+            self.games.archive_session(session.game_code)
+            removed.append(session.game_code)
+        return removed
+
+    def _close_connections(self, game_code: str):
+        for connection_id in list(self.connections.game_connections.get(game_code, ())):
+            self.connections.evict_nowait(
+                connection_id, game_code, code=CLOSE_GAME_EXPIRED, reason="A játék lejárt"
+            )
+
+
+session_reaper = SessionReaper(game_manager, manager)
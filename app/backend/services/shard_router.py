@@ -0,0 +1,508 @@
+"""
+Shard diszpécser és többworkeres indító
+
+Minden worker folyamat egy shard (saját GameManager, saját eseményhurok,
+belső porton). A nyilvános porton diszpécserek figyelnek SO_REUSEPORT-tal
+(workerenként egy, a kernel osztja el köztük a kapcsolatokat); minden
+HTTP kérésből kiolvassák a játék kódját (útvonal, game_code query
+paraméter vagy JSON törzs), és a tulajdonos shard belső portjára
+továbbítják. A játék kód nélküli kérések (auth, kvízek, játék létrehozás)
+körbeforgó sorrendben mennek a workerekhez; a létrehozó worker a saját
+shardjához tartozó kódot ad ki.
+
+A diszpécser kérésenként dönt (keep-alive kapcsolaton is), a WebSocket
+upgrade után a két irányt változtatás nélkül továbbítja. A kérés törzsét
+(a JSON game_code miatt) beolvassa: legfeljebb GAME_DISPATCH_MAX_BODY
+bájtot, GAME_DISPATCH_BODY_TIMEOUT másodperc alatt. Az Expect:
+100-continue kérésekre maga válaszol, a chunked feltöltést Content-Length
+törzzé alakítva küldi tovább.
+
+Indítás (a backend könyvtárból):
+    python -m services.shard_router --workers 4 --port 8000
+    python -m services.shard_router --workers 4 --port 8000 -- --ws websockets
+"""
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from services.code_allocator import CODE_KEY, CodePermutation, code_key
+from services.sharding import shard_of
+
+
+GAME_PREFIX = "/api/game/"
+GAME_CODE = re.compile(r"^[A-Z0-9]{6}$")
+MAX_HEAD_BYTES = 64 * 1024
+COPY_CHUNK = 64 * 1024
+
+# A továbbított kérés törzsének legnagyobb mérete (bájt) és beolvasási ideje (s)
+MAX_BODY_BYTES = int(os.getenv("GAME_DISPATCH_MAX_BODY", str(1024 * 1024)))
+BODY_TIMEOUT = float(os.getenv("GAME_DISPATCH_BODY_TIMEOUT", "30"))
+
+REASONS = {
+    400: "Bad Request",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    502: "Bad Gateway"
+}
+
+Upstream = Tuple[str, int]
+
+
+def route_key(target: str, headers: Dict[str, str], body: bytes) -> Optional[str]:
+    """
+    A kérés játék kódja, ha a kérés egy meglévő játékhoz tartozik
+    """
+    parts = urlsplit(target)
+    if not parts.path.startswith(GAME_PREFIX):
+        return None
+
+    for segment in parts.path[len(GAME_PREFIX):].split("/"):
+        if GAME_CODE.match(segment):
+            return segment
+
+    codes = parse_qs(parts.query).get("game_code")
+    if codes:
+        return codes[0]
+
+    if body and "json" in headers.get("content-type", ""):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return None
+        if isinstance(payload, dict) and isinstance(payload.get("game_code"), str):
+            return payload["game_code"]
+    return None
+
+
+async def read_head(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Egy HTTP fejléc blokk beolvasása (None, ha a kapcsolat lezárult)
+    """
+    try:
+        return await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if error.partial:
+            raise ConnectionError("félbeszakadt fejléc")
+        return None
+    except asyncio.LimitOverrunError:
+        raise ConnectionError("túl hosszú fejléc")
+
+
+def parse_head(head: bytes) -> Tuple[List[str], Dict[str, str]]:
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return lines[0].split(" ", 2), headers
+
+
+class RequestError(Exception):
+    """
+    A kérés nem továbbítható; a kliens hibaválaszt kap, a kapcsolat lezárul
+    """
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+    def response(self) -> bytes:
+        return f"HTTP/1.1 {self.status} {REASONS[self.status]}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode()
+
+
+def rewrite_head(head: bytes, drop: Set[str], extra: Dict[str, str]) -> bytes:
+    """
+    Fejléc blokk a drop fejlécek nélkül, az extra fejlécekkel kiegészítve
+    """
+    lines = head[:-4].split(b"\r\n")
+    kept = [lines[0]] + [
+        line for line in lines[1:]
+        if line.split(b":", 1)[0].strip().lower().decode("latin-1") not in drop
+    ]
+    kept += [f"{name}: {value}".encode("latin-1") for name, value in extra.items()]
+    return b"\r\n".join(kept) + b"\r\n\r\n"
+
+
+async def read_chunked(reader: asyncio.StreamReader, limit: int) -> bytes:
+    body = bytearray()
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        try:
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+        except ValueError:
+            raise RequestError(400)
+        if size < 0:
+            raise RequestError(400)
+        if size == 0:
+            # Trailer sorok az üres sorig (eldobva)
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return bytes(body)
+        if len(body) + size > limit:
+            raise RequestError(413)
+        body += await reader.readexactly(size)
+        if await reader.readexactly(2) != b"\r\n":
+            raise RequestError(400)
+
+
+async def read_request_body(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    headers: Dict[str, str],
+    limit: int = MAX_BODY_BYTES
+) -> bytes:
+    """
+    A kérés törzsének beolvasása méretkorláttal
+
+    Expect: 100-continue esetén a 100 Continue választ a diszpécser küldi
+    (a workerhez az Expect fejléc nélkül megy tovább a kérés).
+    RequestError: hibás Content-Length (400), túl nagy törzs (413).
+    """
+    chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+    if chunked and "content-length" in headers:
+        raise RequestError(400)
+
+    length = 0
+    if not chunked:
+        value = headers.get("content-length", "0")
+        if not value.isdigit():
+            raise RequestError(400)
+        length = int(value)
+        if length > limit:
+            raise RequestError(413)
+
+    if headers.get("expect", "").lower() == "100-continue" and (chunked or length):
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        await writer.drain()
+
+    if chunked:
+        return await read_chunked(reader, limit)
+    return await reader.readexactly(length)
+
+
+async def relay_body(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    headers: Dict[str, str]
+) -> bool:
+    """
+    Válasz törzs továbbítása; False, ha a törzs a kapcsolat lezárásáig tart
+    """
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            writer.write(size_line)
+            size = int(size_line.split(b";", 1)[0], 16)
+            if size == 0:
+                # Záró trailer sorok az üres sorig
+                while True:
+                    line = await reader.readuntil(b"\r\n")
+                    writer.write(line)
+                    if line == b"\r\n":
+                        return True
+            writer.write(await reader.readexactly(size + 2))
+            await writer.drain()
+
+    if "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            chunk = await reader.read(min(remaining, COPY_CHUNK))
+            if not chunk:
+                raise ConnectionError("félbeszakadt válasz")
+            writer.write(chunk)
+            remaining -= len(chunk)
+            await writer.drain()
+        return True
+
+    while True:
+        chunk = await reader.read(COPY_CHUNK)
+        if not chunk:
+            return False
+        writer.write(chunk)
+        await writer.drain()
+
+
+async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            chunk = await reader.read(COPY_CHUNK)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+
+
+class ShardDispatcher:
+    """
+    Kérésenkénti továbbítás a játék kódját birtokló workerhez
+    """
+
+    def __init__(
+        self,
+        upstreams: List[Upstream],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        reuse_port: bool = False,
+        key: bytes = CODE_KEY,
+        max_body: int = MAX_BODY_BYTES,
+        body_timeout: float = BODY_TIMEOUT
+    ):
+        self.upstreams = upstreams
+        self.max_body = max_body
+        self.body_timeout = body_timeout
+        # A workerekével azonos kulcs (az indító adja át), különben rossz shardra routol
+        self.permutation = CodePermutation(key)
+        self.host = host
+        self.port = port
+        self.reuse_port = reuse_port
+        self.forwarded = [0] * len(upstreams)
+        self._next = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle,
+            self.host,
+            self.port,
+            reuse_port=self.reuse_port or None,
+            limit=MAX_HEAD_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def pick(self, key: Optional[str]) -> int:
+        if key is not None:
+            return shard_of(key, len(self.upstreams), self.permutation)
+        self._next = (self._next + 1) % len(self.upstreams)
+        return self._next
+
+    async def _handle(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter):
+        connections: Dict[int, Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = {}
+        try:
+            while True:
+                head = await read_head(client_reader)
+                if head is None:
+                    break
+                request_line, headers = parse_head(head)
+
+                try:
+                    body = await asyncio.wait_for(
+                        read_request_body(client_reader, client_writer, headers, self.max_body),
+                        self.body_timeout
+                    )
+                except RequestError as error:
+                    client_writer.write(error.response())
+                    break
+                except asyncio.TimeoutError:
+                    client_writer.write(RequestError(408).response())
+                    break
+                if "transfer-encoding" in headers or "expect" in headers:
+                    head = rewrite_head(head, {"transfer-encoding", "content-length", "expect"}, {"Content-Length": str(len(body))})
+
+                shard = self.pick(route_key(request_line[1] if len(request_line) > 1 else "/", headers, body))
+                exchange = await self._send(shard, connections, head + body)
+                if exchange is None:
+                    client_writer.write(RequestError(502).response())
+                    break
+                upstream_reader, upstream_writer, response_head = exchange
+                self.forwarded[shard] += 1
+
+                client_writer.write(response_head)
+                status_line, response_headers = parse_head(response_head)
+                status = int(status_line[1]) if len(status_line) > 1 else 502
+                while 100 <= status < 200 and status != 101:
+                    # Köztes válasz (pl. 100 Continue), a végleges ezután jön
+                    response_head = await read_head(upstream_reader)
+                    if response_head is None:
+                        raise ConnectionError("félbeszakadt válasz")
+                    client_writer.write(response_head)
+                    status_line, response_headers = parse_head(response_head)
+                    status = int(status_line[1])
+
+                if status == 101:
+                    await client_writer.drain()
+                    await self._splice(client_reader, client_writer, upstream_reader, upstream_writer)
+                    connections.pop(shard, None)
+                    break
+
+                bodyless = request_line[0] == "HEAD" or status in (204, 304)
+                if not bodyless and not await relay_body(upstream_reader, client_writer, response_headers):
+                    break
+                await client_writer.drain()
+
+                if "close" in response_headers.get("connection", "").lower():
+                    upstream_writer.close()
+                    connections.pop(shard, None)
+                if "close" in headers.get("connection", "").lower():
+                    break
+        except (ConnectionError, OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, asyncio.CancelledError):
+            # Leállításkor a nyitott kapcsolatok kezelői is megszakadnak
+            pass
+        finally:
+            for _, writer in connections.values():
+                writer.close()
+            client_writer.close()
+
+    async def _send(self, shard: int, connections: dict, request: bytes):
+        """
+        Kérés elküldése a shardnak és a válasz fejlécének beolvasása
+
+        A keep-alive kapcsolatot a worker közben lezárhatta; ilyenkor egyszer
+        új kapcsolaton újrapróbálja.
+        """
+        for _ in range(2):
+            reused = shard in connections
+            try:
+                if not reused:
+                    host, port = self.upstreams[shard]
+                    connections[shard] = await asyncio.open_connection(host, port, limit=MAX_HEAD_BYTES)
+                reader, writer = connections[shard]
+                writer.write(request)
+                await writer.drain()
+                response_head = await read_head(reader)
+            except (ConnectionError, OSError):
+                response_head = None
+            if response_head is not None:
+                return reader, writer, response_head
+
+            stale = connections.pop(shard, None)
+            if stale is not None:
+                stale[1].close()
+            if not reused:
+                return None
+        return None
+
+    async def _splice(self, client_reader, client_writer, upstream_reader, upstream_writer):
+        """
+        WebSocket kapcsolat: mindkét irány továbbítása, amíg az egyik le nem zárul
+        """
+        tasks = [
+            asyncio.ensure_future(pipe(client_reader, upstream_writer)),
+            asyncio.ensure_future(pipe(upstream_reader, client_writer))
+        ]
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            task.cancel()
+        upstream_writer.close()
+
+
+def _dispatch(upstreams: List[Upstream], host: str, port: int, key: bytes):
+    async def serve():
+        dispatcher = ShardDispatcher(upstreams, host, port, reuse_port=True, key=key)
+        await dispatcher.start()
+        stopped = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        await stopped.wait()
+        await dispatcher.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def wait_for_port(process: subprocess.Popen, host: str, port: int, timeout: float = 60) -> bool:
+    """
+    Várakozás, amíg a worker fogadja a kapcsolatokat (False, ha kilépett)
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def worker_env(index: int, workers: int, key: bytes, environ: Dict[str, str] = os.environ) -> Dict[str, str]:
+    """
+    Egy worker környezete: shard index, shardok száma, saját napló és a
+    diszpécserrel közös kód kulcs (ne a worker .env betöltésén múljon)
+    """
+    env = {
+        **environ,
+        "GAME_SHARD_INDEX": str(index),
+        "GAME_SHARD_COUNT": str(workers),
+        "GAME_CODE_KEY": key.decode()
+    }
+    journal_path = environ.get("GAME_JOURNAL_PATH", "")
+    if journal_path:
+        env["GAME_JOURNAL_PATH"] = f"{journal_path}.{index}"
+    return env
+
+
+def launch(workers: int, host: str, port: int, internal_port: int, uvicorn_args: List[str]) -> int:
+    """
+    Workerek (uvicorn, shardonként egy) és diszpécserek indítása
+
+    A workerek egymás után indulnak (az első hozza létre az adatbázis
+    táblákat), a diszpécserek csak akkor, amikor már mind fogad kérést.
+    """
+    # SIGTERM-re is lefutnak a takarítások, ne maradjanak árva workerek
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    upstreams = [("127.0.0.1", internal_port + index) for index in range(workers)]
+    key = code_key()
+    if not key:
+        print("GAME_CODE_KEY vagy SECRET_KEY megadása kötelező (.env vagy környezet)", file=sys.stderr)
+        return 1
+
+    processes = []
+    for index, (worker_host, worker_port) in enumerate(upstreams):
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", worker_host, "--port", str(worker_port), *uvicorn_args],
+            env=worker_env(index, workers, key)
+        ))
+        if not wait_for_port(processes[-1], worker_host, worker_port):
+            for process in processes:
+                process.terminate()
+            print(f"A(z) {index}. worker nem indult el", file=sys.stderr)
+            return 1
+
+    dispatchers = [
+        multiprocessing.Process(target=_dispatch, args=(upstreams, host, port, key), daemon=True)
+        for _ in range(workers)
+    ]
+    for dispatcher in dispatchers:
+        dispatcher.start()
+    print(f"{workers} shard a {host}:{port} címen (belső portok: {internal_port}-{internal_port + workers - 1})")
+
+    try:
+        return max(process.wait() for process in processes)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        for process in processes:
+            process.terminate()
+        for dispatcher in dispatchers:
+            dispatcher.terminate()
+        for process in processes:
+            process.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shardolt többworkeres indítás")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--internal-port", type=int, default=8100)
+    parser.add_argument("uvicorn_args", nargs="*", help="további uvicorn kapcsolók a -- után")
+    args = parser.parse_args()
+    sys.exit(launch(args.workers, args.host, args.port, args.internal_port, args.uvicorn_args))
@@ -0,0 +1,40 @@
+"""
+Játékok szétosztása worker folyamatok (shardok) között
+
+A játék kódja határozza meg a tulajdonos shardot: a kód a kulcsolt
+permutáció (services.code_allocator) képe, a shard az eredeti
+számlálóérték maradéka (számláló mod N). A shard csak a saját számlálóiból
+képez kódot, így a diszpécser a kódból kiszámolja, melyik workerhez kell
+továbbítani a kérést. Érvénytelen kódnál crc32(kód) mod N dönt.
+
+Az indexet és a shardok számát az indító (services.shard_router) adja
+meg workerenként; alapértelmezésben egyetlen shard van.
+"""
+from typing import Optional
+import os
+import zlib
+
+from services.code_allocator import CodePermutation, counter_of
+
+
+SHARD_INDEX = int(os.getenv("GAME_SHARD_INDEX", "0"))
+SHARD_COUNT = int(os.getenv("GAME_SHARD_COUNT", "1"))
+
+
+def shard_of(game_code: str, shard_count: int = SHARD_COUNT, key_permutation: Optional[CodePermutation] = None) -> int:
+    """
+    A játék kódjához tartozó shard indexe (a diszpécser a saját kulcsával hívja)
+    """
+    if shard_count <= 1:
+        return 0
+    counter = counter_of(game_code, key_permutation)
+    if counter is None:
+        return zlib.crc32(game_code.upper().encode("ascii", "ignore")) % shard_count
+    return counter % shard_count
+
+
+def owns(game_code: str) -> bool:
+    """
+    Ehhez a workerhez tartozik-e a játék kód
+    """
+    return shard_of(game_code, SHARD_COUNT) == SHARD_INDEX
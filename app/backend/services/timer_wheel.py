@@ -0,0 +1,105 @@
+"""
+Hierarchikus időzítő kerék (hierarchical timing wheel)
+
+Az időt tickekre osztja; minden szint `slots` rekeszből áll, a szint
+egy rekesze az alatta lévő szint teljes körbefordulását fedi le. Az
+időzítő abba a legalsó szintbe kerül, amelynek egy köre még elér a
+lejáratáig, és a magasabb szintekről a lejárat közeledtével kerül lejjebb.
+Ütemezés és törlés O(1), egy tick léptetése a lejáró időzítők számával
+arányos, függetlenül attól, hány időzítő van összesen.
+"""
+from typing import Dict, Hashable, List, Set, Tuple
+import math
+
+
+class TimerWheel:
+    def __init__(self, tick: float, origin: float, slots: int = 64, levels: int = 4):
+        self.tick = tick
+        self.origin = origin
+        self.slots = slots
+        self.levels = levels
+        self.current = 0
+        self.wheels: List[List[Set[Hashable]]] = [
+            [set() for _ in range(slots)] for _ in range(levels)
+        ]
+        self.timers: Dict[Hashable, Tuple[int, int, int]] = {}
+        self.due: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.timers
+
+    def _ticks(self, when: float) -> int:
+        return math.ceil((when - self.origin) / self.tick)
+
+    def schedule(self, key: Hashable, when: float):
+        """
+        Időzítő beállítása (a meglévő azonos kulcsú felülíródik)
+        """
+        self.cancel(key)
+        self._place(key, self._ticks(when))
+
+    def cancel(self, key: Hashable):
+        timer = self.timers.pop(key, None)
+        if timer is None:
+            return
+        _, level, slot = timer
+        if level < 0:
+            self.due.discard(key)
+        else:
+            self.wheels[level][slot].discard(key)
+
+    def _place(self, key: Hashable, expires: int):
+        delta = expires - self.current
+        if delta <= 0:
+            self.due.add(key)
+            self.timers[key] = (expires, -1, -1)
+            return
+
+        level = 0
+        while level < self.levels - 1 and delta >= self.slots ** (level + 1):
+            level += 1
+        slot = (expires // self.slots ** level) % self.slots
+        self.wheels[level][slot].add(key)
+        self.timers[key] = (expires, level, slot)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """
+        Léptetés a megadott időpontig, visszatér a lejárt kulcsokkal
+        """
+        target = math.floor((now - self.origin) / self.tick)
+        expired = list(self.due)
+        for key in expired:
+            del self.timers[key]
+        self.due.clear()
+
+        while self.current < target:
+            self.current += 1
+
+            # Magasabb szintek rekeszeinek lejjebb helyezése a kör elején
+            for level in range(1, self.levels):
+                span = self.slots ** level
+                if self.current % span:
+                    break
+                slot = (self.current // span) % self.slots
+                bucket, self.wheels[level][slot] = self.wheels[level][slot], set()
+                for key in bucket:
+                    expires, _, _ = self.timers.pop(key)
+                    self._place(key, expires)
+
+            for key in list(self.due):
+                del self.timers[key]
+                expired.append(key)
+            self.due.clear()
+
+            slot = self.current % self.slots
+            bucket = self.wheels[0][slot]
+            if bucket:
+                self.wheels[0][slot] = set()
+                for key in bucket:
+                    del self.timers[key]
+                    expired.append(key)
+
+        return expired
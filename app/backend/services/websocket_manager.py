@@ -1,52 +1,549 @@
 from fastapi import WebSocket
-from typing import Dict, List
+from typing import Collection, Deque, Dict, Iterable, List, Optional, Set, Union
+from dataclasses import dataclass, field
+from collections import deque
+import asyncio
+import json
+import os
+import time
+
+from services.backplane import Backplane, Envelope, create_backplane
+from services.wire_protocol import JSON, MSGPACK, encode_binary
+
+
+# Egy kapcsolatra várt maximális küldési idő (másodperc)
+SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "2.0"))
+# Egyszerre futó küldések maximális száma az összes kapcsolaton
+BROADCAST_CONCURRENCY = int(os.getenv("WS_BROADCAST_CONCURRENCY", "200"))
+# Kapcsolatonkénti kimenő sor mérete
+OUTBOUND_QUEUE_SIZE = int(os.getenv("WS_OUTBOUND_QUEUE_SIZE", "32"))
+
+# Túlcsordulási szabályok
+DROP_OLDEST = "drop_oldest"
+COALESCE_LATEST = "coalesce_latest"
+DISCONNECT = "disconnect"
+
+# Üzenettípusonkénti szabály: a gyakori állapotjelzéseknél csak a legfrissebb
+# számít, a játékmenet üzeneteit nem szabad elveszíteni, így ha azok nem
+# férnek el, a kapcsolat bontásra kerül (a kliens újracsatlakozik).
+# A host_snapshot teljes állapot, a játékosok game_delta-ja csak abszolút
+# számlálókat visz, ezért mindkettőnél elég a legfrissebb.
+DEFAULT_POLICIES: Dict[str, str] = {
+    'game_delta': COALESCE_LATEST,
+    'host_snapshot': COALESCE_LATEST,
+    'answer_received': COALESCE_LATEST,
+    'player_joined': COALESCE_LATEST,
+    'player_disconnected': COALESCE_LATEST,
+    'ping': COALESCE_LATEST,
+    'pong': DROP_OLDEST,
+    'connected': DISCONNECT,
+    'answer_submitted': DISCONNECT,
+    'question_started': DISCONNECT,
+    'question_finished': DISCONNECT,
+    'game_finished': DISCONNECT,
+}
+DEFAULT_POLICY = DISCONNECT
+
+# Szerepkörök; minden kapcsolat automatikusan a saját szerepkörének
+# topicjára iratkozik fel
+HOST = "host"
+PLAYER = "player"
+SPECTATOR = "spectator"
+ROLES = (HOST, PLAYER, SPECTATOR)
+
+
+@dataclass
+class BroadcastStats:
+    """
+    Egy broadcast kimenete és időzítése
+
+    A sorba állítás azonnal megtörténik, a delivered és a *_delivery_ms
+    mezőket a kapcsolatok író taszkjai töltik ki a tényleges küldéskor.
+    """
+    game_code: str
+    recipients: int = 0
+    queued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    evicted: List[str] = field(default_factory=list)
+    duration_ms: float = 0.0
+    first_delivery_ms: float = 0.0
+    last_delivery_ms: float = 0.0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+
+@dataclass(frozen=True)
+class PreparedMessage:
+    """
+    Egyszer szerializált üzenet, ami változatlanul kiküldhető több kapcsolatnak
+    """
+    payload: dict
+    text: str
+    _binary: List[bytes] = field(default_factory=list, compare=False, repr=False)
+
+    @property
+    def message_type(self) -> Optional[str]:
+        return self.payload.get('type')
+
+    @property
+    def binary(self) -> bytes:
+        """
+        A msgpack keret, első használatkor egyszer kódolva
+        """
+        if not self._binary:
+            self._binary.append(encode_binary(self.payload))
+        return self._binary[0]
+
+
+@dataclass
+class QueuedMessage:
+    """
+    Kimenő sorban váró üzenet
+    """
+    message: PreparedMessage
+    stats: Optional[BroadcastStats] = None
+
+
+class OutboundQueue:
+    """
+    Egy kapcsolat korlátos kimenő sora, amit a saját író taszkja ürít
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int, wire_format: str = JSON):
+        self.websocket = websocket
+        self.maxsize = maxsize
+        self.wire_format = wire_format
+        self.items: Deque[QueuedMessage] = deque()
+        self.ready = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.writer: Optional[asyncio.Task] = None
+
+    def push(self, item: QueuedMessage, policy: str) -> Optional[bool]:
+        """
+        Üzenet sorba állítása a túlcsordulási szabály szerint
+
+        Visszatérés: True ha sorba került, False ha közben egy régebbi üzenet
+        eldobásra került, None ha a kapcsolatot bontani kell.
+        """
+        dropped = False
+
+        if policy == COALESCE_LATEST:
+            message_type = item.message.message_type
+            for idx, queued in enumerate(self.items):
+                if queued.message.message_type == message_type:
+                    del self.items[idx]
+                    dropped = True
+                    break
+
+        if len(self.items) >= self.maxsize:
+            if policy == DISCONNECT:
+                return None
+            self.items.popleft()
+            dropped = True
+
+        self.items.append(item)
+        self.idle.clear()
+        self.ready.set()
+        return not dropped
 
 
 class ConnectionManager:
-    def __init__(self):
+    def __init__(
+        self,
+        send_timeout: float = SEND_TIMEOUT,
+        max_concurrency: int = BROADCAST_CONCURRENCY,
+        queue_size: int = OUTBOUND_QUEUE_SIZE,
+        policies: Optional[Dict[str, str]] = None,
+        backplane: Optional[Backplane] = None
+    ):
         self.active_connections: Dict[str, WebSocket] = {}
-        self.game_connections: Dict[str, List[str]] = {}
-    
-    async def connect(self, websocket: WebSocket, connection_id: str, game_code: str):
+        self.game_connections: Dict[str, Set[str]] = {}
+        self.connection_games: Dict[str, str] = {}
+        self.connection_roles: Dict[str, str] = {}
+        self.connection_topics: Dict[str, Set[str]] = {}
+        self.topics: Dict[str, Dict[str, Set[str]]] = {}
+        self.queues: Dict[str, OutboundQueue] = {}
+        self.send_timeout = send_timeout
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.last_broadcast: Dict[str, BroadcastStats] = {}
+        self._send_slots: Optional[asyncio.Semaphore] = None
+        self._send_slots_loop = None
+        self._background: Set[asyncio.Task] = set()
+        self.backplane = backplane or create_backplane()
+
+    async def start(self):
+        """
+        A backplane indítása (alkalmazás induláskor)
+        """
+        await self.backplane.start(self._deliver_remote)
+
+    async def stop(self):
+        await self.backplane.stop()
+
+    async def connect(self, websocket: WebSocket, connection_id: str, game_code: str, role: str = PLAYER):
         """
         Kapcsolat létrehozása és hozzáadása a menedzserhez
         """
         await websocket.accept()
+        self.register(websocket, connection_id, game_code, role)
+
+    def register(
+        self,
+        websocket: WebSocket,
+        connection_id: str,
+        game_code: str,
+        role: str = PLAYER,
+        wire_format: str = JSON
+    ):
+        """
+        Már elfogadott kapcsolat hozzáadása a menedzserhez
+        """
+        if role not in ROLES:
+            raise ValueError(f"Ismeretlen szerepkör: {role}")
+
         self.active_connections[connection_id] = websocket
-        
+        self.queues[connection_id] = OutboundQueue(websocket, self.queue_size, wire_format)
+        self.connection_roles[connection_id] = role
+        self.connection_games[connection_id] = game_code
+
         if game_code not in self.game_connections:
-            self.game_connections[game_code] = []
-        self.game_connections[game_code].append(connection_id)
-    
+            self.game_connections[game_code] = set()
+        self.game_connections[game_code].add(connection_id)
+        self.subscribe(connection_id, game_code, role)
+
+    def subscribe(self, connection_id: str, game_code: str, topic: str):
+        """
+        Kapcsolat feliratkozása egy játék topicjára
+        """
+        self.topics.setdefault(game_code, {}).setdefault(topic, set()).add(connection_id)
+        self.connection_topics.setdefault(connection_id, set()).add(topic)
+
+    def unsubscribe(self, connection_id: str, game_code: str, topic: str):
+        """
+        Kapcsolat leiratkozása egy játék topicjáról
+        """
+        connection_topics = self.connection_topics.get(connection_id)
+        if connection_topics is not None:
+            connection_topics.discard(topic)
+            if not connection_topics:
+                del self.connection_topics[connection_id]
+
+        game_topics = self.topics.get(game_code)
+        if not game_topics or topic not in game_topics:
+            return
+
+        game_topics[topic].discard(connection_id)
+        if not game_topics[topic]:
+            del game_topics[topic]
+        if not game_topics:
+            del self.topics[game_code]
+
+    def members(self, game_code: str, topic: str) -> Set[str]:
+        """
+        Egy topic feliratkozott kapcsolatai
+        """
+        return self.topics.get(game_code, {}).get(topic, set())
+
     def disconnect(self, connection_id: str, game_code: str):
         """
         Kapcsolat bontása és eltávolítása a menedzserből
         """
         if connection_id in self.active_connections:
             del self.active_connections[connection_id]
-        
-        if game_code in self.game_connections:
-            if connection_id in self.game_connections[game_code]:
-                self.game_connections[game_code].remove(connection_id)
-            
-            if not self.game_connections[game_code]:
+
+        self.connection_roles.pop(connection_id, None)
+        if self.connection_games.get(connection_id) == game_code:
+            del self.connection_games[connection_id]
+        for topic in list(self.connection_topics.get(connection_id, ())):
+            self.unsubscribe(connection_id, game_code, topic)
+
+        queue = self.queues.pop(connection_id, None)
+        if queue is not None:
+            queue.items.clear()
+            queue.idle.set()
+            if queue.writer is not None and not queue.writer.done() and queue.writer is not asyncio.current_task():
+                queue.writer.cancel()
+
+        connection_ids = self.game_connections.get(game_code)
+        if connection_ids is not None:
+            connection_ids.discard(connection_id)
+
+            if not connection_ids:
                 del self.game_connections[game_code]
-    
-    async def send_personal_message(self, message: dict, connection_id: str):
+                self.last_broadcast.pop(game_code, None)
+
+    async def evict(self, connection_id: str, game_code: str):
         """
-        Személyes üzenet küldése egy adott kapcsolatnak
+        Hibás kapcsolat eltávolítása és lezárása
         """
-        if connection_id in self.active_connections:
-            websocket = self.active_connections[connection_id]
-            await websocket.send_json(message)
-    
-    async def broadcast_to_game(self, message: dict, game_code: str):
+        websocket = self.active_connections.get(connection_id)
+        self.disconnect(connection_id, game_code)
+
+        if websocket is not None:
+            await self._close(websocket)
+
+    def evict_nowait(self, connection_id: str, game_code: str, code: int = 1011, reason: Optional[str] = None):
+        """
+        Kapcsolat azonnali eltávolítása, a lezárás a háttérben fut
+
+        Alapból hibaként (1011) zár; a szabályos megszüntetés (pl. lejárt
+        játék) saját kódot és indoklást adhat át.
+        """
+        websocket = self.active_connections.get(connection_id)
+        self.disconnect(connection_id, game_code)
+
+        if websocket is not None:
+            task = asyncio.ensure_future(self._close(websocket, code, reason))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _close(self, websocket: WebSocket, code: int = 1011, reason: Optional[str] = None):
+        try:
+            async with asyncio.timeout(self.send_timeout):
+                await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    def _game_of(self, connection_id: str) -> Optional[str]:
+        return self.connection_games.get(connection_id)
+
+    @staticmethod
+    def prepare(message: Union[dict, PreparedMessage]) -> PreparedMessage:
+        """
+        Üzenet szerializálása egyszer (ugyanúgy, ahogy a send_json tenné)
+        """
+        if isinstance(message, PreparedMessage):
+            return message
+        return PreparedMessage(
+            payload=message,
+            text=json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        )
+
+    @staticmethod
+    def extend(base: PreparedMessage, extra: dict) -> PreparedMessage:
+        """
+        Közös, már szerializált üzenet kiegészítése személyes mezőkkel
+
+        Csak az új mezők kerülnek szerializálásra, a közös rész szövege
+        változatlanul újrahasznosul. Az extra mezők nem írhatják felül a
+        közös üzenet mezőit.
+        """
+        if not extra:
+            return base
+
+        overlap = base.payload.keys() & extra.keys()
+        if overlap:
+            raise ValueError(f"Ütköző mezők: {sorted(overlap)}")
+
+        extra_text = json.dumps(extra, separators=(",", ":"), ensure_ascii=False)
+        if base.text == "{}":
+            text = extra_text
+        else:
+            text = base.text[:-1] + "," + extra_text[1:]
+        return PreparedMessage(payload={**base.payload, **extra}, text=text)
+
+    def policy_for(self, message: PreparedMessage) -> str:
+        """
+        Túlcsordulási szabály egy üzenettípushoz
+
+        A becenevekkel (joined / left / answered) érkező game_delta a
+        korábbihoz képesti változás, a lecserélése neveket veszítene el,
+        ezért az a játékmenet üzeneteihez hasonlóan nem vonható össze.
+        """
+        payload = message.payload
+        if message.message_type == 'game_delta' and (payload.get('joined') or payload.get('left') or payload.get('answered')):
+            return DEFAULT_POLICY
+        return self.policies.get(message.message_type, DEFAULT_POLICY)
+
+    def _enqueue(self, item: QueuedMessage, connection_id: str, game_code: Optional[str]) -> Optional[bool]:
+        """
+        Üzenet sorba állítása egy kapcsolatnak, szükség esetén az író taszk indítása
+        """
+        queue = self.queues.get(connection_id)
+        if queue is None:
+            return False
+
+        outcome = queue.push(item, self.policy_for(item.message))
+
+        if outcome is None:
+            self.evict_nowait(connection_id, game_code or self._game_of(connection_id))
+            return None
+
+        if queue.writer is None or queue.writer.done():
+            queue.writer = asyncio.ensure_future(self._writer(connection_id, queue))
+
+        return outcome
+
+    def _slots(self) -> asyncio.Semaphore:
+        """
+        Küldési slotok az aktuális event loophoz
+        """
+        loop = asyncio.get_running_loop()
+        if self._send_slots is None or self._send_slots_loop is not loop:
+            self._send_slots = asyncio.Semaphore(self.max_concurrency)
+            self._send_slots_loop = loop
+        return self._send_slots
+
+    async def _writer(self, connection_id: str, queue: OutboundQueue):
+        """
+        Egy kapcsolat kimenő sorának ürítése
+        """
+        while True:
+            while not queue.items:
+                queue.idle.set()
+                queue.ready.clear()
+                await queue.ready.wait()
+
+            item = queue.items.popleft()
+
+            async with self._slots():
+                success = await self._try_send(queue.websocket, item.message, queue.wire_format)
+
+            stats = item.stats
+            if not success:
+                if stats is not None:
+                    stats.evicted.append(connection_id)
+                await self.evict(connection_id, self._game_of(connection_id))
+                return
+
+            if stats is not None:
+                elapsed_ms = (time.perf_counter() - stats.started) * 1000
+                if not stats.delivered:
+                    stats.first_delivery_ms = elapsed_ms
+                stats.delivered += 1
+                stats.last_delivery_ms = elapsed_ms
+
+    async def _try_send(self, websocket: WebSocket, message: PreparedMessage, wire_format: str = JSON) -> bool:
+        """
+        Előre szerializált üzenet küldése időkorláttal, kivétel helyett sikerességi jelzéssel
+        """
+        # asyncio.timeout és nem wait_for: a wait_for elnyelheti a taszk
+        # megszakítását, ha a küldés ugyanabban a körben fejeződik be
+        try:
+            async with asyncio.timeout(self.send_timeout):
+                if wire_format == MSGPACK:
+                    await websocket.send_bytes(message.binary)
+                else:
+                    await websocket.send_text(message.text)
+            return True
+        except Exception:
+            return False
+
+    async def send_personal_message(self, message: Union[dict, PreparedMessage], connection_id: str):
+        """
+        Személyes üzenet küldése egy adott kapcsolatnak (a kimenő során keresztül)
+        """
+        self._enqueue(QueuedMessage(self.prepare(message)), connection_id, None)
+
+    async def broadcast_to_game(
+        self,
+        message: Union[dict, PreparedMessage],
+        game_code: str,
+        topics: Optional[Iterable[str]] = None,
+        only: Optional[Iterable[str]] = None,
+        exclude: Optional[Collection[str]] = None
+    ) -> BroadcastStats:
         """
         Üzenet küldése minden játékosnak egy játékban
+
+        Az üzenet egyszer kerül szerializálásra, majd minden kapcsolat kimenő
+        sorába bekerül; a hívó nem vár a küldésekre. A lassú kapcsolatok a
+        saját soruk túlcsordulási szabálya szerint veszítenek üzenetet vagy
+        kikerülnek a menedzserből.
+
+        A címzettek szűkíthetők topicokra / szerepkörökre (topics), konkrét
+        kapcsolatokra (only), illetve kapcsolatok kizárásával (exclude).
+        Bekapcsolt backplane esetén a más folyamatban ugyanerre a játékra
+        regisztrált kapcsolatokhoz is továbbítódik (a személyes üzenetek nem).
+        """
+        message = self.prepare(message)
+        stats = self._deliver_local(message, game_code, topics, only, exclude)
+
+        await self.backplane.publish(Envelope(
+            origin=self.backplane.origin,
+            game_code=game_code,
+            text=message.text,
+            topics=list(topics) if topics is not None else None,
+            only=list(only) if only is not None else None,
+            exclude=list(exclude) if exclude else None
+        ))
+
+        return stats
+
+    async def _deliver_remote(self, envelope: Envelope):
         """
+        Másik workerből érkező broadcast kézbesítése a helyi kapcsolatoknak
+        """
+        if envelope.game_code not in self.game_connections:
+            return
+
+        message = PreparedMessage(payload=json.loads(envelope.text), text=envelope.text)
+        self._deliver_local(message, envelope.game_code, envelope.topics, envelope.only, envelope.exclude)
+
+    def _deliver_local(
+        self,
+        message: PreparedMessage,
+        game_code: str,
+        topics: Optional[Iterable[str]],
+        only: Optional[Iterable[str]],
+        exclude: Optional[Collection[str]]
+    ) -> BroadcastStats:
+        """
+        Üzenet sorba állítása a helyi kapcsolatok kimenő soraiba
+        """
+        stats = BroadcastStats(game_code=game_code)
+        if topics is not None:
+            connection_ids: Set[str] = set()
+            for topic in topics:
+                connection_ids |= self.members(game_code, topic)
+        else:
+            connection_ids = set(self.game_connections.get(game_code, ()))
+        if only is not None:
+            connection_ids &= set(only)
+        if exclude:
+            connection_ids -= set(exclude)
+        stats.recipients = len(connection_ids)
+
+        if not connection_ids:
+            return stats
+
+        item = QueuedMessage(message, stats)
+
+        for connection_id in connection_ids:
+            outcome = self._enqueue(item, connection_id, game_code)
+            if outcome is None:
+                stats.evicted.append(connection_id)
+                continue
+            stats.queued += 1
+            if not outcome:
+                stats.dropped += 1
+
+        stats.duration_ms = (time.perf_counter() - stats.started) * 1000
+
         if game_code in self.game_connections:
-            for connection_id in self.game_connections[game_code]:
-                await self.send_personal_message(message, connection_id)
+            self.last_broadcast[game_code] = stats
+
+        return stats
+
+    async def drain(self, game_code: Optional[str] = None):
+        """
+        Várakozás, amíg a (játék) kimenő sorai kiürülnek
+        """
+        if game_code is None:
+            connection_ids = list(self.queues)
+        else:
+            connection_ids = list(self.game_connections.get(game_code, []))
+
+        waiters = [
+            self.queues[connection_id].idle.wait()
+            for connection_id in connection_ids
+            if connection_id in self.queues
+        ]
+        if waiters:
+            await asyncio.gather(*waiters)
 
 
 manager = ConnectionManager()
@@ -0,0 +1,194 @@
+"""
+WebSocket átviteli formátumok
+
+Alapértelmezés a JSON szöveges keret. A kliens kapcsolódáskor a
+"quiz.msgpack.v1" subprotokollal (vagy ?format=msgpack paraméterrel)
+kérhet bináris msgpack kereteket, amikben a mezőnevek rövid tagek.
+A bináris keret első bájtja jelzi, hogy a tartalom tömörített-e: a nagy
+(pl. ranglistát tartalmazó) kereteket zlib deflate tömöríti.
+
+A bejövő keretek kicsomagolt mérete korlátozott (tömörítési bomba ellen);
+a hibás vagy túl nagy üzenet 1003-as kóddal zárja a kapcsolatot, amit a
+végpontok a szokásos lecsatlakozásként kezelnek.
+"""
+from typing import Any, Optional, Tuple
+from fastapi import WebSocket, WebSocketDisconnect
+import json
+import os
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # a msgpack opcionális, nélküle marad a JSON
+    msgpack = None
+
+
+JSON = "json"
+MSGPACK = "msgpack"
+MSGPACK_SUBPROTOCOL = "quiz.msgpack.v1"
+
+# Ennél nagyobb bináris keretek tömörítve mennek ki (bájt)
+COMPRESS_THRESHOLD = int(os.getenv("WS_COMPRESS_THRESHOLD", "1024"))
+
+# Egy bejövő üzenet legnagyobb (kicsomagolt) mérete (bájt)
+MAX_MESSAGE_BYTES = int(os.getenv("WS_MAX_MESSAGE_BYTES", "65536"))
+
+# Nem értelmezhető üzenet (RFC 6455: unsupported data)
+CLOSE_UNSUPPORTED_DATA = 1003
+
+FRAME_RAW = 0
+FRAME_DEFLATE = 1
+
+FIELD_TAGS = {
+    'type': 't',
+    'nickname': 'n',
+    'message': 'm',
+    'success': 'ok',
+    'answer': 'a',
+    'answers_count': 'ac',
+    'total_players': 'tp',
+    'answered': 'ad',
+    'joined': 'j',
+    'left': 'l',
+    'results': 'r',
+    'leaderboard': 'lb',
+    'correct': 'c',
+    'correct_answer': 'ca',
+    'correct_answers': 'cn',
+    'total_answers': 'tn',
+    'points': 'p',
+    'rank': 'rk',
+    'score': 's',
+    'was_online': 'o',
+    'question_index': 'qi',
+    'started_at': 'sa',
+    'time_limit': 'tl',
+    'quiz_id': 'q',
+    'role': 'ro',
+    'status': 'st',
+    'player_count': 'pc',
+    'standing': 'sd',
+}
+TAG_FIELDS = {tag: name for name, tag in FIELD_TAGS.items()}
+
+# Ezekben a mezőkben a kulcsok becenevek, nem mezőnevek
+# (results: kérdés eredmények, answers_received: host_snapshot)
+NICKNAME_MAPS = {'results', 'answers_received'}
+
+
+class MalformedMessage(ValueError):
+    """
+    Nem értelmezhető vagy túl nagy bejövő üzenet
+    """
+
+
+def msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def _translate(value: Any, table: dict) -> Any:
+    if isinstance(value, dict):
+        translated = {}
+        for key, item in value.items():
+            name = table.get(key, key)
+            if key in NICKNAME_MAPS or name in NICKNAME_MAPS:
+                translated[name] = {
+                    nickname: _translate(entry, table)
+                    for nickname, entry in item.items()
+                } if isinstance(item, dict) else item
+            else:
+                translated[name] = _translate(item, table)
+        return translated
+    if isinstance(value, list):
+        return [_translate(item, table) for item in value]
+    return value
+
+
+def encode_binary(payload: dict) -> bytes:
+    """
+    Üzenet kódolása rövid tagekkel msgpack keretbe
+    """
+    body = msgpack.packb(_translate(payload, FIELD_TAGS), use_bin_type=True)
+    if len(body) > COMPRESS_THRESHOLD:
+        return bytes([FRAME_DEFLATE]) + zlib.compress(body)
+    return bytes([FRAME_RAW]) + body
+
+
+def decode_binary(frame: bytes, max_size: int = MAX_MESSAGE_BYTES) -> dict:
+    """
+    Bináris keret visszaalakítása teljes mezőnevekre
+
+    MalformedMessage: üres, hibás, nem objektum vagy max_size-nál nagyobbra
+    kicsomagolódó keret.
+    """
+    if not frame or frame[0] not in (FRAME_RAW, FRAME_DEFLATE):
+        raise MalformedMessage("ismeretlen keret")
+    body = frame[1:]
+    if frame[0] == FRAME_DEFLATE:
+        inflater = zlib.decompressobj()
+        try:
+            body = inflater.decompress(body, max_size + 1)
+        except zlib.error as error:
+            raise MalformedMessage(str(error)) from error
+        if inflater.unconsumed_tail:
+            raise MalformedMessage("túl nagy üzenet")
+    if len(body) > max_size:
+        raise MalformedMessage("túl nagy üzenet")
+
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except (ValueError, TypeError, msgpack.UnpackException) as error:
+        raise MalformedMessage(str(error)) from error
+    if not isinstance(payload, dict):
+        raise MalformedMessage("az üzenet nem objektum")
+    return _translate(payload, TAG_FIELDS)
+
+
+def negotiate(websocket: WebSocket) -> Tuple[str, Optional[str]]:
+    """
+    Átviteli formátum kiválasztása a kapcsolódási kérés alapján
+
+    Visszatérés: (formátum, elfogadott subprotokoll)
+    """
+    if not msgpack_available():
+        return JSON, None
+
+    offered = websocket.scope.get('subprotocols') or []
+    if MSGPACK_SUBPROTOCOL in offered:
+        return MSGPACK, MSGPACK_SUBPROTOCOL
+    if websocket.query_params.get('format') == MSGPACK:
+        return MSGPACK, None
+    return JSON, None
+
+
+async def receive_message(websocket: WebSocket) -> dict:
+    """
+    Bejövő üzenet fogadása szöveges (JSON) vagy bináris (msgpack) keretből
+
+    Hibás üzenetre a kapcsolatot 1003-as kóddal lezárja, és
+    WebSocketDisconnect-et dob, így a hívó lecsatlakozás kezelése lefut.
+    """
+    message = await websocket.receive()
+
+    if message['type'] == 'websocket.disconnect':
+        raise WebSocketDisconnect(message.get('code', 1000), message.get('reason'))
+
+    try:
+        if message.get('bytes') is not None:
+            if not msgpack_available():
+                return {}
+            return decode_binary(message['bytes'])
+
+        text = message.get('text') or ''
+        if len(text) > MAX_MESSAGE_BYTES:
+            raise MalformedMessage("túl nagy üzenet")
+        try:
+            data = json.loads(text)
+        except ValueError as error:
+            raise MalformedMessage(str(error)) from error
+        if not isinstance(data, dict):
+            raise MalformedMessage("az üzenet nem objektum")
+        return data
+    except MalformedMessage as error:
+        await websocket.close(code=CLOSE_UNSUPPORTED_DATA, reason="Hibás üzenet")
+        raise WebSocketDisconnect(CLOSE_UNSUPPORTED_DATA, str(error))
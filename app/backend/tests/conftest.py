@@ -115,3 +115,27 @@ def admin_headers(client, test_admin):
     )
     token = response.json()["access_token"]
     return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def sample_quiz_for_game(client, auth_headers):
+    """
+    Kvíz létrehozása játék teszteléséhez
+    """
+    quiz_data = {
+        "title": "Game Test Quiz",
+        "description": "Quiz for game testing",
+        "questions": [
+            {
+                "question_type": "single_choice",
+                "question_text": "What is 5 + 5?",
+                "options": ["8", "9", "10", "11"],
+                "correct_answer": "2",
+                "time_limit": 30,
+                "points": 10,
+                "speed_bonus": True
+            }
+        ]
+    }
+    response = client.post("/api/quizzes/", headers=auth_headers, json=quiz_data)
+    return response.json()
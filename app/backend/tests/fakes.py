@@ -0,0 +1,48 @@
+"""
+Teszt segédek: hamis WebSocket és broadcast kiürítés
+"""
+import asyncio
+import json
+
+from services.wire_protocol import decode_binary
+
+
+class FakeWebSocket:
+    """Teszt WebSocket, ami eltárolja az elküldött üzeneteket"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.frames = []
+        self.closed = False
+        self.close_code = None
+        self.close_reason = None
+
+    async def accept(self):
+        pass
+
+    async def send_bytes(self, data: bytes):
+        if self.fail:
+            raise RuntimeError("Cannot call send once a close message has been sent")
+        self.frames.append(data)
+        self.sent.append(decode_binary(data))
+
+    async def send_text(self, data: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("Cannot call send once a close message has been sent")
+        self.frames.append(data)
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int = 1000, reason: str = None):
+        self.closed = True
+        self.close_code = code
+        self.close_reason = reason
+
+
+async def broadcast_and_drain(manager, message, game_code, **kwargs):
+    stats = await manager.broadcast_to_game(message, game_code, **kwargs)
+    await manager.drain(game_code)
+    return stats
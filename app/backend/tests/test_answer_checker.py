@@ -0,0 +1,56 @@
+class TestAnswerChecker:
+    """Teszt kérdésenként lefordított válaszellenőrzők"""
+    
+    CASES = {
+        'single_choice': ("2", ["2", 2, "02", " 2", "1", True, None, "abc", [2]]),
+        'multiple_choice': ("[0, 2]", ["[2, 0]", [0, 2], "[0]", "[0, 0, 2]", "[0, 2, 3]", "[\"0\", \"2\"]", "nope", None, "{}"]),
+        'number': ("3.14", ["3.14", "3.145", 3.14, "3.2", "", None, "pi"]),
+        'order': ("[2, 0, 1]", ["[2, 0, 1]", [2, 0, 1], "[0, 1, 2]", "[2, 0]", "[\"2\", \"0\", \"1\"]", None, "x"]),
+    }
+    
+    def test_matches_legacy_check(self):
+        """Teszt a lefordított ellenőrző ugyanazt mondja, mint a korábbi"""
+        from benchmarks.answer_checking import legacy_check_answer
+        from services.answer_checker import compile_checker
+        
+        for question_type, (correct_answer, answers) in self.CASES.items():
+            checker = compile_checker(question_type, correct_answer)
+            for answer in answers:
+                expected = legacy_check_answer(question_type, answer, correct_answer)
+                assert checker.check(checker.parse(answer)) == expected, (question_type, answer)
+    
+    def test_oversized_multiple_choice_index_rejected(self):
+        """Teszt a túl nagy opció index érvénytelen válasz (nem foglal óriási bitmaszkot)"""
+        from services.answer_checker import MAX_OPTIONS, compile_checker
+        
+        checker = compile_checker('multiple_choice', "[0, 2]")
+        assert checker.parse("[1000000000, 1000000001]") is None
+        assert checker.parse([0, MAX_OPTIONS]) is None
+        assert checker.parse([0, MAX_OPTIONS - 1]) == 1 | 1 << (MAX_OPTIONS - 1)
+    
+    def test_unknown_type_never_correct(self):
+        """Teszt ismeretlen kérdéstípus"""
+        from services.answer_checker import compile_checker
+        
+        checker = compile_checker('essay', "anything")
+        assert not checker.check(checker.parse("anything"))
+    
+    def test_order_question_uses_shuffled_answer(self):
+        """Teszt sorrend kérdésnél a keverés utáni helyes válasz számít"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, {'questions': [
+            {'question_type': 'order', 'options': ["a", "b", "c"], 'correct_answer': "[0, 1, 2]", 'points': 10}
+        ]})
+        manager.join_session(session.game_code, "alice", "conn_1")
+        manager.join_session(session.game_code, "bob", "conn_2")
+        
+        manager.start_question(session.game_code, 0)
+        shuffled = session.current_question.question_data['correct_answer']
+        manager.submit_answer(session.game_code, "alice", shuffled)
+        manager.submit_answer(session.game_code, "bob", "[9]")
+        results = manager.finish_question(session.game_code)
+        
+        assert results["alice"]['correct']
+        assert not results["bob"]['correct']
@@ -0,0 +1,42 @@
+class TestAnswerStore:
+    """Teszt oszlopos eredménytárolás"""
+    
+    def test_record_and_view(self):
+        """Teszt rögzítés, szótár nézet és később csatlakozó slot"""
+        from services.answer_store import AnswerStore, RECORDED
+        
+        store = AnswerStore()
+        first = store.add_slot()
+        result = {'correct': True, 'points': 13, 'rank': 1, 'answer': "2", 'was_online': True}
+        assert store.record(0, first, result) == 0
+        
+        late = store.add_slot()
+        assert store.get(0, late) is None
+        store.record(1, late, {'correct': False, 'points': 0, 'rank': None, 'answer': None, 'was_online': False})
+        
+        assert store.get(0, first) == result
+        assert store.view(late) == {
+            1: {'correct': False, 'points': 0, 'rank': None, 'answer': None, 'was_online': False}
+        }
+        
+        previous = store.record(0, first, {'correct': False, 'points': 0, 'answer': "1"})
+        assert previous & RECORDED
+        assert store.get(0, first)['answer'] == "1"
+    
+    def test_question_details_in_leaderboard(self):
+        """Teszt az exporthoz a ranglista kérdésenkénti részleteket ad"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, {'questions': [
+            {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'speed_bonus': False}
+        ]})
+        manager.join_session(session.game_code, "alice", "conn_1")
+        manager.start_question(session.game_code, 0)
+        manager.submit_answer(session.game_code, "alice", "1")
+        manager.finish_question(session.game_code)
+        
+        leaderboard = manager.get_leaderboard(session.game_code, limit=999, include_question_details=True)
+        assert leaderboard[0]['question_scores'] == {
+            0: {'correct': True, 'points': 10, 'rank': None, 'answer': "1", 'was_online': True}
+        }
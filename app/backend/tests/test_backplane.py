@@ -0,0 +1,48 @@
+import asyncio
+
+from services.backplane import LocalBroker, RedisBackplane
+from services.websocket_manager import ConnectionManager, HOST
+from tests.fakes import FakeWebSocket
+
+
+class TestBackplane:
+    """Teszt broadcast továbbítása worker folyamatok között"""
+
+    def test_broadcast_crosses_workers(self):
+        """Teszt a másik workerhez csatlakozott játékos is megkapja az üzenetet"""
+
+        async def scenario():
+            broker = LocalBroker()
+            await broker.start()
+            worker_a = ConnectionManager(backplane=RedisBackplane(broker.url))
+            worker_b = ConnectionManager(backplane=RedisBackplane(broker.url))
+            await worker_a.start()
+            await worker_b.start()
+
+            local = FakeWebSocket()
+            remote = FakeWebSocket()
+            remote_host = FakeWebSocket()
+            worker_a.register(local, "local", "GAME01")
+            worker_b.register(remote, "remote", "GAME01")
+            worker_b.register(remote_host, "remote_host", "GAME01", role=HOST)
+
+            await worker_a.broadcast_to_game({'type': 'question_started'}, "GAME01")
+            await worker_a.broadcast_to_game({'type': 'host_only'}, "GAME01", topics=[HOST])
+
+            for _ in range(50):
+                if len(remote.sent) + len(remote_host.sent) >= 3:
+                    break
+                await asyncio.sleep(0.01)
+            await worker_a.drain()
+            await worker_b.drain()
+
+            await worker_a.stop()
+            await worker_b.stop()
+            await broker.stop()
+            return local, remote, remote_host
+
+        local, remote, remote_host = asyncio.run(scenario())
+
+        assert local.sent == [{'type': 'question_started'}]
+        assert remote.sent == [{'type': 'question_started'}]
+        assert remote_host.sent == [{'type': 'question_started'}, {'type': 'host_only'}]
@@ -0,0 +1,61 @@
+class TestCodeAllocator:
+    """Teszt a permutáción alapuló játék kód kiosztás"""
+    
+    def test_permutation_is_bijective(self):
+        """Teszt a permutáció kölcsönösen egyértelmű és invertálható"""
+        from services.code_allocator import CODE_SPACE, CodePermutation, decode, encode
+        
+        permutation = CodePermutation(b"teszt-kulcs")
+        values = list(range(5000)) + [CODE_SPACE - 1]
+        images = [permutation.forward(value) for value in values]
+        
+        assert len(set(images)) == len(values)
+        assert all(0 <= image < CODE_SPACE for image in images)
+        assert [permutation.inverse(image) for image in images] == values
+        assert all(decode(encode(image)) == image for image in images)
+        assert CodePermutation(b"masik-kulcs").forward(1) != permutation.forward(1)
+    
+    def test_allocates_unique_codes_for_shard(self):
+        """Teszt a kódok egyediek, a sharda tartoznak, a foglaltakat átugorja"""
+        from services.code_allocator import CODE_ALPHABET, CodeAllocator
+        from services.sharding import shard_of
+        
+        first = CodeAllocator(shard_index=2, shard_count=3, start=0).allocate()
+        allocator = CodeAllocator(shard_index=2, shard_count=3, start=0)
+        codes = [allocator.allocate(lambda code: code == first) for _ in range(1000)]
+        
+        assert first not in codes
+        assert len(set(codes)) == len(codes)
+        assert all(len(code) == 6 and set(code) <= set(CODE_ALPHABET) for code in codes)
+        assert all(shard_of(code, 3) == 2 for code in codes)
+    
+    def test_released_code_cools_down(self):
+        """Teszt a felszabadított kód csak a cooldown után adható ki újra"""
+        from services.code_allocator import CodeAllocator
+        
+        code = CodeAllocator(start=7).allocate()
+        
+        cooling = CodeAllocator(cooldown=3600, start=7)
+        cooling.release(code)
+        assert cooling.cooling_down(code)
+        assert cooling.allocate() != code
+        
+        expired = CodeAllocator(cooldown=0, start=7)
+        expired.release(code)
+        assert expired.allocate() == code
+    
+    def test_deleted_session_releases_code(self):
+        """Teszt a törölt és az elfelejtett archivált játék kódja cooldownba kerül"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        deleted = manager.create_session(1, 1, {'questions': []}).game_code
+        archived = manager.create_session(1, 1, {'questions': []}).game_code
+        
+        manager.delete_session(deleted)
+        manager.archive_session(archived)
+        assert manager.codes.cooling_down(deleted)
+        assert not manager.codes.cooling_down(archived)
+        
+        manager.forget_archive(archived)
+        assert manager.codes.cooling_down(archived)
@@ -0,0 +1,50 @@
+import asyncio
+
+from services.event_coalescer import EventCoalescer
+from services.websocket_manager import ConnectionManager, HOST
+from tests.fakes import FakeWebSocket
+
+
+class TestEventCoalescer:
+    """Teszt gyakori események összevonása"""
+
+    def test_answers_fold_into_one_delta(self):
+        """Teszt több válasz egy tickben egyetlen game_delta üzenet"""
+        manager = ConnectionManager()
+        coalescer = EventCoalescer(manager, tick_ms=20)
+        player = FakeWebSocket()
+        host_view = FakeWebSocket()
+        manager.register(player, "player", "GAME01")
+        manager.register(host_view, "host_view", "GAME01", role=HOST)
+        coalescer.opt_out("GAME01", "host_view")
+
+        async def scenario():
+            for idx, nickname in enumerate(["a", "b", "c"], 1):
+                await coalescer.answer_received("GAME01", nickname, idx, 10)
+                await manager.drain("GAME01")
+            await asyncio.sleep(0.05)
+            await manager.drain("GAME01")
+
+        asyncio.run(scenario())
+
+        assert player.sent == [{'type': 'game_delta', 'answers_count': 3, 'total_players': 10}]
+        assert [msg['type'] for msg in host_view.sent] == ['answer_received'] * 3
+
+    def test_join_and_leave_cancel_out(self):
+        """Teszt egy tickben csatlakozó és kilépő játékos nem jelenik meg"""
+        manager = ConnectionManager()
+        coalescer = EventCoalescer(manager, tick_ms=1000)
+        player = FakeWebSocket()
+        manager.register(player, "player", "GAME01", role=HOST)
+
+        async def scenario():
+            await coalescer.player_joined("GAME01", "a")
+            await coalescer.player_joined("GAME01", "b")
+            await coalescer.player_left("GAME01", "a")
+            await coalescer.flush("GAME01")
+            await manager.drain("GAME01")
+
+        asyncio.run(scenario())
+
+        assert player.sent[0]['joined'] == ["b"]
+        assert player.sent[0]['left'] == []
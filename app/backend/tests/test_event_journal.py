@@ -0,0 +1,166 @@
+import json
+
+
+class TestEventJournal:
+    """Teszt napló alapú helyreállítás"""
+    
+    QUIZ = {'questions': [
+        {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'speed_bonus': True},
+        {'question_type': 'order', 'options': ["a", "b", "c"], 'correct_answer': "[2, 0, 1]", 'points': 20},
+        {'question_type': 'number', 'correct_answer': '42', 'points': 5}
+    ]}
+    
+    def _play(self, manager):
+        session = manager.create_session(7, 3, self.QUIZ)
+        code = session.game_code
+        for idx, nickname in enumerate(["alice", "bob", "carol"]):
+            manager.join_session(code, nickname, f"conn_{idx}")
+        
+        manager.start_question(code, 0)
+        manager.submit_answer(code, "bob", "1")
+        manager.submit_answer(code, "alice", "1")
+        manager.submit_answer(code, "carol", "0")
+        manager.finish_question(code)
+        
+        manager.disconnect_player("conn_2")
+        manager.start_question(code, 1)
+        manager.submit_answer(code, "alice", session.current_question.question_data['correct_answer'])
+        manager.finish_question(code)
+        
+        manager.start_question(code, 2)
+        manager.submit_answer(code, "bob", "42")
+        return code
+    
+    def _state(self, manager, code):
+        session = manager.get_session(code)
+        return {
+            'leaderboard': manager.get_leaderboard(code, limit=999, include_question_details=True),
+            'status': session.status,
+            'question': session.current_question.question_data,
+            'answers_received': session.current_question.answers_received
+        }
+    
+    def test_recovery_rebuilds_sessions(self, tmp_path):
+        """Teszt a napló visszajátszása ugyanazt az állapotot adja"""
+        from services.event_journal import EventJournal
+        from services.game_manager import GameManager
+        
+        path = str(tmp_path / "games.journal")
+        original = GameManager()
+        original.attach_journal(EventJournal(path, commit_interval_ms=0))
+        code = self._play(original)
+        expected = self._state(original, code)
+        assert original.journal.flush(timeout=5)
+        original.close_journal()
+        
+        recovered = GameManager()
+        recovered.attach_journal(EventJournal(path, commit_interval_ms=0))
+        assert self._state(recovered, code) == expected
+        
+        session = recovered.get_session(code)
+        assert session.quiz_id == 7 and session.host_user_id == 3
+        assert not any(player.connected for player in session.players.values())
+        
+        # A megszakadt kérdés folytatható, a játékos újracsatlakozhat
+        success, _ = recovered.join_session(code, "alice", "conn_new")
+        assert success
+        recovered.submit_answer(code, "alice", "42")
+        results = recovered.finish_question(code)
+        assert results["bob"]['rank'] == 1 and results["alice"]['rank'] == 2
+        recovered.close_journal()
+    
+    def test_snapshot_compaction(self, tmp_path):
+        """Teszt pillanatkép után a napló csak az újabb eseményeket tartja meg"""
+        import os
+        from services.event_journal import EventJournal
+        from services.game_manager import GameManager
+        
+        path = str(tmp_path / "games.journal")
+        original = GameManager()
+        original.attach_journal(EventJournal(path, commit_interval_ms=0, snapshot_every=5))
+        code = self._play(original)
+        expected = self._state(original, code)
+        assert original.journal.flush(timeout=5)
+        original.close_journal()
+        
+        assert os.path.exists(f"{path}.snapshot")
+        with open(path) as journal_file:
+            events = [json.loads(line) for line in journal_file]
+        assert events[0]['type'] != 'create'
+        assert events[-1]['type'] == 'submit_answer'
+        
+        recovered = GameManager()
+        recovered.attach_journal(EventJournal(path, commit_interval_ms=0, snapshot_every=5))
+        assert self._state(recovered, code) == expected
+        recovered.close_journal()
+    
+    def test_archives_survive_recovery(self, tmp_path):
+        """Teszt az archivált játék összefoglalója naplóból és pillanatképből is visszaáll"""
+        from services.event_journal import EventJournal
+        from services.game_manager import GameManager
+        
+        for snapshot_every in (10 ** 6, 1):
+            path = str(tmp_path / f"games_{snapshot_every}.journal")
+            original = GameManager()
+            original.attach_journal(EventJournal(path, commit_interval_ms=0, snapshot_every=snapshot_every))
+            code = self._play(original)
+            original.finish_question(code)
+            expected = original.archive_session(code)
+            original.finish_game(original.create_session(1, 1, self.QUIZ).game_code)
+            assert original.journal.flush(timeout=5)
+            original.close_journal()
+            
+            recovered = GameManager()
+            recovered.attach_journal(EventJournal(path, commit_interval_ms=0, snapshot_every=snapshot_every))
+            assert recovered.get_archive(code) == expected
+            recovered.close_journal()
+    
+    def test_torn_last_line_is_dropped(self, tmp_path):
+        """Teszt írás közbeni összeomlás után a csonka sor kimarad"""
+        from services.event_journal import EventJournal
+        from services.game_manager import GameManager
+        
+        path = str(tmp_path / "games.journal")
+        original = GameManager()
+        original.attach_journal(EventJournal(path, commit_interval_ms=0))
+        session = original.create_session(1, 1, self.QUIZ)
+        original.join_session(session.game_code, "alice", "conn_1")
+        assert original.journal.flush(timeout=5)
+        original.close_journal()
+        
+        with open(path, "a") as journal_file:
+            journal_file.write('{"seq": 99, "type": "jo')
+        
+        recovered = GameManager()
+        recovered.attach_journal(EventJournal(path, commit_interval_ms=0))
+        recovered.join_session(session.game_code, "bob", "conn_2")
+        assert recovered.journal.flush(timeout=5)
+        recovered.close_journal()
+        
+        again = GameManager()
+        again.attach_journal(EventJournal(path, commit_interval_ms=0))
+        assert set(again.get_session(session.game_code).players) == {"alice", "bob"}
+        again.close_journal()
+    
+    def test_write_error_disables_journal(self, tmp_path, caplog):
+        """Teszt írási hiba után a napló kikapcsol, a hibát naplózza és jelzi"""
+        import pytest
+        from services.event_journal import EventJournal, JournalError
+        
+        journal = EventJournal(str(tmp_path / "games.journal"), commit_interval_ms=0)
+        journal.open()
+        journal._file.close()
+        
+        journal.append({'type': 'create'})
+        with pytest.raises(JournalError):
+            journal.flush(timeout=5)
+        assert "A napló írása meghiúsult" in caplog.text
+        
+        seq = journal.seq
+        assert journal.append({'type': 'join'}) == seq
+        assert journal.append_many([{'type': 'join'}] * 3) == seq
+        assert journal._buffer == []
+        
+        with pytest.raises(JournalError):
+            journal.close()
+        assert journal._file is None
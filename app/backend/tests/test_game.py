@@ -1,28 +1,5 @@
 import pytest
-from fastapi import status
-import json
-
-
-@pytest.fixture
-def sample_quiz_for_game(client, auth_headers):
-    """Kvíz létrehozása játék teszteléséhez"""
-    quiz_data = {
-        "title": "Game Test Quiz",
-        "description": "Quiz for game testing",
-        "questions": [
-            {
-                "question_type": "single_choice",
-                "question_text": "What is 5 + 5?",
-                "options": ["8", "9", "10", "11"],
-                "correct_answer": "2",
-                "time_limit": 30,
-                "points": 10,
-                "speed_bonus": True
-            }
-        ]
-    }
-    response = client.post("/api/quizzes/", headers=auth_headers, json=quiz_data)
-    return response.json()
+from fastapi import WebSocketDisconnect, status
 
 
 class TestGameCreation:
@@ -140,6 +117,40 @@ class TestCurrentQuestion:
         """Teszt aktuális kérdés lekérése nem létező játékhoz"""
         response = client.get("/api/game/current-question/INVALID")
         assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_get_current_question_payload(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt az előre kódolt kérdés helyes válasz nélkül, a hátralévő idő csak a fejlécben"""
+        quiz_id = sample_quiz_for_game["id"]
+        game_code = client.post("/api/game/create", headers=auth_headers, json={"quiz_id": quiz_id}).json()["game_code"]
+        client.post("/api/game/start-question", headers=auth_headers, json={"game_code": game_code, "question_index": 0})
+        
+        response = client.get(f"/api/game/current-question/{game_code}")
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["question"]["question_text"] == "What is 5 + 5?"
+        assert "correct_answer" not in data["question"]
+        assert data["question_index"] == 0
+        assert "time_remaining" not in data
+        assert 0 < float(response.headers["x-time-remaining"]) <= 30
+        
+        response = client.get(f"/api/game/current-question/{game_code}", headers={"Origin": "http://localhost:5173"})
+        exposed = response.headers["access-control-expose-headers"]
+        assert "ETag" in exposed and "X-Time-Remaining" in exposed
+    
+    def test_get_current_question_not_modified(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt egyező ETag esetén 304, a hátralévő idő a fejlécben"""
+        quiz_id = sample_quiz_for_game["id"]
+        game_code = client.post("/api/game/create", headers=auth_headers, json={"quiz_id": quiz_id}).json()["game_code"]
+        client.post("/api/game/start-question", headers=auth_headers, json={"game_code": game_code, "question_index": 0})
+        
+        etag = client.get(f"/api/game/current-question/{game_code}").headers["etag"]
+        response = client.get(f"/api/game/current-question/{game_code}", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert 0 < float(response.headers["x-time-remaining"]) <= 30
+        
+        response = client.get(f"/api/game/current-question/{game_code}", headers={"If-None-Match": 'W/"regi"'})
+        assert response.status_code == status.HTTP_200_OK
 
 
 class TestLeaderboard:
@@ -165,6 +176,59 @@ class TestLeaderboard:
         """Teszt ranglista lekérése nem létező játékhoz"""
         response = client.get("/api/game/leaderboard/NOTFOUND")
         assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_get_leaderboard_versioned_etag(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt változatlan verziónál 304, új játékos után új verzió"""
+        from services.game_manager import game_manager
+        
+        game_code = client.post("/api/game/create", headers=auth_headers, json={"quiz_id": sample_quiz_for_game["id"]}).json()["game_code"]
+        game_manager.join_session(game_code, "alice", "conn_alice")
+        
+        first = client.get(f"/api/game/leaderboard/{game_code}")
+        etag = first.headers["etag"]
+        assert [entry["nickname"] for entry in first.json()["leaderboard"]] == ["alice"]
+        assert client.get(f"/api/game/leaderboard/{game_code}", headers={"If-None-Match": etag}).status_code == status.HTTP_304_NOT_MODIFIED
+        
+        game_manager.join_session(game_code, "bob", "conn_bob")
+        second = client.get(f"/api/game/leaderboard/{game_code}", headers={"If-None-Match": etag})
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["version"] > first.json()["version"]
+        assert second.headers["etag"] != etag
+    
+    def test_get_leaderboard_since_delta(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt ?since= csak a változásokat adja, ismeretlen verzióra a teljes listát"""
+        from services.game_manager import game_manager
+        
+        game_code = client.post("/api/game/create", headers=auth_headers, json={"quiz_id": sample_quiz_for_game["id"]}).json()["game_code"]
+        game_manager.join_session(game_code, "alice", "conn_alice")
+        game_manager.join_session(game_code, "bob", "conn_bob")
+        before = client.get(f"/api/game/leaderboard/{game_code}").json()["version"]
+        
+        game_manager.start_question(game_code, 0)
+        game_manager.submit_answer(game_code, "bob", "2")
+        game_manager.finish_question(game_code)
+        game_manager.join_session(game_code, "carol", "conn_carol")
+        
+        response = client.get(f"/api/game/leaderboard/{game_code}", params={"since": before})
+        full_etag = client.get(f"/api/game/leaderboard/{game_code}").headers["etag"]
+        assert response.headers["etag"] != full_etag
+        
+        # A különbség ETag-je nem ad 304-et a teljes listára, és fordítva
+        assert client.get(f"/api/game/leaderboard/{game_code}", headers={"If-None-Match": response.headers["etag"]}).status_code == 200
+        assert client.get(f"/api/game/leaderboard/{game_code}", params={"since": before}, headers={"If-None-Match": full_etag}).status_code == 200
+        assert client.get(f"/api/game/leaderboard/{game_code}", params={"since": before}, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+        
+        delta = response.json()
+        assert delta["since"] == before
+        assert [entry["nickname"] for entry in delta["changes"]] == ["bob", "alice", "carol"]
+        assert delta["changes"][0]["rank"] == 1
+        assert delta["removed"] == []
+        
+        unchanged = client.get(f"/api/game/leaderboard/{game_code}", params={"since": delta["version"]}).json()
+        assert unchanged["changes"] == [] and unchanged["removed"] == []
+        
+        full = client.get(f"/api/game/leaderboard/{game_code}", params={"since": 1}).json()
+        assert len(full["leaderboard"]) == 3
 
 
 class TestStartQuestion:
@@ -299,3 +363,288 @@ class TestFinishQuestion:
             json={"game_code": game_code}
         )
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestGameWebSocket:
+    """Teszt játékos WebSocket kapcsolat"""
+    
+    def test_player_join_and_answer(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt csatlakozás, kérdés indítása és válasz beküldése"""
+        quiz_id = sample_quiz_for_game["id"]
+        create_response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": quiz_id}
+        )
+        game_code = create_response.json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as ws:
+            assert ws.receive_json()["type"] == "connected"
+            delta = ws.receive_json()
+            assert delta["type"] == "game_delta"
+            assert "joined" not in delta
+            
+            response = client.post(
+                "/api/game/start-question",
+                headers=auth_headers,
+                json={"game_code": game_code, "question_index": 0}
+            )
+            assert response.status_code == status.HTTP_200_OK
+            assert ws.receive_json()["type"] == "question_started"
+            
+            ws.send_json({"type": "submit_answer", "answer": "2"})
+            assert ws.receive_json() == {"type": "answer_submitted", "success": True}
+            delta = ws.receive_json()
+            assert delta == {"type": "game_delta", "answers_count": 1, "total_players": 1}
+            
+            response = client.post(
+                "/api/game/finish-question",
+                headers=auth_headers,
+                json={"game_code": game_code}
+            )
+            finished = ws.receive_json()
+            assert finished["type"] == "question_finished"
+            assert finished["results"]["alice"]["correct"] is True
+            assert finished["standing"]["rank"] == 1
+    
+    def test_question_finished_is_personalized(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt a játékos csak a saját eredményét kapja meg"""
+        quiz_id = sample_quiz_for_game["id"]
+        create_response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": quiz_id}
+        )
+        game_code = create_response.json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as alice, \
+                client.websocket_connect(f"/api/game/ws/{game_code}/bob") as bob:
+            client.post(
+                "/api/game/start-question",
+                headers=auth_headers,
+                json={"game_code": game_code, "question_index": 0}
+            )
+            alice.send_json({"type": "submit_answer", "answer": "2"})
+            bob.send_json({"type": "submit_answer", "answer": "1"})
+            for ws in (alice, bob):
+                while ws.receive_json()["type"] != "answer_submitted":
+                    pass
+            
+            response = client.post(
+                "/api/game/finish-question",
+                headers=auth_headers,
+                json={"game_code": game_code}
+            )
+            assert set(response.json()["results"]) == {"alice", "bob"}
+            
+            for ws, nickname, rank in ((alice, "alice", 1), (bob, "bob", 2)):
+                message = ws.receive_json()
+                while message["type"] != "question_finished":
+                    message = ws.receive_json()
+                assert list(message["results"]) == [nickname]
+                assert message["standing"]["rank"] == rank
+                assert len(message["leaderboard"]) == 2
+    
+    def test_exact_event_stream(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt az összevonásból kiiratkozott kapcsolat egyedi eseményeket kap"""
+        quiz_id = sample_quiz_for_game["id"]
+        create_response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": quiz_id}
+        )
+        game_code = create_response.json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice?events=full") as ws:
+            assert ws.receive_json()["type"] == "connected"
+            assert ws.receive_json() == {"type": "player_joined", "nickname": "alice"}
+    
+    def test_spectator_sees_nicknames(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt a néző látja a beceneveket, a játékos csak a számlálókat"""
+        quiz_id = sample_quiz_for_game["id"]
+        create_response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": quiz_id}
+        )
+        game_code = create_response.json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/spectate/{game_code}") as spectator:
+            connected = spectator.receive_json()
+            assert connected["type"] == "connected"
+            assert connected["role"] == "spectator"
+            
+            with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as ws:
+                assert ws.receive_json()["type"] == "connected"
+                
+                delta = spectator.receive_json()
+                assert delta["type"] == "game_delta"
+                assert delta["joined"] == ["alice"]
+                
+                client.post(
+                    "/api/game/start-question",
+                    headers=auth_headers,
+                    json={"game_code": game_code, "question_index": 0}
+                )
+                assert spectator.receive_json()["type"] == "question_started"
+                
+                ws.send_json({"type": "submit_answer", "answer": "1"})
+                delta = spectator.receive_json()
+                assert delta["answered"] == ["alice"]
+    
+    def test_spectate_invalid_game(self, client):
+        """Teszt nézői kapcsolat nem létező játékhoz"""
+        with client.websocket_connect("/api/game/spectate/NOGAME") as ws:
+            assert ws.receive_json()["type"] == "error"
+    
+    def test_msgpack_protocol(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt bináris protokoll egyeztetése subprotokollal"""
+        from services.wire_protocol import MSGPACK_SUBPROTOCOL, decode_binary, encode_binary
+        
+        quiz_id = sample_quiz_for_game["id"]
+        create_response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": quiz_id}
+        )
+        game_code = create_response.json()["game_code"]
+        
+        with client.websocket_connect(
+            f"/api/game/ws/{game_code}/alice",
+            subprotocols=[MSGPACK_SUBPROTOCOL]
+        ) as ws:
+            assert ws.accepted_subprotocol == MSGPACK_SUBPROTOCOL
+            connected = decode_binary(ws.receive_bytes())
+            assert connected["type"] == "connected"
+            assert connected["nickname"] == "alice"
+            
+            ws.send_bytes(encode_binary({"type": "ping"}))
+            messages = [decode_binary(ws.receive_bytes()) for _ in range(2)]
+            assert {"type": "pong"} in messages
+    
+    def test_malformed_message_disconnects_player(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt hibás üzenet után a kapcsolat lezárul, a játékos lecsatlakozik"""
+        from services.game_manager import game_manager
+        
+        create_response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": sample_quiz_for_game["id"]}
+        )
+        game_code = create_response.json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as ws:
+            assert ws.receive_json()["type"] == "connected"
+            ws.send_text("{nem json")
+            with pytest.raises(WebSocketDisconnect) as error:
+                while True:
+                    ws.receive_json()
+            assert error.value.code == 1003
+        
+        assert game_manager.get_session(game_code).players["alice"].connected is False
+    
+    def test_join_invalid_game(self, client):
+        """Teszt csatlakozás nem létező játékhoz"""
+        with client.websocket_connect("/api/game/ws/NOGAME/alice") as ws:
+            message = ws.receive_json()
+            assert message["type"] == "error"
+
+
+class TestHostWebSocket:
+    """Teszt host WebSocket csatorna"""
+    
+    def create_game(self, client, auth_headers, quiz_id):
+        response = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": quiz_id}
+        )
+        return response.json()["game_code"]
+    
+    def receive_until(self, ws, message_type):
+        message = ws.receive_json()
+        while message["type"] != message_type:
+            message = ws.receive_json()
+        return message
+    
+    def test_rejects_invalid_token(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt érvénytelen, az URL-ben küldött vagy hiányzó tokennel nem lehet hostként csatlakozni"""
+        game_code = self.create_game(client, auth_headers, sample_quiz_for_game["id"])
+        token = auth_headers["Authorization"].split()[1]
+        
+        with client.websocket_connect(f"/api/game/host/{game_code}") as ws:
+            ws.send_json({"type": "auth", "token": "invalid"})
+            assert ws.receive_json() == {"type": "error", "message": "Nincs jogosultságod"}
+        
+        with client.websocket_connect(f"/api/game/host/{game_code}?token={token}") as ws:
+            ws.send_json({"type": "ping"})
+            assert ws.receive_json() == {"type": "error", "message": "Nincs jogosultságod"}
+    
+    def test_snapshot_and_roster(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt kezdő pillanatkép, majd a csatlakozó játékos game_delta üzenetben"""
+        game_code = self.create_game(client, auth_headers, sample_quiz_for_game["id"])
+        token = auth_headers["Authorization"].split()[1]
+        
+        with client.websocket_connect(f"/api/game/host/{game_code}") as host:
+            host.send_json({"type": "auth", "token": token})
+            snapshot = host.receive_json()
+            assert snapshot["type"] == "host_snapshot"
+            assert snapshot["status"] == "waiting"
+            assert snapshot["players"] == []
+            assert snapshot["total_questions"] == 1
+            assert host.receive_json()["type"] == "token"
+            
+            host.send_json({"type": "refresh_token"})
+            refreshed = self.receive_until(host, "token")
+            assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {refreshed['token']}"}).status_code == 200
+            
+            with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as ws:
+                assert ws.receive_json()["type"] == "connected"
+                delta = self.receive_until(host, "game_delta")
+                assert delta["joined"] == ["alice"]
+                assert delta["total_players"] == 1
+    
+    def test_commands(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt kérdés indítása, lezárása és a játék vége a host kapcsolaton"""
+        game_code = self.create_game(client, auth_headers, sample_quiz_for_game["id"])
+        token = auth_headers["Authorization"].split()[1]
+        
+        with client.websocket_connect(f"/api/game/host/{game_code}") as host, \
+                client.websocket_connect(f"/api/game/ws/{game_code}/alice") as ws:
+            host.send_json({"type": "auth", "token": token})
+            assert host.receive_json()["type"] == "host_snapshot"
+            
+            host.send_json({"type": "finish_question"})
+            assert self.receive_until(host, "command_result") == {
+                "type": "command_result", "command": "finish_question", "success": False, "error": "Nincs lezárható kérdés"
+            }
+            
+            host.send_json({"type": "start_question", "question_index": 1})
+            result = self.receive_until(host, "command_result")
+            assert result["success"] is False
+            
+            host.send_json({"type": "start_question", "question_index": 0})
+            assert self.receive_until(host, "question_started")["question_index"] == 0
+            snapshot = self.receive_until(host, "host_snapshot")
+            assert snapshot["current_question"]["question_text"] == "What is 5 + 5?"
+            assert self.receive_until(host, "command_result") == {
+                "type": "command_result", "command": "start_question", "success": True, "question_index": 0
+            }
+            assert self.receive_until(ws, "question_started")["question_index"] == 0
+            
+            ws.send_json({"type": "submit_answer", "answer": "2"})
+            delta = self.receive_until(host, "game_delta")
+            assert delta["answered"] == ["alice"]
+            
+            finished = self.receive_until(host, "question_finished")
+            assert finished["results"]["alice"]["correct"] is True
+            snapshot = self.receive_until(host, "host_snapshot")
+            assert snapshot["question_finished"] is True
+            assert snapshot["leaderboard"][0]["nickname"] == "alice"
+            
+            host.send_json({"type": "finish_game"})
+            assert self.receive_until(host, "game_finished")["leaderboard"][0]["nickname"] == "alice"
+            assert self.receive_until(host, "command_result")["command"] == "finish_game"
+            
+            from services.game_manager import game_manager
+            assert game_manager.get_session(game_code).status == "finished"
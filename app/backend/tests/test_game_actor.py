@@ -0,0 +1,81 @@
+class TestGameActors:
+    """Teszt játékonkénti actor és kötegelt válaszfeldolgozás"""
+    
+    QUIZ = {'questions': [
+        {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'speed_bonus': True}
+    ]}
+    
+    def _actors(self, nicknames=("alice", "bob", "carol")):
+        from services.game_actor import GameActors
+        from services.game_manager import GameManager
+        
+        games = GameManager()
+        session = games.create_session(1, 1, self.QUIZ)
+        for nickname in nicknames:
+            games.join_session(session.game_code, nickname, f"conn_{nickname}")
+        games.start_question(session.game_code, 0)
+        return GameActors(games), games, session.game_code
+    
+    def test_concurrent_answers_form_one_batch(self):
+        """Teszt az egyszerre érkező válaszok egy kötegben, sorrendben futnak le"""
+        import asyncio
+        
+        actors, games, code = self._actors()
+        
+        async def scenario():
+            answers = [
+                actors.answer(code, "carol", "1"),
+                actors.answer(code, "alice", "1"),
+                actors.answer(code, "mallory", "1"),
+                actors.answer(code, "bob", "0")
+            ]
+            actor_results = await asyncio.gather(*answers)
+            return actor_results, actors.actors
+        
+        accepted, remaining = asyncio.run(scenario())
+        assert accepted == [True, True, False, True]
+        assert remaining == {}
+        
+        current_q = games.get_session(code).current_question
+        assert list(current_q.correct_order) == ["carol", "alice"]
+    
+    def test_commands_keep_mailbox_order(self):
+        """Teszt a lezárás a korábban beérkezett válaszok után fut le"""
+        import asyncio
+        
+        actors, games, code = self._actors()
+        
+        async def scenario():
+            before = actors.answer(code, "alice", "1")
+            finish = actors.call(code, games.finish_question, code)
+            after = actors.answer(code, "bob", "1")
+            results = await asyncio.gather(before, finish, after)
+            return results, actors
+        
+        (alice, results, bob), _ = asyncio.run(scenario())
+        assert alice is True and bob is False
+        assert results["alice"]['rank'] == 1
+        assert results["bob"]['answer'] is None
+    
+    def test_batch_statistics_and_errors(self):
+        """Teszt a hibás parancs csak a saját hívóját éri, a többi lefut"""
+        import asyncio
+        
+        actors, games, code = self._actors()
+        seen = []
+        
+        def broken():
+            raise ValueError("hiba")
+        
+        async def scenario():
+            actor_calls = [actors.answer(code, "alice", "1"), actors.answer(code, "bob", "1")]
+            failing = actors.call(code, broken)
+            actor = actors.actors[code]
+            seen.append(actor)
+            results = await asyncio.gather(*actor_calls, failing, return_exceptions=True)
+            return results
+        
+        first, second, error = asyncio.run(scenario())
+        assert first is True and second is True
+        assert isinstance(error, ValueError)
+        assert seen[0].batches == 1 and seen[0].processed == 3
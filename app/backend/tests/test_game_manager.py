@@ -0,0 +1,136 @@
+class TestGameManagerConnections:
+    """Teszt kapcsolat -> játékos index"""
+    
+    def test_disconnect_and_reconnect(self):
+        """Teszt lecsatlakozás és újracsatlakozás új kapcsolattal"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, {'questions': []})
+        manager.join_session(session.game_code, "alice", "conn_1")
+        
+        player = manager.disconnect_player("conn_1")
+        assert player is session.players["alice"]
+        assert not player.connected
+        assert "conn_1" not in manager.connection_to_player
+        
+        success, _ = manager.join_session(session.game_code, "alice", "conn_2")
+        assert success
+        assert manager.connection_to_player == {"conn_2": "alice"}
+        
+        assert manager.disconnect_player("conn_1") is None
+        assert session.players["alice"].connected
+    
+    def test_delete_session_clears_index(self):
+        """Teszt session törlése után nem marad index bejegyzés"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, {'questions': []})
+        manager.join_session(session.game_code, "alice", "conn_1")
+        
+        manager.delete_session(session.game_code)
+        assert manager.connection_to_player == {}
+        assert manager.connection_to_session == {}
+
+
+class TestLeaderboardIndex:
+    """Teszt inkrementális ranglista index"""
+    
+    def _session(self):
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, {'questions': [
+            {'question_type': 'single_choice', 'correct_answer': '2', 'points': 10, 'speed_bonus': True},
+            {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'speed_bonus': False}
+        ]})
+        for idx, nickname in enumerate(["alice", "bob", "carol"]):
+            manager.join_session(session.game_code, nickname, f"conn_{idx}")
+        return manager, session.game_code
+    
+    def test_ties_keep_join_order(self):
+        """Teszt azonos pontszámnál a csatlakozási sorrend dönt"""
+        manager, game_code = self._session()
+        
+        leaderboard = manager.get_leaderboard(game_code)
+        assert [entry['nickname'] for entry in leaderboard] == ["alice", "bob", "carol"]
+        assert [entry['rank'] for entry in leaderboard] == [1, 2, 3]
+    
+    def test_scores_update_index(self):
+        """Teszt pontszámítás után frissül a sorrend és a számlálók"""
+        manager, game_code = self._session()
+        
+        manager.start_question(game_code, 0)
+        manager.submit_answer(game_code, "carol", "2")
+        manager.submit_answer(game_code, "bob", "0")
+        manager.finish_question(game_code)
+        
+        manager.start_question(game_code, 1)
+        manager.submit_answer(game_code, "bob", "1")
+        manager.finish_question(game_code)
+        
+        leaderboard = manager.get_leaderboard(game_code, limit=2)
+        assert [entry['nickname'] for entry in leaderboard] == ["carol", "bob"]
+        assert leaderboard[0]['score'] == 13
+        assert leaderboard[0]['correct_answers'] == 1
+        assert leaderboard[0]['total_answers'] == 2
+        
+        assert manager.get_rank(game_code, "alice") == 3
+        standing = manager.get_standing(game_code, "bob")
+        assert standing['rank'] == 2
+        assert standing['score'] == 10
+        assert standing['correct_answers'] == 1
+        assert manager.get_rank(game_code, "nobody") is None
+
+
+class TestScoreOnSubmit:
+    """Teszt beküldéskori kiértékelés"""
+    
+    def _session(self):
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, {'questions': [
+            {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'speed_bonus': True}
+        ]})
+        for idx, nickname in enumerate(["alice", "bob", "carol", "dave", "erin"]):
+            manager.join_session(session.game_code, nickname, f"conn_{idx}")
+        manager.start_question(session.game_code, 0)
+        return manager, session
+    
+    def test_speed_bonus_by_arrival(self):
+        """Teszt azonos késleltetésnél a bónusz az érkezési sorrendet követi"""
+        manager, session = self._session()
+        for nickname in ["dave", "alice", "bob", "carol"]:
+            manager.submit_answer(session.game_code, nickname, "1")
+        
+        assert list(session.current_question.correct_order) == ["dave", "alice", "bob", "carol"]
+        
+        results = manager.finish_question(session.game_code)
+        assert [results[n]['points'] for n in ["dave", "alice", "bob", "carol"]] == [13, 12, 11, 10]
+        assert [results[n]['rank'] for n in ["dave", "alice", "bob", "carol"]] == [1, 2, 3, None]
+        assert results["erin"] == {'correct': False, 'points': 0, 'rank': None, 'answer': None, 'was_online': True}
+    
+    def test_resubmission_replaces_evaluation(self):
+        """Teszt újraküldésnél az utolsó válasz és annak ideje számít"""
+        manager, session = self._session()
+        manager.submit_answer(session.game_code, "alice", "1")
+        manager.submit_answer(session.game_code, "bob", "1")
+        manager.submit_answer(session.game_code, "alice", "0")
+        manager.submit_answer(session.game_code, "alice", "1")
+        
+        results = manager.finish_question(session.game_code)
+        assert results["bob"]['rank'] == 1
+        assert results["alice"]['rank'] == 2
+    
+    def test_finish_twice_does_not_rescore(self):
+        """Teszt ismételt lezárás nem ad újra pontot"""
+        manager, session = self._session()
+        manager.submit_answer(session.game_code, "alice", "1")
+        
+        first = manager.finish_question(session.game_code)
+        second = manager.finish_question(session.game_code)
+        
+        assert first is second
+        assert session.players["alice"].score == 13
@@ -0,0 +1,98 @@
+import asyncio
+
+from services.heartbeat import Heartbeat
+from services.websocket_manager import ConnectionManager
+from tests.fakes import FakeWebSocket
+
+
+class TestHeartbeat:
+    """Teszt központi szívverés és halott kapcsolatok eltávolítása"""
+
+    def test_tick_pings_all_connections(self):
+        """Teszt egy tick minden kapcsolatnak pinget küld"""
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager, interval=10, timeout=30)
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for idx, ws in enumerate(sockets):
+            manager.register(ws, f"conn_{idx}", f"GAME0{idx % 2}")
+
+        async def scenario():
+            await heartbeat.tick()
+            await manager.drain()
+
+        asyncio.run(scenario())
+        assert all(ws.sent == [{'type': 'ping', 'id': 1}] for ws in sockets)
+
+    def test_silent_connection_is_reaped(self):
+        """Teszt az elnémult és a pingre soha nem válaszoló kapcsolat eltávolítása"""
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager, interval=10, timeout=0.01)
+        reaped = []
+
+        async def on_reap(connection_id, game_code):
+            reaped.append((connection_id, game_code))
+
+        heartbeat.on_reap = on_reap
+        dead = FakeWebSocket()
+        silent = FakeWebSocket()
+        alive = FakeWebSocket()
+        manager.register(dead, "dead", "GAME01")
+        manager.register(alive, "alive", "GAME01")
+        heartbeat.touch("dead", pong=True)
+
+        async def scenario():
+            await asyncio.sleep(0.02)
+            # A soha nem válaszoló kapcsolat az első szívveréstől számít
+            manager.register(silent, "silent", "GAME01")
+            heartbeat.touch("alive")
+            await heartbeat.tick()
+            await asyncio.sleep(0.02)
+            heartbeat.touch("alive")
+            await heartbeat.tick()
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+
+        assert reaped == [("dead", "GAME01"), ("silent", "GAME01")]
+        assert dead.closed and silent.closed
+        assert set(manager.active_connections) == {"alive"}
+        assert "dead" not in heartbeat.last_seen
+
+    def test_pong_measures_rtt(self):
+        """Teszt a pingre érkező pong RTT mintát ad a kapcsolathoz"""
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager, interval=10, timeout=30)
+        manager.register(FakeWebSocket(), "conn_0", "GAME01")
+        manager.register(FakeWebSocket(), "conn_1", "GAME01")
+
+        async def scenario():
+            await heartbeat.tick()
+            await asyncio.sleep(0.01)
+            heartbeat.touch("conn_0", pong=True, ping_id=1)
+            heartbeat.touch("conn_1", pong=True)
+
+        asyncio.run(scenario())
+
+        assert heartbeat.latency.rtt_ns("conn_0") >= 10_000_000
+        assert heartbeat.latency.rtt_ns("conn_1") is None
+
+    def test_late_pong_matches_its_own_ping(self):
+        """Teszt a késve érkező pong a saját pingjéhez mérődik, nem a legutóbbihoz"""
+        manager = ConnectionManager()
+        heartbeat = Heartbeat(manager, interval=10, timeout=30)
+        manager.register(FakeWebSocket(), "conn_0", "GAME01")
+
+        async def scenario():
+            await heartbeat.tick()
+            await asyncio.sleep(0.05)
+            await heartbeat.tick()
+            heartbeat.touch("conn_0", pong=True, ping_id=1)
+            rtt = heartbeat.latency.rtt_ns("conn_0")
+            # Ismeretlen sorszámú pong nem ad mintát
+            heartbeat.touch("conn_0", pong=True, ping_id=99)
+            return rtt
+
+        rtt = asyncio.run(scenario())
+
+        assert rtt >= 50_000_000
+        assert heartbeat.latency.rtt_ns("conn_0") == rtt
@@ -0,0 +1,117 @@
+from fastapi import status
+
+
+class TestLatencyCompensation:
+    """Teszt monoton válaszidő mérés és RTT korrekció"""
+    
+    QUIZ = {'questions': [
+        {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'speed_bonus': True}
+    ]}
+    
+    def _session(self, nicknames=("alice", "bob")):
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, self.QUIZ)
+        for nickname in nicknames:
+            manager.join_session(session.game_code, nickname, f"conn_{nickname}")
+        manager.start_question(session.game_code, 0)
+        return manager, session
+    
+    def test_rtt_compensates_speed_rank(self):
+        """Teszt a lassabb hálózatú, de gyorsabban gondolkodó játékos nyer"""
+        import time
+        
+        manager, session = self._session()
+        manager.submit_answer(session.game_code, "alice", "1", rtt_ns=0)
+        time.sleep(0.02)
+        manager.submit_answer(session.game_code, "bob", "1", rtt_ns=200_000_000)
+        
+        answers = session.current_question.answers_received
+        assert answers["bob"]['elapsed_ns'] == 0
+        
+        results = manager.finish_question(session.game_code)
+        assert results["bob"]['rank'] == 1
+        assert results["alice"]['rank'] == 2
+    
+    def test_late_joiners_timed_from_question_start(self):
+        """Teszt a kérdés közben (újra)csatlakozó is a kezdéstől mérődik, nem előzheti meg a korábban válaszolót"""
+        import time
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, self.QUIZ)
+        code = session.game_code
+        manager.join_session(code, "alice", "conn_alice")
+        manager.join_session(code, "bob", "conn_bob")
+        # bob a kérdés előtt kilép, a kérdést a nyilvános végponton olvassa
+        manager.disconnect_player("conn_bob")
+        manager.start_question(code, 0)
+        
+        time.sleep(0.01)
+        manager.submit_answer(code, "alice", "1")
+        time.sleep(0.02)
+        manager.join_session(code, "bob", "conn_bob_2")
+        manager.join_session(code, "carol", "conn_carol")
+        manager.submit_answer(code, "bob", "1")
+        manager.submit_answer(code, "carol", "1")
+        
+        answers = session.current_question.answers_received
+        assert answers["bob"]['elapsed_ns'] >= 30_000_000
+        assert answers["carol"]['elapsed_ns'] >= 30_000_000
+        
+        results = manager.finish_question(code)
+        assert results["alice"]['rank'] == 1
+        assert {results["bob"]['rank'], results["carol"]['rank']} == {2, 3}
+    
+    def test_rtt_estimate_and_stats(self):
+        """Teszt simított RTT, felső korlát a korrekcióra és összesítés"""
+        from services.latency import LatencyTracker
+        
+        tracker = LatencyTracker(max_compensation_ms=100)
+        for sample in (40, 40, 40, 40):
+            tracker.observe("near", sample * 1_000_000)
+        tracker.observe("far", 500_000_000)
+        tracker.observe("far", 420_000_000)
+        
+        assert tracker.rtt_ns("near") == 40_000_000
+        assert tracker.rtt_ns("far") == 490_000_000
+        assert tracker.compensation_ns("far") == 100_000_000
+        assert tracker.compensation_ns("unknown") == 0
+        
+        stats = tracker.stats(["near", "far", "unknown"])
+        assert stats['connections'] == 3 and stats['measured'] == 2
+        assert stats['rtt_ms']['min'] == 40.0 and stats['rtt_ms']['max'] == 490.0
+        
+        tracker.forget("far")
+        assert tracker.stats(["far"]) == {'connections': 1, 'measured': 0}
+    
+    def test_delayed_pongs_gain_little(self):
+        """Teszt a korrekció alapból ki van kapcsolva, bekapcsolva a legkisebb minta számít"""
+        from services.latency import LatencyTracker
+        
+        disabled = LatencyTracker(max_compensation_ms=0)
+        disabled.observe("cheater", 250_000_000)
+        assert disabled.compensation_ns("cheater") == 0
+        
+        tracker = LatencyTracker(max_compensation_ms=100)
+        tracker.observe("honest", 30_000_000)
+        for _ in range(10):
+            tracker.observe("honest", 250_000_000)
+        assert tracker.compensation_ns("honest") == 30_000_000
+    
+    def test_latency_endpoint(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt a host lekérheti a játékosok hálózati késleltetését"""
+        game_code = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": sample_quiz_for_game["id"]}
+        ).json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice"):
+            response = client.get(f"/api/game/latency/{game_code}", headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {'connections': 1, 'measured': 0}
+        
+        response = client.get(f"/api/game/latency/{game_code}")
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
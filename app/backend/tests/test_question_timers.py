@@ -0,0 +1,140 @@
+class TestQuestionDeadlines:
+    """Teszt szerver oldali kérdés határidők"""
+    
+    QUIZ = {
+        'questions': [
+            {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10, 'time_limit': 5}
+        ]
+    }
+    
+    def _running_game(self, nicknames=("alice", "bob")):
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = manager.create_session(1, 1, self.QUIZ)
+        for nickname in nicknames:
+            manager.join_session(session.game_code, nickname, f"conn_{nickname}")
+        manager.start_question(session.game_code, 0)
+        return manager, session
+    
+    def test_late_and_finished_answers_rejected(self):
+        """Teszt a határidő után és lezárt kérdésre érkező válasz elutasítása"""
+        manager, session = self._running_game()
+        
+        assert manager.submit_answer(session.game_code, "alice", "1")
+        session.current_question.closes_at = 0.0
+        assert not manager.submit_answer(session.game_code, "bob", "1")
+        
+        session.current_question.closes_at = float('inf')
+        manager.finish_question(session.game_code)
+        assert not manager.submit_answer(session.game_code, "bob", "1")
+        assert session.current_question.results["bob"]["answer"] is None
+    
+    def test_all_answered_tracks_connected_players(self):
+        """Teszt az összes online játékos válasza után zárható a kérdés"""
+        manager, session = self._running_game()
+        code = session.game_code
+        
+        assert not manager.all_answered(code)
+        manager.submit_answer(code, "alice", "1")
+        assert not manager.all_answered(code)
+        
+        # A lecsatlakozott játékosra nem vár, a közben csatlakozóra igen
+        manager.disconnect_player("conn_bob")
+        assert manager.all_answered(code)
+        manager.join_session(code, "carol", "conn_carol")
+        assert not manager.all_answered(code)
+        manager.submit_answer(code, "carol", "0")
+        assert manager.all_answered(code)
+        
+        manager.finish_question(code)
+        assert not manager.all_answered(code)
+    
+    def test_timer_closes_question(self):
+        """Teszt a lejárt időzítő a játék kódjával hívja a lezárást"""
+        import asyncio
+        from services.question_timers import QuestionTimers
+        
+        manager, session = self._running_game()
+        closed = []
+        
+        async def close(game_code):
+            closed.append(game_code)
+            manager.finish_question(game_code)
+        
+        async def scenario():
+            timers = QuestionTimers(tick_ms=10)
+            timers.on_expire = close
+            timers.schedule(session.game_code, session.current_question.closes_at)
+            
+            assert await timers.tick_once(session.current_question.closes_at - 1) == []
+            await timers.tick_once(session.current_question.closes_at + 0.01)
+        
+        asyncio.run(scenario())
+        assert closed == [session.game_code]
+        assert session.current_question.finished
+    
+    def test_auto_close_when_everyone_answered(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt a kérdés host hívás nélkül lezárul, ha mindenki válaszolt"""
+        from services.question_timers import question_timers
+        
+        game_code = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": sample_quiz_for_game["id"]}
+        ).json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as ws:
+            client.post(
+                "/api/game/start-question",
+                headers=auth_headers,
+                json={"game_code": game_code, "question_index": 0}
+            )
+            assert game_code in question_timers.wheel
+            
+            ws.send_json({"type": "submit_answer", "answer": "2"})
+            message = ws.receive_json()
+            while message["type"] != "question_finished":
+                message = ws.receive_json()
+            assert message["results"]["alice"]["correct"] is True
+            assert game_code not in question_timers.wheel
+    
+    def test_auto_close_when_last_waiting_player_leaves(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt a kérdés lezárul, ha az egyetlen még nem válaszolt játékos lecsatlakozik"""
+        import time
+        from services.game_manager import game_manager
+        from services.question_timers import question_timers
+        
+        game_code = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": sample_quiz_for_game["id"]}
+        ).json()["game_code"]
+        
+        with client.websocket_connect(f"/api/game/ws/{game_code}/alice") as alice:
+            with client.websocket_connect(f"/api/game/ws/{game_code}/bob") as bob:
+                assert bob.receive_json()["type"] == "connected"
+                client.post(
+                    "/api/game/start-question",
+                    headers=auth_headers,
+                    json={"game_code": game_code, "question_index": 0}
+                )
+                alice.send_json({"type": "submit_answer", "answer": "2"})
+                message = alice.receive_json()
+                while message["type"] != "answer_submitted":
+                    message = alice.receive_json()
+                assert game_code in question_timers.wheel
+                
+                # Hibás keret: a szerver bontja bob kapcsolatát, nem a 30 mp-es időzítő zár
+                bob.send_text("{")
+                current_q = game_manager.get_session(game_code).current_question
+                deadline = time.monotonic() + 5
+                while not current_q.finished and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert current_q.finished
+            
+            message = alice.receive_json()
+            while message["type"] != "question_finished":
+                message = alice.receive_json()
+            assert message["results"]["alice"]["correct"] is True
+            assert game_code not in question_timers.wheel
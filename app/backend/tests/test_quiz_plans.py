@@ -0,0 +1,69 @@
+from fastapi import status
+
+
+class TestQuizPlans:
+    """Teszt a játékok között megosztott lefordított kvíz tervek"""
+    
+    def test_sessions_share_compiled_plan(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt ugyanabból a kvízből indított játékok ugyanazt a tervet használják"""
+        from services.game_manager import game_manager
+        from services.quiz_plans import quiz_plans
+        
+        quiz_id = sample_quiz_for_game["id"]
+        hits = quiz_plans.hits
+        codes = [
+            client.post("/api/game/create", headers=auth_headers, json={"quiz_id": quiz_id}).json()["game_code"]
+            for _ in range(3)
+        ]
+        
+        first, second, third = (game_manager.get_session(code) for code in codes)
+        assert first.quiz_data is second.quiz_data is third.quiz_data
+        assert first.questions is third.questions
+        assert quiz_plans.hits == hits + 2
+    
+    def test_question_edit_invalidates_plan(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt kérdés módosítása után az új játék a friss kérdést kapja"""
+        from services.game_manager import game_manager
+        
+        quiz_id = sample_quiz_for_game["id"]
+        question_id = sample_quiz_for_game["questions"][0]["id"]
+        old_code = client.post("/api/game/create", headers=auth_headers, json={"quiz_id": quiz_id}).json()["game_code"]
+        
+        response = client.put(
+            f"/api/quizzes/{quiz_id}/questions/{question_id}",
+            headers=auth_headers,
+            json={"question_text": "What is 6 + 6?"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        new_code = client.post("/api/game/create", headers=auth_headers, json={"quiz_id": quiz_id}).json()["game_code"]
+        
+        assert game_manager.get_session(new_code).questions[0]['question_text'] == "What is 6 + 6?"
+        assert game_manager.get_session(old_code).questions[0]['question_text'] == "What is 5 + 5?"
+    
+    def test_cache_reloads_changed_quiz_only(self):
+        """Teszt a kérdéseket csak új kvíz változatnál tölti be, LRU kiürítéssel"""
+        from types import SimpleNamespace
+        from services.quiz_plans import QuizPlanCache
+        
+        question = SimpleNamespace(
+            id=1, question_type='single_choice', question_text='Kérdés', options='["a", "b"]',
+            correct_answer='0', time_limit=20, order_index=0
+        )
+        loads = []
+        
+        def load():
+            loads.append(1)
+            return [question]
+        
+        cache = QuizPlanCache(capacity=1)
+        quiz = SimpleNamespace(id=1, title='Kvíz', description=None, updated_at=None)
+        plan = cache.get(quiz, load)
+        assert cache.get(quiz, load) is plan
+        assert plan.quiz_data['questions'][0]['options'] == ["a", "b"]
+        assert len(loads) == 1
+        
+        quiz.updated_at = 'v2'
+        assert cache.get(quiz, load) is not plan
+        cache.get(SimpleNamespace(id=2, title='Másik', description=None, updated_at=None), load)
+        assert 1 not in cache.plans
+        assert len(loads) == 3
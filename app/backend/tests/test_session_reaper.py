@@ -0,0 +1,143 @@
+from fastapi import status
+
+from tests.fakes import FakeWebSocket
+
+
+class TestSessionReaper:
+    """Teszt session lejárat, memóriakeret és archiválás"""
+    
+    QUIZ = {'title': "Archív kvíz", 'questions': [
+        {'question_type': 'single_choice', 'correct_answer': '1', 'points': 10}
+    ]}
+    
+    def _finished_game(self, manager, nickname="alice"):
+        session = manager.create_session(1, 1, self.QUIZ)
+        manager.join_session(session.game_code, nickname, f"conn_{session.game_code}")
+        manager.start_question(session.game_code, 0)
+        manager.submit_answer(session.game_code, nickname, "1")
+        manager.finish_question(session.game_code)
+        manager.finish_game(session.game_code)
+        return session
+    
+    def _reaper(self, manager, **kwargs):
+        from services.session_reaper import SessionReaper
+        from services.websocket_manager import ConnectionManager
+        
+        options = {'waiting_ttl': 100, 'idle_ttl': 100, 'finished_ttl': 100, 'memory_budget_mb': 64, 'archive_limit': 10}
+        options.update(kwargs)
+        return SessionReaper(manager, ConnectionManager(), **options)
+    
+    def test_ttl_per_status(self):
+        """Teszt lejárt várakozó játék törlődik, a többi archiválódik"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        waiting = manager.create_session(1, 1, self.QUIZ)
+        playing = manager.create_session(1, 1, self.QUIZ)
+        manager.join_session(playing.game_code, "bob", "conn_bob")
+        manager.start_question(playing.game_code, 0)
+        finished = self._finished_game(manager)
+        fresh = manager.create_session(1, 1, self.QUIZ)
+        
+        for session in (waiting, playing, finished):
+            session.last_activity -= 200
+        
+        removed = self._reaper(manager).tick()
+        
+        assert set(removed) == {waiting.game_code, playing.game_code, finished.game_code}
+        assert list(manager.sessions) == [fresh.game_code]
+        assert waiting.game_code not in manager.archives
+        assert manager.archives[playing.game_code].status == "playing"
+        
+        archive = manager.get_archive(finished.game_code)
+        assert archive.quiz_title == "Archív kvíz"
+        assert archive.leaderboard[0]['nickname'] == "alice"
+        assert archive.leaderboard[0]['question_scores'][0]['correct']
+        assert manager.connection_to_session == {}
+    
+    def test_memory_budget_evicts_least_recently_used(self):
+        """Teszt a keret felett a legrégebben használt befejezett játék archiválódik"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        older = self._finished_game(manager)
+        newer = self._finished_game(manager)
+        running = manager.create_session(1, 1, self.QUIZ)
+        manager.get_session(older.game_code)
+        
+        # A közös kvíz adat egyszer számít
+        budget = sum(manager.estimate_size(session) for session in manager.sessions.values()) + older.quiz_size - 1
+        removed = self._reaper(manager, memory_budget_mb=budget / 1024 / 1024).tick()
+        
+        assert removed == [newer.game_code]
+        assert set(manager.sessions) == {older.game_code, running.game_code}
+    
+    def test_shared_quiz_plan_counted_once(self):
+        """Teszt az egy tervből indított játékok kvíz adata egyszer terheli a keretet"""
+        import copy
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        sessions = [self._finished_game(manager) for _ in range(3)]
+        own = sum(manager.estimate_size(session) for session in sessions)
+        
+        removed = self._reaper(manager, memory_budget_mb=(own + sessions[0].quiz_size) / 1024 / 1024).tick()
+        assert removed == []
+        
+        # Külön példányú (nem közös) kvíz adat már játékonként számít
+        sessions[0].quiz_data = copy.deepcopy(self.QUIZ)
+        removed = self._reaper(manager, memory_budget_mb=(own + sessions[0].quiz_size) / 1024 / 1024).tick()
+        assert removed == [sessions[0].game_code]
+    
+    def test_expired_game_connections_closed_normally(self):
+        """Teszt a lejárt játék kapcsolatai szabályos (nem hiba) kóddal zárulnak"""
+        import asyncio
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        session = self._finished_game(manager)
+        session.last_activity -= 200
+        websocket = FakeWebSocket()
+        
+        async def scenario():
+            reaper = self._reaper(manager)
+            reaper.connections.register(websocket, "conn_1", session.game_code)
+            reaper.tick()
+            await asyncio.sleep(0)
+        
+        asyncio.run(scenario())
+        assert websocket.closed
+        assert (websocket.close_code, websocket.close_reason) == (1001, "A játék lejárt")
+    
+    def test_archive_limit(self):
+        """Teszt a legrégebben használt archívumok törlődnek a korlát felett"""
+        from services.game_manager import GameManager
+        
+        manager = GameManager()
+        codes = [self._finished_game(manager).game_code for _ in range(3)]
+        for code in codes:
+            manager.archive_session(code)
+        manager.get_archive(codes[0])
+        
+        self._reaper(manager, archive_limit=2).tick()
+        assert list(manager.archives) == [codes[2], codes[0]]
+    
+    def test_export_after_archive(self, client, auth_headers, sample_quiz_for_game):
+        """Teszt archivált játék eredményei is exportálhatók"""
+        from services.game_manager import game_manager
+        
+        game_code = client.post(
+            "/api/game/create",
+            headers=auth_headers,
+            json={"quiz_id": sample_quiz_for_game["id"]}
+        ).json()["game_code"]
+        game_manager.join_session(game_code, "alice", "conn_export")
+        game_manager.archive_session(game_code)
+        
+        response = client.get(f"/api/game/export/excel/{game_code}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = client.get(f"/api/game/leaderboard/{game_code}")
+        assert response.json()["leaderboard"][0]["nickname"] == "alice"
+        
+        game_manager.forget_archive(game_code)
@@ -0,0 +1,234 @@
+import asyncio
+import json
+
+from services.shard_router import ShardDispatcher, parse_head, read_head, route_key
+from services.sharding import shard_of
+
+
+async def fake_shard(index: int, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Teszt worker: a válaszban visszaadja a saját indexét és a kért útvonalat"""
+    while True:
+        head = await read_head(reader)
+        if head is None:
+            break
+        request_line, headers = parse_head(head)
+        assert "expect" not in headers and "transfer-encoding" not in headers
+        request_body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("upgrade") == "websocket":
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n\r\n")
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                writer.write(f"{index}:".encode() + data)
+                await writer.drain()
+            break
+
+        body = f"{index} {request_line[1]}".encode()
+        if request_line[1].endswith("/echo"):
+            body += b" " + request_body
+        if request_line[1].endswith("/chunked"):
+            writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+            writer.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+        else:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+        await writer.drain()
+    writer.close()
+
+
+def codes_by_shard(shard_count: int) -> list:
+    """Egy-egy játék kód minden shardhoz"""
+    codes = {}
+    index = 0
+    while len(codes) < shard_count:
+        code = f"G{index:05d}"
+        codes.setdefault(shard_of(code, shard_count), code)
+        index += 1
+    return [codes[shard] for shard in range(shard_count)]
+
+
+async def read_response(reader: asyncio.StreamReader) -> bytes:
+    status_line, headers = parse_head(await read_head(reader))
+    if "chunked" in headers.get("transfer-encoding", ""):
+        body = b""
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if not size:
+                return body
+            body += chunk[:-2]
+    return await reader.readexactly(int(headers["content-length"]))
+
+
+class TestShardDispatcher:
+    """Teszt játék kód szerinti továbbítás a tulajdonos workerhez"""
+
+    def test_route_key(self):
+        """Teszt a játék kód az útvonalból, query paraméterből vagy JSON törzsből"""
+        json_headers = {"content-type": "application/json"}
+        assert route_key("/api/game/ws/ABC123/alice?events=full", {}, b"") == "ABC123"
+        assert route_key("/api/game/export/pdf/ABC123", {}, b"") == "ABC123"
+        assert route_key("/api/game/finish-game?game_code=XYZ789", {}, b"") == "XYZ789"
+        assert route_key("/api/game/start-question", json_headers, b'{"game_code": "QQQ111", "question_index": 0}') == "QQQ111"
+        assert route_key("/api/game/create", json_headers, b'{"quiz_id": 1}') is None
+        assert route_key("/api/quizzes/ABC123", {}, b"") is None
+
+    def test_requests_reach_owner_on_one_connection(self):
+        """Teszt egy keep-alive kapcsolat kérései is a saját shardjukhoz mennek"""
+        code_a, code_b = codes_by_shard(2)
+
+        async def scenario():
+            servers = [
+                await asyncio.start_server(lambda r, w, i=index: fake_shard(i, r, w), "127.0.0.1", 0)
+                for index in range(2)
+            ]
+            upstreams = [("127.0.0.1", server.sockets[0].getsockname()[1]) for server in servers]
+            dispatcher = ShardDispatcher(upstreams)
+            await dispatcher.start()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", dispatcher.port)
+            bodies = []
+            payload = json.dumps({"game_code": code_b}).encode()
+            requests = [
+                f"GET /api/game/session/{code_a} HTTP/1.1\r\nHost: x\r\n\r\n".encode(),
+                f"GET /api/game/leaderboard/{code_b} HTTP/1.1\r\nHost: x\r\n\r\n".encode(),
+                (
+                    b"POST /api/game/finish-question HTTP/1.1\r\nHost: x\r\n"
+                    b"Content-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(payload), payload)
+                ),
+                f"GET /api/game/{code_a}/chunked HTTP/1.1\r\nHost: x\r\n\r\n".encode()
+            ]
+            for request in requests:
+                writer.write(request)
+                bodies.append(await read_response(reader))
+
+            writer.close()
+            await dispatcher.stop()
+            for server in servers:
+                server.close()
+            return bodies, dispatcher.forwarded
+
+        bodies, forwarded = asyncio.run(scenario())
+        assert bodies == [
+            f"0 /api/game/session/{code_a}".encode(),
+            f"1 /api/game/leaderboard/{code_b}".encode(),
+            b"1 /api/game/finish-question",
+            f"0 /api/game/{code_a}/chunked".encode()
+        ]
+        assert forwarded == [2, 2]
+
+    def test_websocket_upgrade_is_spliced(self):
+        """Teszt a WebSocket kapcsolat a tulajdonos workerhez kötődik"""
+        codes = codes_by_shard(3)
+
+        async def scenario():
+            servers = [
+                await asyncio.start_server(lambda r, w, i=index: fake_shard(i, r, w), "127.0.0.1", 0)
+                for index in range(3)
+            ]
+            dispatcher = ShardDispatcher([("127.0.0.1", server.sockets[0].getsockname()[1]) for server in servers])
+            await dispatcher.start()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", dispatcher.port)
+            writer.write(
+                f"GET /api/game/ws/{codes[2]}/alice HTTP/1.1\r\nHost: x\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n\r\n".encode()
+            )
+            status_line, _ = parse_head(await read_head(reader))
+            writer.write(b"frame")
+            echoed = await reader.readexactly(len(b"2:frame"))
+
+            writer.close()
+            await dispatcher.stop()
+            for server in servers:
+                server.close()
+            return status_line[1], echoed
+
+        assert asyncio.run(scenario()) == ("101", b"2:frame")
+
+    def test_dispatcher_and_workers_share_key(self):
+        """Teszt a diszpécser és a worker eltérő környezetben is ugyanarra a shardra képez"""
+        from services.code_allocator import CodeAllocator, CodePermutation, code_key
+        from services.shard_router import worker_env
+
+        # A diszpécser a .env-ből olvasta a kulcsot, a worker környezetében más van
+        key = code_key({"SECRET_KEY": "dispatcher-secret"})
+        env = worker_env(1, 2, key, {"SECRET_KEY": "worker-secret"})
+        assert code_key(env) == key
+
+        upstreams = [("127.0.0.1", 1), ("127.0.0.1", 2)]
+        allocator = CodeAllocator(1, 2, start=0, key_permutation=CodePermutation(code_key(env)))
+        codes = [allocator.allocate() for _ in range(100)]
+        assert all(ShardDispatcher(upstreams, key=key).pick(code) == 1 for code in codes)
+        assert any(ShardDispatcher(upstreams, key=b"").pick(code) != 1 for code in codes)
+
+    def test_request_body_limits(self):
+        """Teszt hibás, túl nagy és lassú kérés törzs elutasítása"""
+        code = codes_by_shard(1)[0]
+
+        async def status_of(port: int, request: bytes) -> int:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            status_line, _ = parse_head(await read_head(reader))
+            writer.close()
+            return int(status_line[1])
+
+        async def scenario():
+            server = await asyncio.start_server(lambda r, w: fake_shard(0, r, w), "127.0.0.1", 0)
+            dispatcher = ShardDispatcher([("127.0.0.1", server.sockets[0].getsockname()[1])], max_body=100, body_timeout=0.2)
+            await dispatcher.start()
+
+            head = f"POST /api/game/session/{code} HTTP/1.1\r\nHost: x\r\n"
+            statuses = [
+                await status_of(dispatcher.port, f"{head}Content-Length: abc\r\n\r\n".encode()),
+                await status_of(dispatcher.port, f"{head}Content-Length: 1000000000\r\n\r\n".encode()),
+                await status_of(dispatcher.port, f"{head}Content-Length: 3\r\nTransfer-Encoding: chunked\r\n\r\n".encode()),
+                await status_of(dispatcher.port, f"{head}Transfer-Encoding: chunked\r\n\r\n65\r\n".encode() + b"x" * 101),
+                await status_of(dispatcher.port, f"{head}Transfer-Encoding: chunked\r\n\r\nzz\r\n".encode()),
+                await status_of(dispatcher.port, f"{head}Content-Length: 10\r\n\r\nabc".encode())
+            ]
+
+            await dispatcher.stop()
+            server.close()
+            return statuses
+
+        assert asyncio.run(scenario()) == [400, 413, 400, 413, 400, 408]
+
+    def test_chunked_upload_and_expect_continue(self):
+        """Teszt chunked feltöltés és Expect: 100-continue a JSON törzs szerinti shardhoz"""
+        code_b = codes_by_shard(2)[1]
+        payload = json.dumps({"game_code": code_b}).encode()
+
+        async def scenario():
+            servers = [
+                await asyncio.start_server(lambda r, w, i=index: fake_shard(i, r, w), "127.0.0.1", 0)
+                for index in range(2)
+            ]
+            dispatcher = ShardDispatcher([("127.0.0.1", server.sockets[0].getsockname()[1]) for server in servers])
+            await dispatcher.start()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", dispatcher.port)
+            writer.write(
+                b"POST /api/game/echo HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n%x\r\n%s\r\n0\r\n\r\n" % (len(payload), payload)
+            )
+            chunked = await read_response(reader)
+
+            writer.write(
+                b"POST /api/game/echo HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+                b"Expect: 100-continue\r\nContent-Length: %d\r\n\r\n" % len(payload)
+            )
+            continue_line, _ = parse_head(await read_head(reader))
+            writer.write(payload)
+            expected = await read_response(reader)
+
+            writer.close()
+            await dispatcher.stop()
+            for server in servers:
+                server.close()
+            return chunked, continue_line, expected
+
+        chunked, continue_line, expected = asyncio.run(scenario())
+        assert chunked == expected == b"1 /api/game/echo " + payload
+        assert continue_line[1] == "100"
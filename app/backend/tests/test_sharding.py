@@ -0,0 +1,30 @@
+class TestSharding:
+    """Teszt játék kódok shardonkénti kiosztása"""
+    
+    def test_codes_belong_to_own_shard(self, monkeypatch):
+        """Teszt a worker csak a saját shardjához tartozó kódot ad ki"""
+        from services import sharding
+        from services.game_manager import GameManager
+        
+        monkeypatch.setattr(sharding, "SHARD_COUNT", 4)
+        monkeypatch.setattr(sharding, "SHARD_INDEX", 3)
+        
+        manager = GameManager()
+        codes = [manager.create_session(1, 1, {'questions': []}).game_code for _ in range(20)]
+        assert all(sharding.shard_of(code, 4) == 3 for code in codes)
+        assert sharding.shard_of(codes[0].lower(), 4) == 3
+    
+    def test_shards_are_balanced(self):
+        """Teszt a véletlen kódok nagyjából egyenletesen oszlanak el"""
+        import random
+        import string
+        from collections import Counter
+        from services.sharding import shard_of
+        
+        rng = random.Random(1)
+        counts = Counter(
+            shard_of(''.join(rng.choices(string.ascii_uppercase + string.digits, k=6)), 8)
+            for _ in range(8000)
+        )
+        assert len(counts) == 8
+        assert min(counts.values()) > 800
@@ -0,0 +1,48 @@
+class TestTimerWheel:
+    """Teszt hierarchikus időzítő kerék"""
+    
+    def test_fires_at_deadline_across_levels(self):
+        """Teszt minden időzítő a határidején jár le, szintektől függetlenül"""
+        import random
+        from services.timer_wheel import TimerWheel
+        
+        rng = random.Random(7)
+        wheel = TimerWheel(tick=1.0, origin=0.0, slots=8, levels=3)
+        deadlines = {key: rng.randrange(1, 700) for key in range(500)}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+        
+        fired = {}
+        for now in range(0, 720, 3):
+            for key in wheel.advance(now):
+                fired[key] = now
+        
+        assert len(wheel) == 0
+        for key, deadline in deadlines.items():
+            assert deadline <= fired[key] < deadline + 3
+    
+    def test_cancel_and_reschedule(self):
+        """Teszt törölt időzítő nem jár le, az újraütemezett az új határidőn"""
+        from services.timer_wheel import TimerWheel
+        
+        wheel = TimerWheel(tick=0.1, origin=100.0)
+        wheel.schedule("a", 101.0)
+        wheel.schedule("b", 101.0)
+        wheel.cancel("a")
+        wheel.schedule("b", 105.0)
+        
+        assert wheel.advance(102.0) == []
+        assert wheel.advance(105.0) == ["b"]
+        
+        wheel.schedule("late", 99.0)
+        assert wheel.advance(105.0) == ["late"]
+    
+    def test_beyond_wheel_span(self):
+        """Teszt a kerék teljes körénél hosszabb határidő is pontosan lejár"""
+        from services.timer_wheel import TimerWheel
+        
+        wheel = TimerWheel(tick=1.0, origin=0.0, slots=4, levels=2)
+        wheel.schedule("far", 50)
+        
+        assert wheel.advance(49) == []
+        assert wheel.advance(50) == ["far"]
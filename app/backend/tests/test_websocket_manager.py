@@ -0,0 +1,237 @@
+import asyncio
+import json
+
+import pytest
+
+from services.websocket_manager import (
+    ConnectionManager,
+    COALESCE_LATEST,
+    DISCONNECT,
+    DROP_OLDEST,
+    HOST,
+    PLAYER,
+)
+from tests.fakes import FakeWebSocket, broadcast_and_drain
+
+
+class TestBroadcast:
+    """Teszt párhuzamos broadcast"""
+
+    def test_broadcast_reaches_everyone(self):
+        """Teszt minden kapcsolat megkapja az üzenetet"""
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for idx, ws in enumerate(sockets):
+            manager.register(ws, f"conn_{idx}", "GAME01")
+
+        stats = asyncio.run(broadcast_and_drain(manager, {'type': 'ping'}, "GAME01"))
+
+        assert stats.recipients == 5
+        assert stats.delivered == 5
+        assert stats.evicted == []
+        assert all(ws.sent == [{'type': 'ping'}] for ws in sockets)
+        assert manager.last_broadcast["GAME01"] is stats
+
+    def test_failed_connection_is_evicted(self):
+        """Teszt lezárt kapcsolat nem szakítja meg a broadcastot"""
+        manager = ConnectionManager()
+        broken = FakeWebSocket(fail=True)
+        healthy = FakeWebSocket()
+        manager.register(broken, "broken", "GAME01")
+        manager.register(healthy, "healthy", "GAME01")
+
+        stats = asyncio.run(broadcast_and_drain(manager, {'type': 'ping'}, "GAME01"))
+
+        assert stats.delivered == 1
+        assert stats.evicted == ["broken"]
+        assert healthy.sent == [{'type': 'ping'}]
+        assert broken.closed
+        assert "broken" not in manager.active_connections
+        assert manager.game_connections["GAME01"] == {"healthy"}
+
+    def test_slow_connection_times_out(self):
+        """Teszt lassú kapcsolat nem tartja fel a többieket"""
+        manager = ConnectionManager(send_timeout=0.05)
+        slow = FakeWebSocket(delay=1.0)
+        fast = [FakeWebSocket() for _ in range(3)]
+        manager.register(slow, "slow", "GAME01")
+        for idx, ws in enumerate(fast):
+            manager.register(ws, f"fast_{idx}", "GAME01")
+
+        stats = asyncio.run(broadcast_and_drain(manager, {'type': 'ping'}, "GAME01"))
+
+        assert stats.delivered == 3
+        assert stats.evicted == ["slow"]
+        assert stats.last_delivery_ms < 50
+
+    def test_broadcast_does_not_wait_for_sends(self):
+        """Teszt a broadcast a küldések bevárása nélkül tér vissza"""
+        manager = ConnectionManager()
+        slow = FakeWebSocket(delay=0.2)
+        manager.register(slow, "slow", "GAME01")
+
+        async def scenario():
+            stats = await manager.broadcast_to_game({'type': 'question_started'}, "GAME01")
+            assert stats.queued == 1
+            assert stats.delivered == 0
+            await manager.drain("GAME01")
+            return stats
+
+        stats = asyncio.run(scenario())
+        assert stats.delivered == 1
+        assert stats.duration_ms < 100
+        assert slow.sent == [{'type': 'question_started'}]
+
+    def test_broadcast_unknown_game(self):
+        """Teszt broadcast nem létező játékba"""
+        manager = ConnectionManager()
+        stats = asyncio.run(manager.broadcast_to_game({'type': 'ping'}, "NOGAME"))
+        assert stats.recipients == 0
+        assert "NOGAME" not in manager.last_broadcast
+
+
+class TestTopics:
+    """Teszt szerepkör és topic alapú címzés"""
+
+    def test_broadcast_to_role(self):
+        """Teszt csak a megadott szerepkör kapja meg az üzenetet"""
+        manager = ConnectionManager()
+        host = FakeWebSocket()
+        players = [FakeWebSocket() for _ in range(3)]
+        manager.register(host, "host", "GAME01", role=HOST)
+        for idx, ws in enumerate(players):
+            manager.register(ws, f"player_{idx}", "GAME01")
+
+        stats = asyncio.run(broadcast_and_drain(manager, {'type': 'host_only'}, "GAME01", topics=[HOST]))
+
+        assert stats.recipients == 1
+        assert host.sent == [{'type': 'host_only'}]
+        assert all(ws.sent == [] for ws in players)
+
+    def test_custom_topic_subscription(self):
+        """Teszt egyedi topicra feliratkozott kapcsolatok"""
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for idx, ws in enumerate(sockets):
+            manager.register(ws, f"player_{idx}", "GAME01")
+        manager.subscribe("player_1", "GAME01", "team_red")
+
+        asyncio.run(broadcast_and_drain(manager, {'type': 'team'}, "GAME01", topics=["team_red"]))
+        assert [len(ws.sent) for ws in sockets] == [0, 1, 0]
+
+        manager.disconnect("player_1", "GAME01")
+        assert manager.members("GAME01", "team_red") == set()
+        assert manager.members("GAME01", PLAYER) == {"player_0", "player_2"}
+
+    def test_disconnect_clears_indexes(self):
+        """Teszt a kapcsolat indexei a bontással együtt törlődnek"""
+        manager = ConnectionManager()
+        manager.register(FakeWebSocket(), "player_0", "GAME01")
+        manager.subscribe("player_0", "GAME01", "team_red")
+        assert manager._game_of("player_0") == "GAME01"
+
+        manager.disconnect("player_0", "GAME01")
+        assert manager._game_of("player_0") is None
+        assert manager.connection_topics == {}
+        assert manager.topics == {}
+        assert manager.game_connections == {}
+
+    def test_unknown_role_rejected(self):
+        """Teszt ismeretlen szerepkör"""
+        manager = ConnectionManager()
+        with pytest.raises(ValueError):
+            manager.register(FakeWebSocket(), "conn", "GAME01", role="admin")
+
+
+class TestPreparedMessage:
+    """Teszt egyszer szerializált üzenetek"""
+
+    def test_prepare_matches_send_json_encoding(self):
+        """Teszt a kódolás megegyezik a send_json kimenetével"""
+        message = {'type': 'question_finished', 'leaderboard': [{'nickname': 'Árvíztűrő', 'score': 13}]}
+        prepared = ConnectionManager.prepare(message)
+        assert prepared.text == json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        assert ConnectionManager.prepare(prepared) is prepared
+
+    def test_extend_reuses_shared_text(self):
+        """Teszt személyes mezők hozzáfűzése a közös kerethez"""
+        shared = ConnectionManager.prepare({'type': 'question_finished', 'leaderboard': [{'nickname': 'a'}]})
+        personal = ConnectionManager.extend(shared, {'results': {'a': {'points': 13}}})
+        assert json.loads(personal.text) == personal.payload
+        assert personal.text.startswith(shared.text[:-1])
+        with pytest.raises(ValueError):
+            ConnectionManager.extend(shared, {'type': 'other'})
+
+    def test_broadcast_sends_same_frame(self):
+        """Teszt minden kapcsolat ugyanazt a keretet kapja"""
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for idx, ws in enumerate(sockets):
+            manager.register(ws, f"conn_{idx}", "GAME01")
+
+        prepared = manager.prepare({'type': 'ping'})
+        asyncio.run(broadcast_and_drain(manager, prepared, "GAME01"))
+
+        assert all(ws.frames[0] is prepared.text for ws in sockets)
+
+
+class TestBackpressure:
+    """Teszt kimenő sorok túlcsordulási szabályai"""
+
+    def _fill(self, policy, messages):
+        manager = ConnectionManager(queue_size=2, policies={'event': policy})
+        slow = FakeWebSocket(delay=0.01)
+        manager.register(slow, "slow", "GAME01")
+
+        async def scenario():
+            outcomes = [await manager.broadcast_to_game(message, "GAME01") for message in messages]
+            await manager.drain("GAME01")
+            await asyncio.sleep(0)
+            return outcomes
+
+        return manager, slow, asyncio.run(scenario())
+
+    def test_drop_oldest(self):
+        """Teszt teli sornál a legrégebbi üzenet eldobása"""
+        messages = [{'type': 'event', 'seq': idx} for idx in range(4)]
+        manager, slow, outcomes = self._fill(DROP_OLDEST, messages)
+        # a broadcastok között nincs await, így az író taszk csak a végén indul
+        assert [msg['seq'] for msg in slow.sent] == [2, 3]
+        assert outcomes[1].dropped == 0
+        assert outcomes[3].dropped == 1
+
+    def test_coalesce_latest(self):
+        """Teszt azonos típusú várakozó üzenetek összevonása"""
+        messages = [{'type': 'event', 'seq': idx} for idx in range(5)]
+        manager, slow, outcomes = self._fill(COALESCE_LATEST, messages)
+        assert [msg['seq'] for msg in slow.sent] == [4]
+        assert "slow" in manager.active_connections
+
+    def test_state_messages_coalesce_by_default(self):
+        """Teszt a host pillanatkép és a számláló delta lassú kapcsolatnál összevonódik, nem bont"""
+        manager = ConnectionManager(queue_size=2)
+        slow = FakeWebSocket(delay=0.01)
+        manager.register(slow, "slow", "GAME01")
+        messages = [{'type': 'host_snapshot', 'seq': idx} for idx in range(3)]
+        messages += [{'type': 'game_delta', 'answers_count': idx, 'total_players': 9} for idx in range(3)]
+
+        async def scenario():
+            for message in messages:
+                await manager.broadcast_to_game(message, "GAME01")
+            await manager.drain("GAME01")
+
+        asyncio.run(scenario())
+        assert "slow" in manager.active_connections
+        assert slow.sent == [messages[2], messages[5]]
+
+        named = manager.prepare({'type': 'game_delta', 'joined': ["alice"], 'left': [], 'answered': []})
+        assert manager.policy_for(named) == DISCONNECT
+
+    def test_disconnect_on_overflow(self):
+        """Teszt teli sornál a kapcsolat bontása"""
+        messages = [{'type': 'event', 'seq': idx} for idx in range(3)]
+        manager, slow, outcomes = self._fill(DISCONNECT, messages)
+        assert outcomes[2].evicted == ["slow"]
+        assert slow.sent == []
+        assert "slow" not in manager.active_connections
+        assert slow.closed
@@ -0,0 +1,105 @@
+import asyncio
+import zlib
+
+import msgpack
+import pytest
+from fastapi import WebSocketDisconnect
+
+from services.wire_protocol import (
+    MAX_MESSAGE_BYTES,
+    MSGPACK,
+    MalformedMessage,
+    decode_binary,
+    encode_binary,
+    receive_message,
+)
+from services.websocket_manager import ConnectionManager
+from tests.fakes import FakeWebSocket, broadcast_and_drain
+
+
+class TestWireProtocol:
+    """Teszt bináris msgpack keretek"""
+
+    def _question_finished(self, players: int) -> dict:
+        return {
+            'type': 'question_finished',
+            'results': {
+                f"player_{idx}": {'correct': True, 'points': 13, 'rank': 1, 'answer': '2', 'was_online': True}
+                for idx in range(players)
+            },
+            'leaderboard': [
+                {'nickname': f"player_{idx}", 'score': 13, 'correct_answers': 1, 'total_answers': 1, 'rank': idx + 1}
+                for idx in range(min(players, 10))
+            ],
+            'correct_answer': '2'
+        }
+
+    def test_roundtrip_keeps_nickname_keys(self):
+        """Teszt a becenév kulcsok nem cserélődnek tagekre"""
+        message = self._question_finished(1)
+        message['results']['score'] = {'correct': False, 'points': 0, 'rank': None, 'answer': None, 'was_online': False}
+        assert decode_binary(encode_binary(message)) == message
+
+    def test_binary_frame_is_smaller(self):
+        """Teszt a msgpack keret kisebb a JSON-nál, a nagy keret tömörített"""
+        message = self._question_finished(300)
+        text = ConnectionManager.prepare(message).text
+        frame = encode_binary(message)
+        assert frame[0] == 1
+        assert len(frame) < len(text.encode("utf-8")) / 4
+
+    def test_connection_receives_binary(self):
+        """Teszt msgpack kapcsolat bináris keretet kap, JSON kapcsolat szöveget"""
+        manager = ConnectionManager()
+        binary_ws = FakeWebSocket()
+        text_ws = FakeWebSocket()
+        manager.register(binary_ws, "binary", "GAME01", wire_format=MSGPACK)
+        manager.register(text_ws, "text", "GAME01")
+
+        asyncio.run(broadcast_and_drain(manager, {'type': 'question_started', 'question_index': 0}, "GAME01"))
+
+        assert isinstance(binary_ws.frames[0], bytes)
+        assert isinstance(text_ws.frames[0], str)
+        assert binary_ws.sent == text_ws.sent == [{'type': 'question_started', 'question_index': 0}]
+
+    def test_host_snapshot_keeps_nickname_keys(self):
+        """Teszt a host_snapshot answers_received becenév kulcsai sem cserélődnek"""
+        message = {
+            'type': 'host_snapshot',
+            'current_question': {
+                'question_index': 0,
+                'answers_received': {'type': {'answer': '1', 'time': '2024-01-01T00:00:00'}}
+            }
+        }
+        assert decode_binary(encode_binary(message)) == message
+
+    def test_rejects_malformed_frames(self):
+        """Teszt üres, hibás, nem objektum és tömörítési bomba keret elutasítása"""
+        bomb = bytes([1]) + zlib.compress(b"\0" * (MAX_MESSAGE_BYTES * 100))
+        assert len(bomb) < 10000
+        frames = [b"", bytes([7]) + b"x", bytes([1]) + b"nem zlib", bytes([0]) + b"\xc1", bytes([0]) + msgpack.packb([1]), bomb]
+        for frame in frames:
+            with pytest.raises(MalformedMessage):
+                decode_binary(frame)
+
+    def test_malformed_message_disconnects(self):
+        """Teszt hibás bejövő üzenetre 1003-as zárás és lecsatlakozás"""
+        class ReceivingWebSocket(FakeWebSocket):
+            def __init__(self, message):
+                super().__init__()
+                self.message = message
+                self.close_code = None
+
+            async def receive(self):
+                return self.message
+
+            async def close(self, code: int = 1000, reason: str = None):
+                self.close_code = code
+
+        for message in ({'type': 'websocket.receive', 'text': '{nem json'},
+                        {'type': 'websocket.receive', 'text': '[1, 2]'},
+                        {'type': 'websocket.receive', 'bytes': b''}):
+            ws = ReceivingWebSocket(message)
+            with pytest.raises(WebSocketDisconnect) as error:
+                asyncio.run(receive_message(ws))
+            assert error.value.code == ws.close_code == 1003
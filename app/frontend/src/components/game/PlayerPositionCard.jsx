@@ -5,10 +5,11 @@ import { FaChartBar, FaTrophy, FaMedal } from 'react-icons/fa';
  * Saját helyezés megjelenítő komponens
  * Megjeleníti a játékos aktuális helyezését a ranglistán
  */
-const PlayerPositionCard = ({ nickname, leaderboard }) => {
-  // Megkeressük a játékos pozícióját
-  const myPosition = leaderboard.findIndex(p => p.nickname === nickname);
-  const myData = leaderboard[myPosition];
+const PlayerPositionCard = ({ nickname, leaderboard, standing = null }) => {
+  // Megkeressük a játékos pozícióját (a top listán kívül a szerver által küldött saját helyezés alapján)
+  const listPosition = leaderboard.findIndex(p => p.nickname === nickname);
+  const myData = listPosition >= 0 ? leaderboard[listPosition] : standing;
+  const myPosition = listPosition >= 0 ? listPosition : (standing ? standing.rank - 1 : -1);
   
   // Ha nincs adat, ne jelenjen meg semmi
   if (!myData) {
@@ -1,6 +1,6 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { Container, Row, Col, Alert, Spinner } from 'react-bootstrap';
+import { Container, Row, Col, Alert, Spinner, Button } from 'react-bootstrap';
 import { useAuth } from '../context/AuthContext';
 import * as gameService from '../services/gameService';
 
@@ -10,6 +10,9 @@ import PlayingScreen from '../components/host/PlayingScreen';
 import ResultsScreen from '../components/host/ResultsScreen';
 import FinishedScreen from '../components/host/FinishedScreen';
 
+// A host token frissítési gyakorisága (ms), a token 30 perc után lejár
+const TOKEN_REFRESH_MS = 5 * 60 * 1000;
+
 function GameHost() {
   const { gameCode } = useParams();
   const navigate = useNavigate();
@@ -26,17 +29,63 @@ function GameHost() {
   // Játék fázisok: 'waiting', 'playing', 'results', 'finished'
   const [gamePhase, setGamePhase] = useState('waiting');
 
-  // Session info betöltése
+  const wsRef = useRef(null);
+  const gamePhaseRef = useRef(gamePhase);
+
   useEffect(() => {
-    // Ha a játék véget ért, ne pollolgassunk tovább
-    if (gamePhase === 'finished') {
-      return;
-    }
+    gamePhaseRef.current = gamePhase;
+  }, [gamePhase]);
+
+  // Host WebSocket: kezdő pillanatkép, élő frissítések és parancsok
+  useEffect(() => {
+    let stopped = false;
+    let retryTimer = null;
+
+    // A token frissítése a kapcsolaton (a lejárat előtt)
+    const refreshTimer = setInterval(() => {
+      if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+        wsRef.current.send(JSON.stringify({ type: 'refresh_token' }));
+      }
+    }, TOKEN_REFRESH_MS);
+
+    const connect = () => {
+      const token = localStorage.getItem('token');
+      const ws = gameService.createHostWebSocket(gameCode, token);
+      wsRef.current = ws;
 
-    loadSessionInfo();
-    const interval = setInterval(loadSessionInfo, 1000); // 1 másodpercenként
-    return () => clearInterval(interval);
-  }, [gameCode, gamePhase]);
+      ws.onmessage = (event) => {
+        handleHostMessage(JSON.parse(event.data));
+      };
+
+      ws.onerror = (error) => {
+        console.error('Host WebSocket hiba:', error);
+      };
+
+      ws.onclose = (event) => {
+        // A befejezett játék archiválás után lezárul, ez nem hiba
+        if (stopped || gamePhaseRef.current === 'finished') {
+          return;
+        }
+        if (event.code === 1008) {
+          setError(event.reason || 'Nem sikerült csatlakozni a játékhoz');
+          setLoading(false);
+          return;
+        }
+        // Megszakadt kapcsolat: újracsatlakozás, a szerver friss pillanatképet küld
+        retryTimer = setTimeout(connect, 1000);
+      };
+    };
+
+    connect();
+    return () => {
+      stopped = true;
+      clearTimeout(retryTimer);
+      clearInterval(refreshTimer);
+      if (wsRef.current) {
+        wsRef.current.close();
+      }
+    };
+  }, [gameCode]);
 
   // Időzítő kezelése
   useEffect(() => {
@@ -55,55 +104,147 @@ function GameHost() {
     }
   }, [gamePhase, session]);
 
-  const loadSessionInfo = async () => {
-    try {
-      const token = localStorage.getItem('token');
-      const data = await gameService.getSessionInfo(gameCode, token);
-      setSession(data);
-      setPlayers(data.players || []);
-      setLeaderboard(data.leaderboard || []);
-      
-      // Fázis meghatározása
-      if (data.status === 'finished') {
-        setGamePhase('finished');
-      } else if (data.question_finished && data.results) {
-        setResults(data.results);
-        setGamePhase('results');
-      } else if (data.status === 'playing' && data.current_question) {
-        setGamePhase('playing');
-      } else {
-        setGamePhase('waiting');
+  const applySnapshot = (data) => {
+    setSession(data);
+    setPlayers(data.players || []);
+    setLeaderboard(data.leaderboard || []);
+
+    // Fázis meghatározása
+    if (data.status === 'finished') {
+      setGamePhase('finished');
+    } else if (data.question_finished && data.results) {
+      setResults(data.results);
+      setGamePhase('results');
+    } else if (data.status === 'playing' && data.current_question) {
+      setGamePhase('playing');
+    } else {
+      setGamePhase('waiting');
+    }
+
+    setLoading(false);
+  };
+
+  // Csatlakozások, lecsatlakozások és beérkezett válaszok
+  const applyDelta = (data) => {
+    const joined = data.joined || [];
+    const left = data.left || [];
+
+    if (joined.length || left.length) {
+      setPlayers(prev => {
+        const known = new Set(prev.map(p => p.nickname));
+        return [
+          ...prev.map(p => {
+            if (left.includes(p.nickname)) return { ...p, connected: false };
+            if (joined.includes(p.nickname)) return { ...p, connected: true };
+            return p;
+          }),
+          ...joined
+            .filter(nickname => !known.has(nickname))
+            .map(nickname => ({ nickname, score: 0, connected: true }))
+        ];
+      });
+    }
+
+    setSession(prev => {
+      if (!prev) return prev;
+      const updated = { ...prev };
+      if (data.total_players != null) {
+        updated.player_count = data.total_players;
       }
-      
-      setLoading(false);
-    } catch (err) {
-      // Ha a játék már véget ért és a session nem létezik, ne dobjunk hibát
-      if (gamePhase === 'finished') {
-        console.log('Session már nem létezik (játék véget ért)');
-        return;
+      if (data.answered?.length && prev.current_question) {
+        const answersReceived = { ...prev.current_question.answers_received };
+        data.answered.forEach(nickname => {
+          answersReceived[nickname] = answersReceived[nickname] || {};
+        });
+        updated.current_question = { ...prev.current_question, answers_received: answersReceived };
       }
-      setError(err.message);
-      setLoading(false);
+      return updated;
+    });
+  };
+
+  const handleHostMessage = (data) => {
+    switch (data.type) {
+      case 'host_snapshot':
+        applySnapshot(data);
+        break;
+
+      case 'game_delta':
+        applyDelta(data);
+        break;
+
+      // Egyenkénti események (GAME_EVENT_TICK_MS=0 vagy ?events=full esetén)
+      case 'player_joined':
+        applyDelta({ joined: [data.nickname] });
+        break;
+
+      case 'player_disconnected':
+        applyDelta({ left: [data.nickname] });
+        break;
+
+      case 'answer_received':
+        applyDelta({
+          answered: data.nickname ? [data.nickname] : [],
+          total_players: data.total_players
+        });
+        break;
+
+      case 'question_finished':
+        setResults(data.results);
+        setLeaderboard(data.leaderboard);
+        setGamePhase('results');
+        break;
+
+      case 'game_finished':
+        gamePhaseRef.current = 'finished';
+        setLeaderboard(data.leaderboard);
+        setGamePhase('finished');
+        break;
+
+      case 'token':
+        localStorage.setItem('token', data.token);
+        break;
+
+      case 'command_result':
+        if (!data.success) {
+          setError(data.error || 'Nem sikerült végrehajtani a műveletet');
+        }
+        break;
+
+      case 'error':
+        if (gamePhaseRef.current !== 'finished') {
+          setError(data.message);
+        }
+        break;
+
+      case 'ping':
+        if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+          wsRef.current.send(JSON.stringify({ type: 'pong', id: data.id }));
+        }
+        break;
+
+      default:
+        break;
+    }
+  };
+
+  const sendCommand = (command) => {
+    if (!wsRef.current || wsRef.current.readyState !== WebSocket.OPEN) {
+      setError('Nincs kapcsolat a szerverrel, újracsatlakozás...');
+      return;
     }
+    wsRef.current.send(JSON.stringify(command));
   };
 
-  const handleStartGame = async () => {
+  const handleStartGame = () => {
     if (!players || players.length === 0) {
       setError('Legalább 1 játékosnak csatlakoznia kell a játék indításához!');
       return;
     }
 
-    try {
-      const token = localStorage.getItem('token');
-      await gameService.startQuestion(gameCode, 0, token);
-      setGamePhase('playing');
-      setTimeout(loadSessionInfo, 400);
-    } catch (err) {
-      setError(err.message);
-    }
+    sendCommand({ type: 'start_question', question_index: 0 });
   };
 
-  const handleNextQuestion = async () => {
+  const handleNextQuestion = () => {
     if (!session) return;
     
     const nextIndex = session.current_question_index + 1;
@@ -113,36 +254,15 @@ function GameHost() {
       return;
     }
 
-    try {
-      const token = localStorage.getItem('token');
-      await gameService.startQuestion(gameCode, nextIndex, token);
-      setGamePhase('playing');
-      setTimeout(loadSessionInfo, 400);
-    } catch (err) {
-      setError(err.message);
-    }
+    sendCommand({ type: 'start_question', question_index: nextIndex });
   };
 
-  const handleFinishQuestion = async () => {
-    try {
-      const token = localStorage.getItem('token');
-      await gameService.finishQuestion(gameCode, token);
-      setGamePhase('results');
-      await loadSessionInfo();
-    } catch (err) {
-      setError(err.message);
-    }
+  const handleFinishQuestion = () => {
+    sendCommand({ type: 'finish_question' });
   };
 
-  const handleFinishGame = async () => {
-    try {
-      const token = localStorage.getItem('token');
-      await gameService.finishGame(gameCode, token);
-      setGamePhase('finished');
-      await loadSessionInfo();
-    } catch (err) {
-      setError(err.message);
-    }
+  const handleFinishGame = () => {
+    sendCommand({ type: 'finish_game' });
   };
 
   const handleExportPdf = async () => {
@@ -30,6 +30,7 @@ function GamePlayer() {
   // Eredmények
   const [questionResults, setQuestionResults] = useState(null);
   const [leaderboard, setLeaderboard] = useState([]);
+  const [myStanding, setMyStanding] = useState(null);
   const [gameFinished, setGameFinished] = useState(false);
   
   // Értékelés
@@ -110,6 +111,7 @@ function GamePlayer() {
       case 'question_finished':
         setQuestionResults(data.results);
         setLeaderboard(data.leaderboard);
+        setMyStanding(data.standing || null);
 
         if (data.correct_answer) {
           setCurrentQuestion(prev => ({
@@ -123,6 +125,13 @@ function GamePlayer() {
         }
         break;
 
+      case 'ping':
+        // Szerver oldali szívverés: válaszolunk, hogy ne minősüljünk halott kapcsolatnak
+        if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
+          wsRef.current.send(JSON.stringify({ type: 'pong', id: data.id }));
+        }
+        break;
+
       case 'game_finished':
         setLeaderboard(data.leaderboard);
         setGameFinished(true);
@@ -349,6 +358,7 @@ function GamePlayer() {
             <PlayerPositionCard
               nickname={nickname}
               leaderboard={leaderboard}
+              standing={myStanding}
             />
           )}
         </Col>
@@ -188,3 +188,15 @@ export const createWebSocketConnection = (gameCode, nickname) => {
   const wsUrl = `ws://localhost:8000/api/game/ws/${gameCode}/${encodeURIComponent(nickname)}`;
   return new WebSocket(wsUrl);
 };
+
+/**
+ * Host WebSocket kapcsolat (pillanatkép, élő frissítések és parancsok)
+ * A token az első üzenetben megy, nem az URL-ben
+ */
+export const createHostWebSocket = (gameCode, token) => {
+  const ws = new WebSocket(`ws://localhost:8000/api/game/host/${gameCode}`);
+  ws.addEventListener('open', () => {
+    ws.send(JSON.stringify({ type: 'auth', token }));
+  });
+  return ws;
+};